@@ -0,0 +1,8 @@
+"""
+Benchmarks del Compilador
+Programas sintéticos de tamaño configurable y medición por fase del pipeline.
+Uso (desde IDE_Compilador_Python): python -m benchmarks -o resultados.json
+"""
+
+from .generators import ProgramShape, ProgramGenerator, generate_program
+from .runner import run_pipeline, benchmark_shape, run_suite, compare
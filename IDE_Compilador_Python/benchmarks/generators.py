@@ -0,0 +1,126 @@
+"""
+Generadores de Programas Sintéticos
+Producen programas válidos del subconjunto de Python (pasan el análisis
+semántico y se ejecutan sin pedir entrada) con tamaño controlado por
+parámetros: cantidad de sentencias, profundidad de anidamiento, iteraciones de
+los bucles, cantidad de funciones y tamaño de las listas
+"""
+
+import random
+from dataclasses import dataclass, asdict
+
+
+VARIABLES = 6  # v0..v5, inicializadas al comienzo de main()
+
+
+@dataclass
+class ProgramShape:
+    """Parámetros de tamaño de un programa sintético"""
+    statements: int = 50
+    depth: int = 2
+    trip_count: int = 10
+    functions: int = 3
+    list_size: int = 10
+    seed: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+class ProgramGenerator:
+    """Genera el código fuente de un programa con la forma pedida"""
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.random = random.Random(shape.seed)
+        self.lines = []
+        self.loop_counter = 0
+        self.remaining = shape.statements
+
+    def emit(self, indent, text):
+        self.lines.append("    " * indent + text)
+
+    def variable(self):
+        return f"v{self.random.randrange(VARIABLES)}"
+
+    def operand(self):
+        if self.random.random() < 0.3:
+            return str(self.random.randint(1, 9))
+        return self.variable()
+
+    def generate(self):
+        shape = self.shape
+        for index in range(shape.functions):
+            self.function(index)
+
+        self.emit(0, "def main():")
+        for index in range(VARIABLES):
+            self.emit(1, f"v{index} = {index + 1}")
+        elements = ', '.join(str(self.random.randint(0, 99)) for _ in range(max(1, shape.list_size)))
+        self.emit(1, f"datos = [{elements}]")
+        while self.remaining > 0:
+            self.statement(1, shape.depth)
+        self.emit(1, f"print({', '.join(f'v{index}' for index in range(VARIABLES))})")
+        self.emit(0, "main()")
+        return '\n'.join(self.lines) + '\n'
+
+    def function(self, index):
+        """f<i>(a, b): acumula en un bucle y retorna el resultado"""
+        self.emit(0, f"def f{index}(a, b):")
+        self.emit(1, "r = a")
+        self.emit(1, f"for k in range({self.shape.trip_count}):")
+        self.emit(2, "r = r + b * k % 7")
+        self.emit(1, "return r")
+
+    def statement(self, indent, depth):
+        self.remaining -= 1
+        choices = ['assign', 'assign', 'list']
+        if self.shape.functions:
+            choices.append('call')
+        if depth > 0:
+            choices.extend(['if', 'for', 'while'])
+        kind = self.random.choice(choices)
+
+        if kind == 'assign':
+            op = self.random.choice(['+', '-', '*', '%'])
+            right = str(self.random.randint(2, 9)) if op == '%' else self.operand()
+            self.emit(indent, f"{self.variable()} = {self.operand()} {op} {right} % 1000")
+        elif kind == 'list':
+            self.emit(indent, f"datos.append({self.variable()} % 100)")
+            self.emit(indent, f"{self.variable()} = datos[{self.random.randrange(max(1, self.shape.list_size))}] + len(datos)")
+        elif kind == 'call':
+            function = self.random.randrange(self.shape.functions)
+            self.emit(indent, f"{self.variable()} = f{function}({self.operand()}, {self.operand()}) % 1000")
+        elif kind == 'if':
+            self.emit(indent, f"if {self.variable()} > {self.operand()}:")
+            self.block(indent + 1, depth - 1)
+            self.emit(indent, "else:")
+            self.block(indent + 1, depth - 1)
+        elif kind == 'for':
+            counter = self.new_loop_counter()
+            self.emit(indent, f"for {counter} in range({self.shape.trip_count}):")
+            self.block(indent + 1, depth - 1)
+        else:
+            counter = self.new_loop_counter()
+            self.emit(indent, f"{counter} = 0")
+            self.emit(indent, f"while {counter} < {self.shape.trip_count}:")
+            self.block(indent + 1, depth - 1)
+            self.emit(indent + 1, f"{counter} = {counter} + 1")
+
+    def block(self, indent, depth):
+        """Bloque anidado de una a tres sentencias"""
+        self.statement(indent, depth)
+        for _ in range(self.random.randint(0, 2)):
+            if self.remaining <= 0:
+                break
+            self.statement(indent, depth)
+
+    def new_loop_counter(self):
+        self.loop_counter += 1
+        return f"i{self.loop_counter}"
+
+
+def generate_program(statements=50, depth=2, trip_count=10, functions=3, list_size=10, seed=0):
+    """Código fuente de un programa sintético con los parámetros dados"""
+    shape = ProgramShape(statements, depth, trip_count, functions, list_size, seed)
+    return ProgramGenerator(shape).generate()
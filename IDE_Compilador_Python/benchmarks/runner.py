@@ -0,0 +1,187 @@
+"""
+Ejecutor de Benchmarks
+Mide cada fase del compilador (Lexer, Parser, SemanticAnalyzer, TACGenerator,
+TACOptimizer, TACInterpreter y MachineCodeGenerator) sobre programas
+sintéticos, guarda los resultados en JSON y los compara con una corrida anterior
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+
+from python_compiler import Lexer, Parser
+from semantic_analyzer import SemanticAnalyzer
+from tac_generator import TACGenerator
+from tac_optimizer import TACOptimizer
+from tac_interpreter import TACInterpreter
+from machine_code_generator import MachineCodeGenerator
+from instrumentation import Instrumentation, count_ast_nodes
+
+from .generators import ProgramShape, ProgramGenerator
+
+
+PHASES = ('Lexer', 'Parser', 'SemanticAnalyzer', 'TACGenerator', 'TACOptimizer', 'TACInterpreter', 'MachineCodeGenerator')
+
+# Configuraciones estándar: cada una varía un parámetro respecto de 'base'
+SUITE = {
+    'base': ProgramShape(),
+    'sentencias_x8': ProgramShape(statements=400),
+    'anidamiento_4': ProgramShape(depth=4),
+    'iteraciones_x3': ProgramShape(trip_count=30),
+    'funciones_x10': ProgramShape(functions=30),
+    'listas_x50': ProgramShape(list_size=500),
+}
+
+QUICK_SUITE = {
+    'base': ProgramShape(),
+    'sentencias_x4': ProgramShape(statements=200),
+}
+
+
+def run_pipeline(source_code):
+    """Ejecuta todas las fases una vez y retorna la Instrumentation con sus tiempos y conteos"""
+    instrumentation = Instrumentation(trace_memory=False)
+    with instrumentation.phase('Lexer') as metrics:
+        tokens = Lexer(source_code).tokenize()
+        metrics.count('tokens', len(tokens))
+    with instrumentation.phase('Parser') as metrics:
+        ast = Parser(tokens).parse()
+    metrics.count('nodos_ast', count_ast_nodes(ast))
+    with instrumentation.phase('SemanticAnalyzer') as metrics:
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(ast)
+    if analyzer.errors:
+        raise ValueError(f"El programa generado tiene errores semánticos: {analyzer.errors[:3]}")
+    with instrumentation.phase('TACGenerator') as metrics:
+        generator = TACGenerator()
+        instructions = generator.generate(ast)
+        metrics.count('instrucciones', len(instructions))
+    with instrumentation.phase('TACOptimizer') as metrics:
+        optimized = TACOptimizer().optimize(instructions)
+        metrics.count('instrucciones', len(optimized))
+    with instrumentation.phase('TACInterpreter') as metrics:
+        interpreter = TACInterpreter(input_callback=lambda prompt='': '0')
+        with contextlib.redirect_stdout(io.StringIO()):
+            output = interpreter.interpret(optimized, generator.function_params)
+        metrics.count('lineas_salida', len(output.splitlines()))
+    with instrumentation.phase('MachineCodeGenerator') as metrics:
+        machine_code = MachineCodeGenerator().generate(optimized, generator.function_params)
+        metrics.count('lineas_asm', len(machine_code))
+    return instrumentation
+
+
+def benchmark_shape(name, shape, repeat=5):
+    """Corre el pipeline repeat veces sobre el programa de la forma dada"""
+    source_code = ProgramGenerator(shape).generate()
+    samples = {phase: [] for phase in PHASES}
+    counts = {}
+    for _ in range(repeat):
+        report = run_pipeline(source_code).report
+        for metrics in report.phases:
+            samples[metrics.name].append(metrics.time_ms)
+            counts.update({f"{metrics.name}.{key}": value for key, value in metrics.counts.items()})
+    return {
+        'name': name,
+        'shape': shape.to_dict(),
+        'source_lines': source_code.count('\n'),
+        'counts': counts,
+        'phases': {
+            phase: {
+                'min_ms': min(times),
+                'median_ms': statistics.median(times),
+                'mean_ms': statistics.fmean(times),
+            }
+            for phase, times in samples.items()
+        },
+    }
+
+
+def run_suite(suite, repeat=5, progress=None):
+    results = []
+    for name, shape in suite.items():
+        if progress:
+            progress(f"{name}...")
+        results.append(benchmark_shape(name, shape, repeat))
+    return {
+        'metadata': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=0.20):
+    """
+    Compara el tiempo mínimo de cada fase con una corrida anterior
+
+    Retorna (líneas de texto, cantidad de regresiones). Una regresión es una
+    fase más lenta que la base en más de threshold (20% por defecto).
+    """
+    previous = {result['name']: result for result in baseline['results']}
+    lines = [f"{'Benchmark':<18} {'Fase':<22} {'Base (ms)':>10} {'Actual (ms)':>12} {'Cambio':>9}"]
+    regressions = 0
+    for result in current['results']:
+        old = previous.get(result['name'])
+        if old is None:
+            continue
+        for phase, stats in result['phases'].items():
+            if phase not in old['phases']:
+                continue
+            before = old['phases'][phase]['min_ms']
+            after = stats['min_ms']
+            change = (after - before) / before if before else 0.0
+            mark = ''
+            if change > threshold:
+                mark = '  REGRESIÓN'
+                regressions += 1
+            lines.append(f"{result['name']:<18} {phase:<22} {before:>10.3f} {after:>12.3f} {change:>+8.1%}{mark}")
+    return lines, regressions
+
+
+def format_results(data):
+    lines = [f"{'Benchmark':<18} {'Líneas':>7} " + ' '.join(f"{phase[:12]:>12}" for phase in PHASES)]
+    for result in data['results']:
+        times = ' '.join(f"{result['phases'][phase]['min_ms']:>12.3f}" for phase in PHASES)
+        lines.append(f"{result['name']:<18} {result['source_lines']:>7} {times}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmarks del pipeline completo sobre programas sintéticos (tiempos mínimos en ms)',
+    )
+    parser.add_argument('-o', '--output', help='archivo JSON donde guardar los resultados')
+    parser.add_argument('--compare', metavar='JSON', help='resultados anteriores contra los que comparar')
+    parser.add_argument('--threshold', type=float, default=0.20, help='tolerancia para marcar regresiones (0.20 = 20%%)')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='repeticiones por benchmark')
+    parser.add_argument('--quick', action='store_true', help='solo las configuraciones pequeñas')
+    args = parser.parse_args(argv)
+
+    suite = QUICK_SUITE if args.quick else SUITE
+    data = run_suite(suite, args.repeat, progress=lambda message: print(message, file=sys.stderr))
+    print(format_results(data))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        lines, regressions = compare(data, baseline, args.threshold)
+        print()
+        print('\n'.join(lines))
+        if regressions:
+            print(f"\n{regressions} fase(s) más lentas que la base", file=sys.stderr)
+            return 1
+    return 0
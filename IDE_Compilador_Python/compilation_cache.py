@@ -0,0 +1,137 @@
+"""
+Caché de Compilación en Disco
+Guarda resultados de compilación direccionados por contenido: la clave es un
+hash SHA-256 de la entrada de la fase más una huella de la versión del
+compilador, y el tamaño total se acota expulsando las entradas menos usadas (LRU)
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+# Módulos cuyo código determina el resultado de la compilación
+COMPILER_MODULES = (
+    'python_compiler.py',
+    'token_types.py',  # TokenBuffer y el cursor del parser
+    'semantic_analyzer.py',
+    'tac_generator.py',
+    'tac_optimizer.py',
+    'tac_cfg.py',
+    'tac_dataflow.py',
+    'tac_ssa.py',
+    'tac_interpreter.py',  # El optimizador evalúa y decodifica operandos con sus funciones
+    'machine_code_generator.py',
+    'compiler_pipeline.py',
+)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'compilador_python')
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_fingerprint = None
+
+
+def compiler_fingerprint():
+    """Hash del código fuente del compilador: cualquier cambio invalida la caché"""
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256()
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in COMPILER_MODULES:
+            digest.update(name.encode('utf-8'))
+            with open(os.path.join(base_dir, name), 'rb') as f:
+                digest.update(f.read())
+        digest.update(str(pickle.HIGHEST_PROTOCOL).encode('ascii'))
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+
+class CompilationCache:
+    """Caché en disco con una entrada pickle por clave y expulsión LRU por tamaño"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def make_key(self, kind, data):
+        """Clave de una fase: tipo de entrada + huella del compilador + contenido"""
+        digest = hashlib.sha256()
+        digest.update(kind.encode('utf-8'))
+        digest.update(compiler_fingerprint().encode('ascii'))
+        digest.update(data if isinstance(data, bytes) else data.encode('utf-8'))
+        return f"{kind}-{digest.hexdigest()}"
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+    def load(self, key):
+        """Retorna el valor guardado o None; un acierto renueva la entrada para la LRU"""
+        path = self.entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def store(self, key, value):
+        """Escribe la entrada de forma atómica y luego aplica el límite de tamaño"""
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError, TypeError):
+            return  # Valores no serializables simplemente no se guardan
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.entry_path(key))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Borra las entradas usadas hace más tiempo hasta quedar dentro de max_bytes"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.pkl'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue  # Otro proceso ya la borró
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pkl'):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
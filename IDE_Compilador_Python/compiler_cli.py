@@ -0,0 +1,152 @@
+"""
+Compilador de Línea de Comandos
+Ejecuta las fases elegidas sobre archivos o sobre la entrada estándar sin
+cargar tkinter:
+
+    python -m compiler_cli ejemplos/Factorial_con_recursion.py --emit tac --emit run
+    cat programa.py | python -m compiler_cli --emit opt-tac
+    python -m compiler_cli programa.py --emit run --profile --flamegraph perfil.folded
+"""
+
+import argparse
+import contextlib
+import sys
+
+from compiler_pipeline import (
+    compile_file, compile_many, compile_source, format_ast, format_tac, tac_from_tuples,
+)
+from compilation_cache import CompilationCache
+from tac_interpreter import TACInterpreter
+from tac_python_backend import compile_tac
+from tac_cfg import ControlFlowGraph
+from tac_ssa import SSAForm
+
+
+EMIT_CHOICES = ('tokens', 'ast', 'tac', 'opt-tac', 'cfg', 'ssa', 'asm', 'py', 'run')
+
+
+def format_tokens(tokens):
+    """Lista de tokens con posición, tipo y valor (sin NEWLINE/INDENT/DEDENT/EOF)"""
+    lines = []
+    for type_name, value, line, column in tokens:
+        if type_name not in ('NEWLINE', 'EOF', 'INDENT', 'DEDENT'):
+            lines.append(f"{line:>5}:{column:<4} {type_name:<15} {value}")
+    return '\n'.join(lines)
+
+
+def run_program(result, max_steps=None, profiles=None):
+    """
+    Ejecuta el TAC optimizado; los prompts de input() van a stderr para no
+    mezclarse con la salida. Con una lista profiles se perfila la ejecución y
+    se agrega (ruta, ExecutionProfile) a la lista
+    """
+    interpreter = TACInterpreter(profile=profiles is not None)
+    if profiles is not None:
+        profiles.append((result.path, interpreter.profile))
+    interpreter.start(tac_from_tuples(result.optimized_tac), result.function_params)
+    with contextlib.redirect_stdout(sys.stderr):
+        if not interpreter.run(max_steps):
+            raise RuntimeError(f"se superó el límite de {max_steps} instrucciones")
+    return '\n'.join(interpreter.output)
+
+
+def render(result, emit, max_steps=None, profiles=None):
+    """Texto de la fase pedida, o None si la compilación no llegó a esa fase"""
+    if emit == 'tokens':
+        return format_tokens(result.tokens) if result.tokens else None
+    if emit == 'ast':
+        return format_ast(result.ast).rstrip('\n') if result.ast is not None else None
+    if not result.ok:
+        return None
+    if emit == 'tac':
+        return format_tac(result.tac)
+    if emit == 'opt-tac':
+        return format_tac(result.optimized_tac)
+    if emit == 'cfg':
+        return ControlFlowGraph.from_instructions(tac_from_tuples(result.optimized_tac)).format()
+    if emit == 'ssa':
+        return SSAForm(ControlFlowGraph.from_instructions(tac_from_tuples(result.optimized_tac))).format()
+    if emit == 'asm':
+        return result.asm
+    if emit == 'py':
+        return compile_tac(tac_from_tuples(result.optimized_tac), result.function_params).source.rstrip('\n')
+    return run_program(result, max_steps, profiles)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m compiler_cli',
+        description='Compilador del subconjunto de Python sin interfaz gráfica',
+    )
+    parser.add_argument('files', nargs='*', help="archivos fuente; '-' o ninguno lee la entrada estándar")
+    parser.add_argument('--emit', action='append', choices=EMIT_CHOICES,
+                        help='fase a mostrar, se puede repetir (por defecto: asm)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='procesos para compilar varios archivos en paralelo')
+    parser.add_argument('--max-steps', type=int, metavar='N',
+                        help='con --emit run, detiene el programa tras N instrucciones TAC')
+    parser.add_argument('--profile', action='store_true',
+                        help='con --emit run, muestra en stderr dónde pasa el tiempo el programa')
+    parser.add_argument('--flamegraph', metavar='ARCHIVO',
+                        help='con --emit run, guarda las pilas colapsadas para flamegraph.pl o speedscope')
+    parser.add_argument('--time', action='store_true', help='muestra en stderr el tiempo de cada fase')
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help='reutiliza resultados guardados en DIR (caché por hash del código)')
+    args = parser.parse_args(argv)
+
+    emits = args.emit or ['asm']
+    files = args.files or ['-']
+    keep_ast = 'ast' in emits
+    cache = CompilationCache(args.cache_dir) if args.cache_dir else None
+    profiles = [] if args.profile or args.flamegraph else None
+
+    if args.jobs > 1 and not keep_ast and '-' not in files:
+        results = compile_many(files, workers=args.jobs, cache=cache)
+    else:
+        results = [
+            compile_source(sys.stdin.read(), '<stdin>', keep_ast, cache) if path == '-'
+            else compile_file(path, keep_ast, cache)
+            for path in files
+        ]
+
+    status = 0
+    show_headers = len(results) > 1 or len(emits) > 1
+    for result in results:
+        for emit in emits:
+            try:
+                text = render(result, emit, args.max_steps, profiles)
+            except Exception as e:
+                print(f"{result.path}: Error de ejecución: {e}", file=sys.stderr)
+                status = 1
+                continue
+            if text is None:
+                continue
+            if show_headers:
+                print(f"==> {result.path} [{emit}] <==")
+            print(text)
+        for warning in result.warnings:
+            print(f"{result.path}: advertencia: {warning}", file=sys.stderr)
+        for error in result.errors:
+            print(f"{result.path}: {error}", file=sys.stderr)
+        if not result.ok:
+            status = 1
+        if args.time:
+            phases = ', '.join(f"{phase} {seconds * 1000:.2f} ms" for phase, seconds in result.timings.items())
+            if result.cache_hit:
+                phases = f"{phases} (caché: {result.cache_hit})".lstrip(' ,')
+            print(f"{result.path}: {phases}", file=sys.stderr)
+    
+    if profiles and args.profile:
+        for path, profile in profiles:
+            print(f"==> {path} [perfil] <==", file=sys.stderr)
+            print(profile.format(), file=sys.stderr)
+    if profiles and args.flamegraph:
+        with open(args.flamegraph, 'w', encoding='utf-8') as f:
+            for path, profile in profiles:
+                for line in profile.collapsed_stacks(path if len(profiles) > 1 else None):
+                    f.write(line + '\n')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""
+Pipeline de Compilación sin Interfaz Gráfica
+Ejecuta las mismas fases que el IDE (léxico → sintáctico → semántico → TAC →
+optimización → código máquina) sin importar tkinter, para un archivo o para
+lotes de archivos repartidos en un pool de procesos
+"""
+
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from python_compiler import (
+    Lexer, Parser, LexerError, ParserError,
+    ProgramNode, AssignmentNode, PrintNode, IfNode, WhileNode, ForNode, BinaryOpNode,
+    NumberNode, StringNode, IdentifierNode, ListNode, BlockNode, FunctionNode,
+    ReturnNode, DictNode, InputNode,
+)
+from semantic_analyzer import SemanticAnalyzer
+from tac_generator import TACGenerator, TACInstruction
+from tac_optimizer import TACOptimizer
+from machine_code_generator import MachineCodeGenerator
+from instrumentation import Instrumentation, count_ast_nodes
+
+
+PHASES = ('lexico', 'sintactico', 'semantico', 'tac', 'optimizacion', 'codigo_maquina')
+
+
+@dataclass
+class CompilationResult:
+    """Resultado compacto y serializable con pickle de compilar un archivo"""
+    path: str
+    tokens: List[Tuple[str, Any, int, int]] = field(default_factory=list)  # (tipo, valor, línea, columna)
+    tac: List[Tuple] = field(default_factory=list)  # (op, arg1, arg2, result, línea)
+    optimized_tac: List[Tuple] = field(default_factory=list)
+    function_params: Dict[str, List[str]] = field(default_factory=dict)
+    asm: str = ''
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    failed_phase: Optional[str] = None
+    timings: Dict[str, float] = field(default_factory=dict)  # fase -> segundos
+    ast: Any = None  # Solo se conserva con keep_ast=True (no viaja entre procesos)
+    cache_hit: Optional[str] = None  # 'fuente' (todo desde caché) o 'tac' (optimización y ASM)
+    report: Any = None  # PerformanceReport cuando se compila con una Instrumentation
+
+    @property
+    def ok(self):
+        return self.failed_phase is None
+
+    @property
+    def total_time(self):
+        return sum(self.timings.values())
+
+
+def tac_to_tuples(instructions):
+    """Serializa instrucciones TAC como tuplas (op, arg1, arg2, result, línea)"""
+    return [(instr.op, instr.arg1, instr.arg2, instr.result, instr.line) for instr in instructions]
+
+
+def tac_from_tuples(rows):
+    """Reconstruye las instrucciones TAC desde su forma serializada"""
+    return [TACInstruction(*row) for row in rows]
+
+
+def format_tac(rows):
+    """Texto del TAC con el mismo formato numerado que muestra el IDE"""
+    return '\n'.join(f"{i:4d}: {instr}" for i, instr in enumerate(tac_from_tuples(rows)))
+
+
+def format_ast(node, indent=0):
+    """Formatea el AST como árbol de texto (mismo formato que el IDE)"""
+    indent_str = "  " * indent
+    result = f"{indent_str}├─ {node.__class__.__name__}\n"
+    
+    if isinstance(node, ProgramNode):
+        for stmt in node.statements:
+            result += format_ast(stmt, indent + 1)
+    elif isinstance(node, AssignmentNode):
+        result += f"{indent_str}│  ├─ Variable: {node.identifier}\n"
+        result += f"{indent_str}│  └─ Expresión:\n"
+        result += format_ast(node.expression, indent + 2)
+    elif isinstance(node, PrintNode):
+        result += f"{indent_str}│  └─ Expresiones ({len(node.expressions)}):\n"
+        for i, expr in enumerate(node.expressions):
+            result += f"{indent_str}│     [{i}]:\n"
+            result += format_ast(expr, indent + 3)
+    elif isinstance(node, IfNode):
+        result += f"{indent_str}│  ├─ Condición:\n"
+        result += format_ast(node.condition, indent + 2)
+        result += f"{indent_str}│  ├─ Bloque Then:\n"
+        result += format_ast(node.then_block, indent + 2)
+        if node.else_block:
+            result += f"{indent_str}│  └─ Bloque Else:\n"
+            result += format_ast(node.else_block, indent + 2)
+    elif isinstance(node, WhileNode):
+        result += f"{indent_str}│  ├─ Condición:\n"
+        result += format_ast(node.condition, indent + 2)
+        result += f"{indent_str}│  └─ Bloque:\n"
+        result += format_ast(node.block, indent + 2)
+    elif isinstance(node, ForNode):
+        result += f"{indent_str}│  ├─ Variable: {node.identifier}\n"
+        result += f"{indent_str}│  ├─ Iterable:\n"
+        result += format_ast(node.iterable, indent + 2)
+        result += f"{indent_str}│  └─ Bloque:\n"
+        result += format_ast(node.block, indent + 2)
+    elif isinstance(node, BinaryOpNode):
+        result += f"{indent_str}│  ├─ Operador: {node.operator}\n"
+        result += f"{indent_str}│  ├─ Izquierda:\n"
+        result += format_ast(node.left, indent + 2)
+        result += f"{indent_str}│  └─ Derecha:\n"
+        result += format_ast(node.right, indent + 2)
+    elif isinstance(node, NumberNode):
+        result += f"{indent_str}│  └─ Valor: {node.value}\n"
+    elif isinstance(node, StringNode):
+        result += f"{indent_str}│  └─ Valor: \"{node.value}\"\n"
+    elif isinstance(node, IdentifierNode):
+        result += f"{indent_str}│  └─ Nombre: {node.name}\n"
+    elif isinstance(node, ListNode):
+        result += f"{indent_str}│  └─ Elementos: {len(node.elements)}\n"
+    elif isinstance(node, BlockNode):
+        for stmt in node.statements:
+            result += format_ast(stmt, indent + 1)
+    elif isinstance(node, FunctionNode):
+        result += f"{indent_str}│  ├─ Nombre: {node.name}\n"
+        result += f"{indent_str}│  ├─ Parámetros: {', '.join(node.parameters)}\n"
+        result += f"{indent_str}│  └─ Cuerpo:\n"
+        result += format_ast(node.body, indent + 2)
+    elif isinstance(node, ReturnNode):
+        if node.expression:
+            result += f"{indent_str}│  └─ Expresión:\n"
+            result += format_ast(node.expression, indent + 2)
+        else:
+            result += f"{indent_str}│  └─ (sin valor)\n"
+    elif isinstance(node, DictNode):
+        result += f"{indent_str}│  └─ Elementos: {len(node.items)}\n"
+        for i, (key, value) in enumerate(node.items):
+            result += f"{indent_str}│     ├─ [{i}] Clave:\n"
+            result += format_ast(key, indent + 3)
+            result += f"{indent_str}│     └─ Valor:\n"
+            result += format_ast(value, indent + 3)
+    elif isinstance(node, InputNode):
+        if node.prompt:
+            result += f"{indent_str}│  └─ Prompt:\n"
+            result += format_ast(node.prompt, indent + 2)
+        else:
+            result += f"{indent_str}│  └─ (sin prompt)\n"
+    
+    return result
+
+
+def compile_source(source_code, path='<stdin>', keep_ast=False, cache=None, instrumentation=None):
+    """
+    Compila código fuente y retorna un CompilationResult (los errores no se propagan)
+
+    Con una CompilationCache, un código ya visto no recorre ninguna fase y un
+    TAC ya visto (p. ej. tras editar solo comentarios) salta optimización y ASM.
+    Con una Instrumentation se agregan memoria y conteos por fase en result.report.
+    """
+    source_key = None
+    if cache is not None:
+        source_key = cache.make_key('fuente', source_code)
+        cached = cache.load(source_key)
+        if cached is not None:
+            cached.path = path
+            cached.timings = {}
+            cached.report = None
+            cached.cache_hit = 'fuente'
+            if not keep_ast:
+                cached.ast = None
+            return cached
+
+    result = CompilationResult(path)
+    # Sin instrumentación explícita solo se miden los tiempos de result.timings
+    measure = instrumentation if instrumentation is not None else Instrumentation(trace_memory=False)
+    detailed = instrumentation is not None and instrumentation.enabled
+    phase = PHASES[0]
+    try:
+        with measure.phase(phase) as metrics:
+            tokens = Lexer(source_code).tokenize()
+            result.tokens = [(token.type.name, token.value, token.line, token.column) for token in tokens]
+            metrics.count('tokens', len(tokens))
+
+        phase = PHASES[1]
+        with measure.phase(phase) as metrics:
+            ast = Parser(tokens).parse()
+            result.ast = ast
+        if detailed:
+            metrics.count('nodos_ast', count_ast_nodes(ast))
+
+        phase = PHASES[2]
+        with measure.phase(phase) as metrics:
+            analyzer = SemanticAnalyzer()
+            analyzer.analyze(ast)
+            metrics.count('simbolos', len(analyzer.symbol_table))
+            metrics.count('errores', len(analyzer.errors))
+        result.errors.extend(analyzer.errors)
+        result.warnings.extend(analyzer.warnings)
+        if analyzer.errors:
+            # Igual que el IDE: no se genera código con errores semánticos
+            result.failed_phase = phase
+            return _finish(result, keep_ast, cache, source_key, measure, detailed)
+
+        phase = PHASES[3]
+        with measure.phase(phase) as metrics:
+            generator = TACGenerator()
+            instructions = generator.generate(ast)
+            metrics.count('instrucciones_tac', len(instructions))
+        result.tac = tac_to_tuples(instructions)
+        result.function_params = generator.function_params
+
+        phase = PHASES[4]
+        backend = None
+        if cache is not None:
+            # Sin las líneas: mover código de línea (p. ej. al editar un comentario) no cambia el TAC
+            backend_key = cache.make_key('tac', repr(([row[:4] for row in result.tac], result.function_params)))
+            backend = cache.load(backend_key)
+        if backend is not None:
+            lines, optimized_tac, result.asm = backend
+            result.optimized_tac = _relocate_lines(optimized_tac, lines, [row[4] for row in result.tac])
+            result.cache_hit = 'tac'
+            return _finish(result, keep_ast, cache, source_key, measure, detailed)
+
+        with measure.phase(phase) as metrics:
+            optimized = TACOptimizer().optimize(instructions)
+            metrics.count('instrucciones_antes', len(instructions))
+            metrics.count('instrucciones_despues', len(optimized))
+        result.optimized_tac = tac_to_tuples(optimized)
+
+        phase = PHASES[5]
+        with measure.phase(phase) as metrics:
+            machine_code = MachineCodeGenerator().generate(optimized, generator.function_params)
+            metrics.count('lineas_asm', len(machine_code))
+        result.asm = '\n'.join(machine_code)
+        if cache is not None:
+            cache.store(backend_key, ([row[4] for row in result.tac], result.optimized_tac, result.asm))
+    except LexerError as e:
+        result.failed_phase = phase
+        result.errors.append(str(e))
+    except ParserError as e:
+        result.failed_phase = phase
+        result.errors.append(str(e))
+    except Exception as e:
+        result.failed_phase = phase
+        result.errors.append(f"Error inesperado: {e}")
+    return _finish(result, keep_ast, cache, source_key, measure, detailed)
+
+
+def _relocate_lines(rows, old_lines, new_lines):
+    """
+    TAC guardado con las líneas de la compilación actual; old_lines y
+    new_lines tienen la línea de cada instrucción del TAC sin optimizar
+    """
+    moved = dict(zip(old_lines, new_lines))
+    return [row[:4] + (moved.get(row[4], row[4]),) for row in rows]
+
+
+def _finish(result, keep_ast, cache, source_key, measure, detailed):
+    """Completa tiempos y reporte, guarda el resultado (con el AST serializado) en la caché y descarta el AST si no se pidió"""
+    if measure.report is not None:
+        result.timings = measure.report.timings()
+    if detailed:
+        result.report = measure.report
+    if cache is not None:
+        cache.store(source_key, result)
+    if not keep_ast:
+        result.ast = None
+    return result
+
+
+def compile_file(path, keep_ast=False, cache=None, instrumentation=None):
+    """Lee y compila un archivo"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            source_code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        result = CompilationResult(path)
+        result.failed_phase = 'lectura'
+        result.errors.append(str(e))
+        return result
+    return compile_source(source_code, path, keep_ast, cache, instrumentation)
+
+
+def compile_many(paths, workers=None, cache=None):
+    """
+    Compila varios archivos en paralelo con un ProcessPoolExecutor
+
+    Retorna los CompilationResult en el mismo orden que paths. Con workers=1
+    se compila en el proceso actual, sin pool.
+    """
+    paths = list(paths)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(paths)))
+    compile_one = partial(compile_file, cache=cache)
+    if workers == 1:
+        return [compile_one(path) for path in paths]
+
+    # Lotes de varios archivos por tarea para amortizar el costo de pickle/IPC
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(compile_one, paths, chunksize=chunksize))
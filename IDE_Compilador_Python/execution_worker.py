@@ -0,0 +1,87 @@
+"""
+Ejecución en Segundo Plano
+Corre el TACInterpreter en un hilo de trabajo que no toca tkinter: la salida y
+los pedidos de input() viajan a la interfaz por una cola de mensajes, y la
+respuesta del usuario vuelve al hilo a través de un evento
+"""
+
+import queue
+import threading
+
+from tac_interpreter import TACInterpreter, STEP_CHUNK
+
+
+# Tipos de mensaje que el hilo deja en la cola: (tipo, dato)
+OUTPUT = 'output'  # Líneas nuevas de salida (lista de str)
+INPUT = 'input'    # El programa espera una entrada (dato = prompt)
+DONE = 'done'      # El programa terminó (dato = salida completa; el perfil queda en interpreter.profile)
+ERROR = 'error'    # El programa falló (dato = mensaje de la excepción)
+
+
+class ExecutionWorker(threading.Thread):
+    """Hilo que ejecuta un programa TAC y publica lo que ocurre en self.messages"""
+
+    def __init__(self, instructions, function_params=None, engine='closure', profile=False):
+        super().__init__(daemon=True)
+        self.instructions = instructions
+        self.function_params = function_params
+        self.interpreter = TACInterpreter(input_callback=self.request_input, engine=engine, profile=profile)
+        self.messages = queue.Queue()
+        self.sent = 0  # Líneas de salida ya publicadas
+        self.input_value = ""
+        self.input_ready = threading.Event()
+        self.stop_requested = threading.Event()
+
+    def run(self):
+        interpreter = self.interpreter
+        try:
+            interpreter.start(self.instructions, self.function_params)
+            # Entre tramos se publica la salida nueva y se atiende stop()
+            while not interpreter.run(STEP_CHUNK):
+                self.flush_output()
+                if self.stop_requested.is_set():
+                    return
+        except Exception as e:
+            self.flush_output()
+            self.messages.put((ERROR, str(e)))
+            return
+        self.flush_output()
+        self.messages.put((DONE, '\n'.join(interpreter.output)))
+
+    def flush_output(self, end=None):
+        """Publica las líneas de salida aún no enviadas (hasta end)"""
+        output = self.interpreter.output
+        end = len(output) if end is None else end
+        if end > self.sent:
+            self.messages.put((OUTPUT, output[self.sent:end]))
+        self.sent = max(self.sent, end)
+
+    def request_input(self, prompt=""):
+        """input_callback del intérprete: publica el pedido y espera provide_input()"""
+        # read_input ya agregó el prompt a la salida; la interfaz lo muestra con el pedido
+        output = self.interpreter.output
+        self.flush_output(len(output) - 1 if prompt else None)
+        self.sent = len(output)
+        self.input_ready.clear()
+        self.messages.put((INPUT, prompt))
+        self.input_ready.wait()
+        return self.input_value
+
+    def provide_input(self, value):
+        """Entrega al programa el valor ingresado (se llama desde la interfaz)"""
+        self.input_value = value
+        self.input_ready.set()
+
+    def stop(self):
+        """Pide detener el programa al terminar el tramo actual (o la entrada pendiente)"""
+        self.stop_requested.set()
+        self.input_ready.set()
+
+    def drain(self):
+        """Mensajes pendientes, sin bloquear"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
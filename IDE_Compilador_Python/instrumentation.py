@@ -0,0 +1,167 @@
+"""
+Instrumentación del Compilador
+Mide cada fase (tiempo, memoria asignada con tracemalloc y conteos como tokens,
+nodos AST o instrucciones TAC) y reúne las mediciones en un reporte. Con
+NULL_INSTRUMENTATION las fases no miden nada
+"""
+
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from python_compiler import ASTNode
+
+
+@dataclass
+class PhaseMetrics:
+    """Mediciones de una fase del compilador"""
+    name: str
+    time_ms: float = 0.0
+    allocated_bytes: Optional[int] = None  # Pico de memoria asignada durante la fase
+    retained_bytes: Optional[int] = None   # Memoria que sigue asignada al terminar la fase
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    def count(self, name, value):
+        self.counts[name] = value
+
+
+@dataclass
+class PerformanceReport:
+    """Reporte estructurado con las mediciones de todas las fases"""
+    phases: List[PhaseMetrics] = field(default_factory=list)
+
+    @property
+    def total_time_ms(self):
+        return sum(phase.time_ms for phase in self.phases)
+
+    def get(self, name):
+        for phase in self.phases:
+            if phase.name == name:
+                return phase
+        return None
+
+    def timings(self):
+        """Tiempo de cada fase en segundos, como CompilationResult.timings"""
+        return {phase.name: phase.time_ms / 1000 for phase in self.phases}
+
+    def to_dict(self):
+        return {
+            'total_time_ms': self.total_time_ms,
+            'phases': [
+                {
+                    'name': phase.name,
+                    'time_ms': phase.time_ms,
+                    'allocated_bytes': phase.allocated_bytes,
+                    'retained_bytes': phase.retained_bytes,
+                    'counts': dict(phase.counts),
+                }
+                for phase in self.phases
+            ],
+        }
+
+    def format(self):
+        """Tabla de texto para el IDE y la consola"""
+        lines = [f"{'Fase':<18} {'Tiempo (ms)':>12} {'Memoria pico':>14} {'Retenida':>12}  Conteos", "-" * 100]
+        for phase in self.phases:
+            allocated = format_bytes(phase.allocated_bytes)
+            retained = format_bytes(phase.retained_bytes)
+            counts = ', '.join(f"{name}={value}" for name, value in phase.counts.items())
+            lines.append(f"{phase.name:<18} {phase.time_ms:>12.3f} {allocated:>14} {retained:>12}  {counts}")
+        lines.append("-" * 100)
+        lines.append(f"{'Total':<18} {self.total_time_ms:>12.3f}")
+        return '\n'.join(lines)
+
+
+def format_bytes(size):
+    if size is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024 or unit == 'MB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class _PhaseContext:
+    """Context manager que mide una fase y la agrega al reporte"""
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.metrics = PhaseMetrics(name)
+        self.started_tracing = False
+
+    def __enter__(self):
+        if self.instrumentation.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            tracemalloc.reset_peak()
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+        self.time_start = time.perf_counter()
+        return self.metrics
+
+    def __exit__(self, exc_type, exc, tb):
+        metrics = self.metrics
+        metrics.time_ms = (time.perf_counter() - self.time_start) * 1000
+        if self.instrumentation.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            metrics.allocated_bytes = peak - self.memory_start
+            metrics.retained_bytes = current - self.memory_start
+            if self.started_tracing:
+                tracemalloc.stop()
+        self.instrumentation.report.phases.append(metrics)
+        return False
+
+
+class Instrumentation:
+    """Mide las fases envueltas con `with instrumentation.phase(nombre) as metrics:`"""
+
+    enabled = True
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.report = PerformanceReport()
+
+    def phase(self, name):
+        return _PhaseContext(self, name)
+
+
+class _NullPhase:
+    """Fase sin medición: entrar, contar y salir no hacen nada"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def count(self, name, value):
+        pass
+
+
+class NullInstrumentation:
+    """Instrumentación desactivada"""
+
+    enabled = False
+    report = None
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        return self._phase
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+def count_ast_nodes(node):
+    """Cuenta los nodos de un AST recorriendo sus atributos (listas y tuplas incluidas)"""
+    count = 0
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, ASTNode):
+            count += 1
+            stack.extend(vars(item).values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return count
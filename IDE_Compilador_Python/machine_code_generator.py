@@ -3,7 +3,7 @@ Generador de Código Máquina
 Convierte el código TAC optimizado en código ensamblador x86 de 16 bits (emu8086)
 """
 
-from tac_generator import TACInstruction
+from tac_generator import TACInstruction, operands
 
 
 class MachineCodeGenerator:
@@ -111,18 +111,19 @@ class MachineCodeGenerator:
                         if instr.arg1 not in self.memory_map:
                             self.memory_map[instr.arg1] = instr.arg1
             
-            if instr.arg2:
-                if (not instr.arg2.startswith('"') and 
-                    not instr.arg2.startswith('L') and 
-                    not instr.arg2.startswith('func_') and
-                    instr.arg2 not in self.functions.keys() and  # Excluir nombres de funciones
-                    instr.arg2 != 'main' and
-                    instr.arg2 != 'int' and
-                    instr.arg2 != 'len' and
-                    instr.arg2 != 'print'):
-                    if not self.is_number(instr.arg2):
-                        if instr.arg2 not in self.memory_map:
-                            self.memory_map[instr.arg2] = instr.arg2
+            # arg2 puede ser la tupla de argumentos de un CALL
+            for arg2 in operands(instr.arg2):
+                if (not arg2.startswith('"') and 
+                    not arg2.startswith('L') and 
+                    not arg2.startswith('func_') and
+                    arg2 not in self.functions.keys() and  # Excluir nombres de funciones
+                    arg2 != 'main' and
+                    arg2 != 'int' and
+                    arg2 != 'len' and
+                    arg2 != 'print'):
+                    if not self.is_number(arg2):
+                        if arg2 not in self.memory_map:
+                            self.memory_map[arg2] = arg2
             
             # Recopilar strings de PRINT
             if instr.op == 'PRINT' and instr.arg1:
@@ -1387,11 +1388,7 @@ class MachineCodeGenerator:
                 # Obtener el nombre real del procedimiento (puede estar renombrado)
                 actual_proc_name = self.function_name_map.get(func_name, func_name)
                 
-                # Parsear argumentos
-                args = []
-                if instr.arg2:
-                    args_str = str(instr.arg2)
-                    args = [a.strip() for a in args_str.split(',')]
+                args = operands(instr.arg2)
                 
                 # Para factorial, pasar argumento en AX directamente como en instrucciones.md
                 if func_name == 'factorial':
@@ -5,10 +5,13 @@ Optimización y Generación de Código Máquina
 """
 
 import re
+import sys
 from enum import Enum, auto
 from dataclasses import dataclass
 from typing import List, Optional, Any, Dict
 
+from token_types import TokenBuffer as ColumnarTokenBuffer, token_cursor
+
 
 # ============= ANÁLISIS LÉXICO =============
 
@@ -91,6 +94,8 @@ class TokenType(Enum):
 @dataclass
 class Token:
     """Representa un token con su tipo, valor y posición"""
+    __slots__ = ('type', 'value', 'line', 'column')  # Sin __dict__ por instancia
+    
     type: TokenType
     value: Any
     line: int
@@ -100,6 +105,13 @@ class Token:
         return f"Token({self.type.name}, {self.value}, {self.line}:{self.column})"
 
 
+class TokenBuffer(ColumnarTokenBuffer):
+    """TokenBuffer de token_types con los Token y TokenType de este compilador"""
+    
+    TOKEN_CLASS = Token
+    TYPES_BY_CODE = {token_type.value: token_type for token_type in TokenType}
+
+
 KEYWORDS = {
     'def': TokenType.DEF,
     'return': TokenType.RETURN,
@@ -129,6 +141,29 @@ KEYWORDS = {
 }
 
 
+class SymbolTable:
+    """
+    Símbolos de una compilación: clasifica cada identificador y lo interna
+    (sys.intern), así los nombres iguales son el mismo objeto en todas las fases
+    """
+    
+    def __init__(self):
+        # texto -> (tipo de token, texto internado); empieza con las palabras reservadas
+        self.entries = {word: (token_type, sys.intern(word)) for word, token_type in KEYWORDS.items()}
+    
+    def lookup(self, text):
+        """Clasifica e interna un identificador con una sola consulta al diccionario"""
+        entry = self.entries.get(text)
+        if entry is None:
+            text = sys.intern(text)
+            entry = self.entries[text] = (TokenType.IDENTIFIER, text)
+        return entry
+    
+    def intern(self, name):
+        """Interna un nombre generado por el compilador (temporales, contadores, etiquetas)"""
+        return self.lookup(name)[1]
+
+
 class LexerError(Exception):
     """Error en el análisis léxico"""
     pass
@@ -137,13 +172,16 @@ class LexerError(Exception):
 class Lexer:
     """Analizador Léxico para Python"""
     
-    def __init__(self, source_code: str):
+    def __init__(self, source_code: str, track_lines=False, symbols=None):
         self.source = source_code
+        self.symbols = symbols if symbols is not None else SymbolTable()
         self.position = 0
         self.line = 1
         self.column = 1
         self.tokens = []
         self.indent_stack = [0]
+        # (línea, pila de indentación) al inicio de cada línea física; lo usa IncrementalLexer
+        self.line_states = [] if track_lines else None
     
     def error(self, message):
         raise LexerError(f"Error Léxico en línea {self.line}, columna {self.column}: {message}")
@@ -203,10 +241,13 @@ class Lexer:
     
     def read_identifier(self):
         start_line, start_column = self.line, self.column
-        identifier = ''
-        while self.peek() and (self.peek().isalnum() or self.peek() == '_'):
-            identifier += self.advance()
-        token_type = KEYWORDS.get(identifier, TokenType.IDENTIFIER)
+        source = self.source
+        start = end = self.position
+        while end < len(source) and (source[end].isalnum() or source[end] == '_'):
+            end += 1
+        self.position = end
+        self.column += end - start
+        token_type, identifier = self.symbols.lookup(source[start:end])
         return Token(token_type, identifier, start_line, start_column)
     
     def handle_indentation(self, indent_level):
@@ -225,10 +266,21 @@ class Lexer:
     
     def tokenize(self):
         self.tokens = []
+        self.tokens.extend(self.iter_tokens())
+        return self.tokens
+    
+    def tokenize_buffer(self):
+        """Tokeniza hacia un TokenBuffer columnar en lugar de una lista de objetos Token"""
+        return TokenBuffer.from_tokens(self.iter_tokens())
+    
+    def iter_tokens(self):
+        """Genera los tokens de forma perezosa (incluye INDENT/DEDENT) sin guardarlos en self.tokens"""
         at_line_start = True
         
         while self.position < len(self.source):
             if at_line_start:
+                if self.line_states is not None and self.column == 1:
+                    self.line_states.append((self.line, tuple(self.indent_stack)))
                 indent_level = 0
                 while self.peek() in ' \t':
                     indent_level += 4 if self.peek() == '\t' else 1
@@ -241,7 +293,7 @@ class Lexer:
                         self.skip_comment()
                     continue
                 
-                self.tokens.extend(self.handle_indentation(indent_level))
+                yield from self.handle_indentation(indent_level)
                 at_line_start = False
             
             self.skip_whitespace()
@@ -255,93 +307,233 @@ class Lexer:
                 self.skip_comment()
             elif char == '\n':
                 self.advance()
-                self.tokens.append(Token(TokenType.NEWLINE, '\\n', start_line, start_column))
+                yield Token(TokenType.NEWLINE, '\\n', start_line, start_column)
                 at_line_start = True
             elif char.isdigit():
-                self.tokens.append(self.read_number())
+                yield self.read_number()
             elif char in '"\'':
-                self.tokens.append(self.read_string())
+                yield self.read_string()
             elif char.isalpha() or char == '_':
-                self.tokens.append(self.read_identifier())
+                yield self.read_identifier()
             elif char == '*' and self.peek(1) == '*':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.POWER, '**', start_line, start_column))
+                yield Token(TokenType.POWER, '**', start_line, start_column)
             elif char == '=' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.EQUAL, '==', start_line, start_column))
+                yield Token(TokenType.EQUAL, '==', start_line, start_column)
             elif char == '!' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.NOT_EQUAL, '!=', start_line, start_column))
+                yield Token(TokenType.NOT_EQUAL, '!=', start_line, start_column)
             elif char == '<' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.LESS_EQUAL, '<=', start_line, start_column))
+                yield Token(TokenType.LESS_EQUAL, '<=', start_line, start_column)
             elif char == '>' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.GREATER_EQUAL, '>=', start_line, start_column))
+                yield Token(TokenType.GREATER_EQUAL, '>=', start_line, start_column)
             elif char == '+':
                 self.advance()
-                self.tokens.append(Token(TokenType.PLUS, '+', start_line, start_column))
+                yield Token(TokenType.PLUS, '+', start_line, start_column)
             elif char == '-':
                 self.advance()
-                self.tokens.append(Token(TokenType.MINUS, '-', start_line, start_column))
+                yield Token(TokenType.MINUS, '-', start_line, start_column)
             elif char == '*':
                 self.advance()
-                self.tokens.append(Token(TokenType.MULTIPLY, '*', start_line, start_column))
+                yield Token(TokenType.MULTIPLY, '*', start_line, start_column)
             elif char == '/':
                 self.advance()
-                self.tokens.append(Token(TokenType.DIVIDE, '/', start_line, start_column))
+                yield Token(TokenType.DIVIDE, '/', start_line, start_column)
             elif char == '%':
                 self.advance()
-                self.tokens.append(Token(TokenType.MODULO, '%', start_line, start_column))
+                yield Token(TokenType.MODULO, '%', start_line, start_column)
             elif char == '=':
                 self.advance()
-                self.tokens.append(Token(TokenType.ASSIGN, '=', start_line, start_column))
+                yield Token(TokenType.ASSIGN, '=', start_line, start_column)
             elif char == '<':
                 self.advance()
-                self.tokens.append(Token(TokenType.LESS, '<', start_line, start_column))
+                yield Token(TokenType.LESS, '<', start_line, start_column)
             elif char == '>':
                 self.advance()
-                self.tokens.append(Token(TokenType.GREATER, '>', start_line, start_column))
+                yield Token(TokenType.GREATER, '>', start_line, start_column)
             elif char == '(':
                 self.advance()
-                self.tokens.append(Token(TokenType.LPAREN, '(', start_line, start_column))
+                yield Token(TokenType.LPAREN, '(', start_line, start_column)
             elif char == ')':
                 self.advance()
-                self.tokens.append(Token(TokenType.RPAREN, ')', start_line, start_column))
+                yield Token(TokenType.RPAREN, ')', start_line, start_column)
             elif char == '[':
                 self.advance()
-                self.tokens.append(Token(TokenType.LBRACKET, '[', start_line, start_column))
+                yield Token(TokenType.LBRACKET, '[', start_line, start_column)
             elif char == ']':
                 self.advance()
-                self.tokens.append(Token(TokenType.RBRACKET, ']', start_line, start_column))
+                yield Token(TokenType.RBRACKET, ']', start_line, start_column)
             elif char == '{':
                 self.advance()
-                self.tokens.append(Token(TokenType.LBRACE, '{', start_line, start_column))
+                yield Token(TokenType.LBRACE, '{', start_line, start_column)
             elif char == '}':
                 self.advance()
-                self.tokens.append(Token(TokenType.RBRACE, '}', start_line, start_column))
+                yield Token(TokenType.RBRACE, '}', start_line, start_column)
             elif char == ':':
                 self.advance()
-                self.tokens.append(Token(TokenType.COLON, ':', start_line, start_column))
+                yield Token(TokenType.COLON, ':', start_line, start_column)
             elif char == ',':
                 self.advance()
-                self.tokens.append(Token(TokenType.COMMA, ',', start_line, start_column))
+                yield Token(TokenType.COMMA, ',', start_line, start_column)
             elif char == '.':
                 self.advance()
-                self.tokens.append(Token(TokenType.DOT, '.', start_line, start_column))
+                yield Token(TokenType.DOT, '.', start_line, start_column)
             else:
                 self.error(f"Carácter inesperado: '{char}'")
         
         while len(self.indent_stack) > 1:
             self.indent_stack.pop()
-            self.tokens.append(Token(TokenType.DEDENT, 0, self.line, self.column))
+            yield Token(TokenType.DEDENT, 0, self.line, self.column)
         
-        self.tokens.append(Token(TokenType.EOF, None, self.line, self.column))
+        yield Token(TokenType.EOF, None, self.line, self.column)
+
+
+def _common_prefix_length(a, b):
+    """Longitud del prefijo común de dos cadenas (búsqueda binaria, comparaciones en C)"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a.startswith(b[low:mid], low):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix_length(a, b, limit):
+    """Longitud del sufijo común de dos cadenas, sin superar limit"""
+    low, high = 0, limit
+    len_a, len_b = len(a), len(b)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a.endswith(b[len_b - mid:len_b - low], 0, len_a - low):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _first_token_index(tokens, line):
+    """Índice del primer token cuya línea es >= line (los tokens están ordenados por línea)"""
+    low, high = 0, len(tokens)
+    while low < high:
+        mid = (low + high) // 2
+        if tokens[mid].line < line:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+class IncrementalLexer:
+    """Re-tokeniza solo las líneas afectadas por una edición del editor"""
+
+    def __init__(self):
+        self.source = None
+        self.tokens = []
+        # Índice = número de línea; valor = pila de indentación al inicio de la línea o None
+        self.line_states = [None]
+
+    def tokenize(self, source_code):
+        """Tokenización completa que guarda el estado de cada línea"""
+        lexer = Lexer(source_code, track_lines=True)
+        tokens = lexer.tokenize()
+        states = [None] * (source_code.count('\n') + 2)
+        for line, stack in lexer.line_states:
+            states[line] = stack
+        self.source = source_code
+        self.tokens = tokens
+        self.line_states = states
+        return tokens
+
+    def update(self, source_code):
+        """Calcula el rango de líneas modificado respecto al código anterior y re-tokeniza"""
+        old = self.source
+        if old is None:
+            return self.tokenize(source_code)
+        if source_code == old:
+            return self.tokens
+        prefix = _common_prefix_length(old, source_code)
+        limit = min(len(old), len(source_code)) - prefix
+        suffix = _common_suffix_length(old, source_code, limit)
+        first_line = old.count('\n', 0, prefix) + 1
+        first_offset = old.rfind('\n', 0, prefix) + 1
+        old_last_line = old.count('\n', 0, len(old) - suffix) + 1
+        new_last_line = source_code.count('\n', 0, len(source_code) - suffix) + 1
+        return self._relex(source_code, first_line, first_offset, old_last_line, new_last_line)
+
+    def relex(self, source_code, first_line, old_last_line, new_last_line):
+        """Re-tokeniza tras reemplazar las líneas first_line..old_last_line por first_line..new_last_line"""
+        if self.source is None:
+            return self.tokenize(source_code)
+        first_offset = 0
+        for _ in range(first_line - 1):
+            first_offset = source_code.index('\n', first_offset) + 1
+        return self._relex(source_code, first_line, first_offset, old_last_line, new_last_line)
+
+    def _relex(self, source_code, first_line, first_offset, old_last_line, new_last_line):
+        states = self.line_states
+
+        # Retroceder hasta una línea con estado conocido (p. ej. fuera de un string multilínea)
+        start_line, start_offset = first_line, first_offset
+        while start_line > 0 and (start_line >= len(states) or states[start_line] is None):
+            start_line -= 1
+            start_offset = source_code.rfind('\n', 0, start_offset - 1) + 1
+        if start_line == 0:
+            return self.tokenize(source_code)
+
+        delta = new_last_line - old_last_line
+        lexer = Lexer(source_code, track_lines=True)
+        lexer.position = start_offset
+        lexer.line = start_line
+        lexer.indent_stack = list(states[start_line])
+
+        # Re-tokenizar hasta que una línea posterior a la edición empiece con la misma pila
+        relexed = []
+        recorded = lexer.line_states
+        checked = 0
+        resync_line = None
+        for token in lexer.iter_tokens():
+            while checked < len(recorded):
+                line, stack = recorded[checked]
+                checked += 1
+                old_line = line - delta
+                if line > new_last_line and old_line < len(states) and states[old_line] == stack:
+                    resync_line = line
+                    break
+            if resync_line is not None:
+                break
+            relexed.append(token)
+
+        if resync_line is None:
+            end_line = source_code.count('\n') + 2
+            tail_tokens = []
+            tail_states = []
+        else:
+            end_line = resync_line
+            tail_tokens = self.tokens[_first_token_index(self.tokens, resync_line - delta):]
+            tail_states = states[resync_line - delta:]
+            if delta:
+                for token in tail_tokens:
+                    token.line += delta
+
+        segment = [None] * (end_line - start_line)
+        for line, stack in recorded:
+            if line < end_line:
+                segment[line - start_line] = stack
+
+        start_index = _first_token_index(self.tokens, start_line)
+        self.tokens = self.tokens[:start_index] + relexed + tail_tokens
+        self.line_states = states[:start_line] + segment + tail_states
+        self.source = source_code
         return self.tokens
 
 
@@ -469,30 +661,55 @@ class Parser:
     """Analizador Sintáctico"""
     
     def __init__(self, tokens):
+        """
+        Acepta una lista de tokens, un iterador como Lexer.iter_tokens() o un
+        TokenBuffer. Sobre un buffer lee tipos, valores y líneas de sus
+        columnas y solo arma un Token para los mensajes de error
+        """
         self.tokens = tokens
+        self.stream = token_cursor(tokens)
         self.position = 0
-        self.current_token = tokens[0] if tokens else None
+        self.current_type = self.stream.type_at()
+    
+    @property
+    def current_token(self):
+        return self.stream.peek()
+    
+    @property
+    def current_value(self):
+        return self.stream.value_at()
+    
+    @property
+    def current_line(self):
+        return self.stream.line_at()
     
     def error(self, message):
-        if self.current_token:
-            raise ParserError(f"Error Sintáctico en línea {self.current_token.line}: {message}")
+        if self.current_type is not None:
+            raise ParserError(f"Error Sintáctico en línea {self.current_line}: {message}")
         raise ParserError(f"Error Sintáctico: {message}")
     
+    def peek(self, offset=0):
+        return self.stream.peek(offset)
+    
+    def peek_type(self, offset=0):
+        """Tipo del token a 'offset' posiciones del actual, o None si no hay más"""
+        return self.stream.type_at(offset)
+    
     def advance(self):
-        if self.position < len(self.tokens) - 1:
+        if self.stream.advance():
             self.position += 1
-            self.current_token = self.tokens[self.position]
-        return self.current_token
+            self.current_type = self.stream.type_at()
     
     def expect(self, token_type):
-        if self.current_token.type != token_type:
-            self.error(f"Se esperaba {token_type.name}, se encontró {self.current_token.type.name}")
-        token = self.current_token
+        """Consume un token del tipo esperado y retorna su valor"""
+        if self.current_type != token_type:
+            self.error(f"Se esperaba {token_type.name}, se encontró {self.current_type.name}")
+        value = self.current_value
         self.advance()
-        return token
+        return value
     
     def skip_newlines(self):
-        while self.current_token and self.current_token.type == TokenType.NEWLINE:
+        while self.current_type == TokenType.NEWLINE:
             self.advance()
     
     def parse(self):
@@ -501,7 +718,7 @@ class Parser:
     def parse_program(self):
         statements = []
         self.skip_newlines()
-        while self.current_token.type != TokenType.EOF:
+        while self.current_type != TokenType.EOF:
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
@@ -510,17 +727,17 @@ class Parser:
     
     def parse_statement(self):
         self.skip_newlines()
-        token_type = self.current_token.type
+        token_type = self.current_type
         
         if token_type == TokenType.DEF:
             return self.parse_function()
         elif token_type == TokenType.RETURN:
             return self.parse_return()
         elif token_type == TokenType.IDENTIFIER:
-            next_token = self.tokens[self.position + 1] if self.position + 1 < len(self.tokens) else None
-            if next_token and next_token.type == TokenType.ASSIGN:
+            next_type = self.peek_type(1)
+            if next_type == TokenType.ASSIGN:
                 return self.parse_assignment()
-            elif next_token and next_token.type == TokenType.LBRACKET:
+            elif next_type == TokenType.LBRACKET:
                 return self.parse_list_assignment()
             else:
                 expr = self.parse_expression()
@@ -543,15 +760,15 @@ class Parser:
             self.error(f"Token inesperado: {self.current_token}")
     
     def parse_assignment(self):
-        line = self.current_token.line
-        identifier = self.expect(TokenType.IDENTIFIER).value
+        line = self.current_line
+        identifier = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.ASSIGN)
         expression = self.parse_expression()
         return AssignmentNode(identifier, expression, line)
     
     def parse_list_assignment(self):
-        line = self.current_token.line
-        identifier = self.expect(TokenType.IDENTIFIER).value
+        line = self.current_line
+        identifier = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.LBRACKET)
         index_expr = self.parse_expression()
         self.expect(TokenType.RBRACKET)
@@ -561,14 +778,14 @@ class Parser:
     
     def parse_print(self):
         """Parse print statement: print(expr1, expr2, ...)"""
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.PRINT)
         self.expect(TokenType.LPAREN)
         
         expressions = []
-        if self.current_token.type != TokenType.RPAREN:
+        if self.current_type != TokenType.RPAREN:
             expressions.append(self.parse_expression())
-            while self.current_token.type == TokenType.COMMA:
+            while self.current_type == TokenType.COMMA:
                 self.advance()
                 expressions.append(self.parse_expression())
         
@@ -576,7 +793,7 @@ class Parser:
         return PrintNode(expressions, line)
     
     def parse_if(self):
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.IF)
         condition = self.parse_expression()
         self.expect(TokenType.COLON)
@@ -584,7 +801,7 @@ class Parser:
         then_block = self.parse_block()
         
         elif_parts = []
-        while self.current_token.type == TokenType.ELIF:
+        while self.current_type == TokenType.ELIF:
             self.advance()
             elif_condition = self.parse_expression()
             self.expect(TokenType.COLON)
@@ -593,7 +810,7 @@ class Parser:
             elif_parts.append((elif_condition, elif_block))
         
         else_block = None
-        if self.current_token.type == TokenType.ELSE:
+        if self.current_type == TokenType.ELSE:
             self.advance()
             self.expect(TokenType.COLON)
             self.skip_newlines()
@@ -602,7 +819,7 @@ class Parser:
         return IfNode(condition, then_block, elif_parts, else_block, line)
     
     def parse_while(self):
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.WHILE)
         condition = self.parse_expression()
         self.expect(TokenType.COLON)
@@ -611,9 +828,9 @@ class Parser:
         return WhileNode(condition, block, line)
     
     def parse_for(self):
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.FOR)
-        identifier = self.expect(TokenType.IDENTIFIER).value
+        identifier = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.IN)
         iterable = self.parse_expression()
         self.expect(TokenType.COLON)
@@ -623,35 +840,35 @@ class Parser:
     
     def parse_block(self):
         statements = []
-        if self.current_token.type != TokenType.INDENT:
+        if self.current_type != TokenType.INDENT:
             self.error("Se esperaba bloque indentado")
         self.advance()
         self.skip_newlines()
         
-        while self.current_token.type not in (TokenType.DEDENT, TokenType.EOF):
+        while self.current_type not in (TokenType.DEDENT, TokenType.EOF):
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
             self.skip_newlines()
         
-        if self.current_token.type == TokenType.DEDENT:
+        if self.current_type == TokenType.DEDENT:
             self.advance()
         
         return BlockNode(statements)
     
     def parse_function(self):
         """Parse function definition: def nombre(param1, param2): bloque"""
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.DEF)
-        name = self.expect(TokenType.IDENTIFIER).value
+        name = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.LPAREN)
         
         parameters = []
-        if self.current_token.type != TokenType.RPAREN:
-            parameters.append(self.expect(TokenType.IDENTIFIER).value)
-            while self.current_token.type == TokenType.COMMA:
+        if self.current_type != TokenType.RPAREN:
+            parameters.append(self.expect(TokenType.IDENTIFIER))
+            while self.current_type == TokenType.COMMA:
                 self.advance()
-                parameters.append(self.expect(TokenType.IDENTIFIER).value)
+                parameters.append(self.expect(TokenType.IDENTIFIER))
         self.expect(TokenType.RPAREN)
         self.expect(TokenType.COLON)
         self.skip_newlines()
@@ -661,26 +878,26 @@ class Parser:
     
     def parse_return(self):
         """Parse return statement: return expresion"""
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.RETURN)
-        if self.current_token.type != TokenType.NEWLINE and self.current_token.type != TokenType.DEDENT:
+        if self.current_type != TokenType.NEWLINE and self.current_type != TokenType.DEDENT:
             expression = self.parse_expression()
             return ReturnNode(expression, line)
         return ReturnNode(None, line)
     
     def parse_dict(self):
         """Parse dictionary: {clave1: valor1, clave2: valor2}"""
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.LBRACE)
         items = []
         
-        if self.current_token.type != TokenType.RBRACE:
+        if self.current_type != TokenType.RBRACE:
             key = self.parse_expression()
             self.expect(TokenType.COLON)
             value = self.parse_expression()
             items.append((key, value))
             
-            while self.current_token.type == TokenType.COMMA:
+            while self.current_type == TokenType.COMMA:
                 self.advance()
                 key = self.parse_expression()
                 self.expect(TokenType.COLON)
@@ -692,12 +909,12 @@ class Parser:
     
     def parse_input(self):
         """Parse input() call: input() or input(prompt)"""
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.INPUT)
         self.expect(TokenType.LPAREN)
         
         prompt = None
-        if self.current_token.type != TokenType.RPAREN:
+        if self.current_type != TokenType.RPAREN:
             prompt = self.parse_expression()
         
         self.expect(TokenType.RPAREN)
@@ -711,9 +928,9 @@ class Parser:
         comparison_ops = {TokenType.EQUAL, TokenType.NOT_EQUAL, TokenType.LESS, 
                          TokenType.GREATER, TokenType.LESS_EQUAL, TokenType.GREATER_EQUAL}
         
-        if self.current_token.type in comparison_ops:
-            operator = self.current_token.value
-            line = self.current_token.line
+        if self.current_type in comparison_ops:
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_arithmetic()
             return BinaryOpNode(left, operator, right, line)
@@ -721,9 +938,9 @@ class Parser:
     
     def parse_arithmetic(self):
         left = self.parse_term()
-        while self.current_token.type in (TokenType.PLUS, TokenType.MINUS):
-            operator = self.current_token.value
-            line = self.current_token.line
+        while self.current_type in (TokenType.PLUS, TokenType.MINUS):
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_term()
             left = BinaryOpNode(left, operator, right, line)
@@ -731,102 +948,104 @@ class Parser:
     
     def parse_term(self):
         left = self.parse_factor()
-        while self.current_token.type in (TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO):
-            operator = self.current_token.value
-            line = self.current_token.line
+        while self.current_type in (TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO):
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_factor()
             left = BinaryOpNode(left, operator, right, line)
         return left
     
     def parse_factor(self):
-        token = self.current_token
+        token_type = self.current_type
+        value = self.current_value
+        line = self.current_line
         
-        if token.type == TokenType.NUMBER:
+        if token_type == TokenType.NUMBER:
             self.advance()
-            return NumberNode(token.value, token.line)
-        elif token.type == TokenType.STRING:
+            return NumberNode(value, line)
+        elif token_type == TokenType.STRING:
             self.advance()
-            return StringNode(token.value, token.line)
-        elif token.type == TokenType.TRUE:
+            return StringNode(value, line)
+        elif token_type == TokenType.TRUE:
             self.advance()
-            return NumberNode(1, token.line)  # True = 1
-        elif token.type == TokenType.FALSE:
+            return NumberNode(1, line)  # True = 1
+        elif token_type == TokenType.FALSE:
             self.advance()
-            return NumberNode(0, token.line)  # False = 0
-        elif token.type == TokenType.NONE:
+            return NumberNode(0, line)  # False = 0
+        elif token_type == TokenType.NONE:
             self.advance()
-            return NumberNode(0, token.line)  # None = 0 (para compatibilidad)
-        elif token.type == TokenType.IDENTIFIER:
-            name = token.value
+            return NumberNode(0, line)  # None = 0 (para compatibilidad)
+        elif token_type == TokenType.IDENTIFIER:
+            name = value
             self.advance()
-            if self.current_token.type == TokenType.LPAREN:
+            if self.current_type == TokenType.LPAREN:
                 # Llamada a función
                 self.advance()
                 args = []
-                if self.current_token.type != TokenType.RPAREN:
+                if self.current_type != TokenType.RPAREN:
                     args.append(self.parse_expression())
-                    while self.current_token.type == TokenType.COMMA:
+                    while self.current_type == TokenType.COMMA:
                         self.advance()
                         args.append(self.parse_expression())
                 self.expect(TokenType.RPAREN)
-                return CallNode(name, args, token.line)
-            elif self.current_token.type == TokenType.LBRACKET:
+                return CallNode(name, args, line)
+            elif self.current_type == TokenType.LBRACKET:
                 self.advance()
                 index_expr = self.parse_expression()
                 self.expect(TokenType.RBRACKET)
-                return IndexNode(IdentifierNode(name, token.line), index_expr, token.line)
-            elif self.current_token.type == TokenType.DOT:
+                return IndexNode(IdentifierNode(name, line), index_expr, line)
+            elif self.current_type == TokenType.DOT:
                 self.advance()
-                method = self.expect(TokenType.IDENTIFIER).value
+                method = self.expect(TokenType.IDENTIFIER)
                 self.expect(TokenType.LPAREN)
                 args = []
-                if self.current_token.type != TokenType.RPAREN:
+                if self.current_type != TokenType.RPAREN:
                     args.append(self.parse_expression())
-                    while self.current_token.type == TokenType.COMMA:
+                    while self.current_type == TokenType.COMMA:
                         self.advance()
                         args.append(self.parse_expression())
                 self.expect(TokenType.RPAREN)
-                return CallNode(f"{name}.{method}", args, token.line)
-            return IdentifierNode(name, token.line)
-        elif token.type == TokenType.LBRACKET:
+                return CallNode(f"{name}.{method}", args, line)
+            return IdentifierNode(name, line)
+        elif token_type == TokenType.LBRACKET:
             self.advance()
             elements = []
-            if self.current_token.type != TokenType.RBRACKET:
+            if self.current_type != TokenType.RBRACKET:
                 elements.append(self.parse_expression())
-                while self.current_token.type == TokenType.COMMA:
+                while self.current_type == TokenType.COMMA:
                     self.advance()
                     elements.append(self.parse_expression())
             self.expect(TokenType.RBRACKET)
-            return ListNode(elements, token.line)
-        elif token.type == TokenType.LBRACE:
+            return ListNode(elements, line)
+        elif token_type == TokenType.LBRACE:
             return self.parse_dict()
-        elif token.type == TokenType.INPUT:
+        elif token_type == TokenType.INPUT:
             return self.parse_input()
-        elif token.type == TokenType.LPAREN:
+        elif token_type == TokenType.LPAREN:
             self.advance()
             expr = self.parse_expression()
             self.expect(TokenType.RPAREN)
             return expr
-        elif token.type in (TokenType.RANGE, TokenType.LEN, TokenType.INT):
-            func_name = token.value
+        elif token_type in (TokenType.RANGE, TokenType.LEN, TokenType.INT):
+            func_name = value
             self.advance()
             self.expect(TokenType.LPAREN)
             args = []
-            if self.current_token.type != TokenType.RPAREN:
+            if self.current_type != TokenType.RPAREN:
                 args.append(self.parse_expression())
-                while self.current_token.type == TokenType.COMMA:
+                while self.current_type == TokenType.COMMA:
                     self.advance()
                     args.append(self.parse_expression())
             self.expect(TokenType.RPAREN)
-            return CallNode(func_name, args, token.line)
-        elif token.type == TokenType.MINUS:
+            return CallNode(func_name, args, line)
+        elif token_type == TokenType.MINUS:
             self.advance()
             operand = self.parse_factor()
-            return UnaryOpNode('-', operand, token.line)
-        elif token.type == TokenType.NOT:
+            return UnaryOpNode('-', operand, line)
+        elif token_type == TokenType.NOT:
             self.advance()
             operand = self.parse_factor()
-            return UnaryOpNode('not', operand, token.line)
+            return UnaryOpNode('not', operand, line)
         else:
-            self.error(f"Token inesperado en expresión: {token}")
+            self.error(f"Token inesperado en expresión: {self.current_token}")
@@ -10,8 +10,10 @@ from python_compiler import *
 from semantic_analyzer import SemanticAnalyzer
 from tac_generator import TACGenerator
 from tac_optimizer import TACOptimizer
-from tac_interpreter import TACInterpreter
 from machine_code_generator import MachineCodeGenerator
+from compiler_pipeline import format_ast
+from execution_worker import ExecutionWorker, OUTPUT, INPUT, DONE, ERROR
+from instrumentation import Instrumentation, NULL_INSTRUMENTATION, count_ast_nodes
 from reglas_semanticas import REGLAS_SEMANTICAS, obtener_reglas_por_fase, obtener_nombre_fase
 
 
@@ -36,6 +38,12 @@ COLORS = {
     'button_hover': '#3e3e42',       # Gris para hover
 }
 
+# Cada cuánto se vuelca en pantalla la salida del programa en ejecución (20 cuadros por segundo)
+OUTPUT_FRAME_MS = 50
+
+# Fondo de las líneas más costosas del perfil, de la más tibia a la más caliente
+HOT_LINE_COLORS = ('#3b2f1e', '#5c3a1e', '#7f3b1e')
+
 
 class GradientFrame(tk.Canvas):
     """Frame con gradiente azul"""
@@ -77,6 +85,7 @@ class PythonCompilerIDE:
         self.style.theme_use('clam')
         
         # Datos de compilación
+        self.incremental_lexer = IncrementalLexer()
         self.tokens = []
         self.ast = None
         self.semantic_analyzer = None
@@ -88,6 +97,9 @@ class PythonCompilerIDE:
         self.input_callback_var = None
         self.input_prompt = ""
         self.input_result = {'value': None, 'ready': False}
+        self.performance_report = None
+        self.execution_worker = None  # Hilo que ejecuta el programa
+        self.execution_job = None  # Próxima lectura de sus mensajes, agendada con root.after
         
         self.setup_ui()
         self.load_factorial_example()
@@ -226,6 +238,20 @@ class PythonCompilerIDE:
                 cursor='hand2'
             ).pack(side=tk.LEFT, padx=5)
         
+        # Casilla para medir tiempo y memoria de cada fase
+        self.measure_performance = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            toolbar,
+            text="📊 Medir rendimiento",
+            variable=self.measure_performance,
+            bg=COLORS['bg_light'],
+            fg=COLORS['fg_primary'],
+            selectcolor=COLORS['bg_dark'],
+            font=tkfont.Font(family='Segoe UI', size=9),
+            activebackground=COLORS['button_hover'],
+            cursor='hand2'
+        ).pack(side=tk.RIGHT, padx=5)
+        
         # Botón Limpiar
         btn_clear = tk.Button(
             toolbar,
@@ -240,6 +266,21 @@ class PythonCompilerIDE:
             cursor='hand2'
         )
         btn_clear.pack(side=tk.RIGHT, padx=10, pady=10)
+        
+        # Botón Detener (programas que no terminan)
+        btn_stop = tk.Button(
+            toolbar,
+            text="⏹ Detener",
+            command=self.stop_execution,
+            bg=COLORS['bg_medium'],
+            fg=COLORS['fg_primary'],
+            font=tkfont.Font(family='Segoe UI', size=10),
+            relief=tk.FLAT,
+            padx=20,
+            pady=10,
+            cursor='hand2'
+        )
+        btn_stop.pack(side=tk.RIGHT, padx=10, pady=10)
     
     def create_editor_panel(self, parent):
         """Crea el panel del editor de código"""
@@ -293,6 +334,8 @@ class PythonCompilerIDE:
         )
         self.code_editor.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.code_editor.bind('<KeyRelease>', self.update_line_numbers)
+        for level, color in enumerate(HOT_LINE_COLORS):
+            self.code_editor.tag_configure(f'hot_{level}', background=color)
         
         return editor_frame
     
@@ -330,6 +373,7 @@ class PythonCompilerIDE:
         self.create_optimization_tab()
         self.create_machine_code_tab()  # Nueva pestaña
         self.create_execution_tab()
+        self.create_performance_tab()
         self.create_semantic_rules_tab()  # Nueva pestaña
         self.create_grammar_tab()
         
@@ -431,6 +475,22 @@ class PythonCompilerIDE:
         )
         self.machine_code_text.pack(fill=tk.BOTH, expand=True)
     
+    def create_performance_tab(self):
+        """Crea la pestaña de Rendimiento"""
+        tab = tk.Frame(self.notebook, bg=COLORS['bg_editor'])
+        self.notebook.add(tab, text="📊 Rendimiento")
+        
+        self.performance_text = scrolledtext.ScrolledText(
+            tab,
+            bg=COLORS['bg_editor'],
+            fg=COLORS['fg_primary'],
+            font=tkfont.Font(family='Consolas', size=10),
+            relief=tk.FLAT,
+            padx=15,
+            pady=15
+        )
+        self.performance_text.pack(fill=tk.BOTH, expand=True)
+    
     def create_execution_tab(self):
         """Crea la pestaña de Ejecución con entrada interactiva"""
         tab = tk.Frame(self.notebook, bg=COLORS['bg_editor'])
@@ -555,24 +615,38 @@ class PythonCompilerIDE:
             messagebox.showwarning("Advertencia", "El editor está vacío")
             return
         
+        self.cancel_execution()
         self.status_bar.config(text="Analizando código...", bg=COLORS['accent_yellow'], fg='#000000')
         self.root.update()
         
         try:
+            # Sin la casilla de rendimiento las fases no miden nada
+            instrumentation = Instrumentation() if self.measure_performance.get() else NULL_INSTRUMENTATION
+            self.performance_report = instrumentation.report
+            
             # Fase 1: Análisis Léxico
-            lexer = Lexer(source_code)
-            self.tokens = lexer.tokenize()
+            # Solo se re-tokenizan las líneas modificadas desde el último análisis
+            with instrumentation.phase("Léxico") as metrics:
+                self.tokens = self.incremental_lexer.update(source_code)
+                metrics.count('tokens', len(self.tokens))
             self.display_lexical_analysis()
             
             # Fase 2: Análisis Sintáctico
-            parser = Parser(self.tokens)
-            self.ast = parser.parse()
+            with instrumentation.phase("Sintáctico") as metrics:
+                parser = Parser(self.tokens)
+                self.ast = parser.parse()
+            if instrumentation.enabled:
+                metrics.count('nodos_ast', count_ast_nodes(self.ast))
             self.display_syntax_analysis()
             
             # Fase 3: Análisis Semántico
-            self.semantic_analyzer = SemanticAnalyzer()
-            self.semantic_analyzer.analyze(self.ast)
+            with instrumentation.phase("Semántico") as metrics:
+                self.semantic_analyzer = SemanticAnalyzer()
+                self.semantic_analyzer.analyze(self.ast)
+                metrics.count('simbolos', len(self.semantic_analyzer.symbol_table))
+                metrics.count('errores', len(self.semantic_analyzer.errors))
             self.display_semantic_analysis()
+            self.display_performance()
             
             # Verificar si hay errores semánticos
             if self.semantic_analyzer.errors:
@@ -583,115 +657,36 @@ class PythonCompilerIDE:
                 return
             
             # Fase 4: Generación de Código Intermedio
-            self.tac_generator = TACGenerator()
-            self.tac_instructions = self.tac_generator.generate(self.ast)
+            with instrumentation.phase("TAC") as metrics:
+                self.tac_generator = TACGenerator()
+                self.tac_instructions = self.tac_generator.generate(self.ast)
+                metrics.count('instrucciones_tac', len(self.tac_instructions))
             self.display_intermediate_code()
             
             # Fase 5: Optimización
-            optimizer = TACOptimizer()
-            self.optimized_tac = optimizer.optimize(self.tac_instructions)
+            with instrumentation.phase("Optimización") as metrics:
+                optimizer = TACOptimizer()
+                self.optimized_tac = optimizer.optimize(self.tac_instructions)
+                metrics.count('instrucciones_antes', len(self.tac_instructions))
+                metrics.count('instrucciones_despues', len(self.optimized_tac))
             self.display_optimization(optimizer)
             
             # Fase 6: Generación de Código Máquina
-            machine_gen = MachineCodeGenerator()
-            self.machine_code = machine_gen.generate(self.optimized_tac, self.tac_generator.function_params)
+            with instrumentation.phase("Código Máquina") as metrics:
+                machine_gen = MachineCodeGenerator()
+                self.machine_code = machine_gen.generate(self.optimized_tac, self.tac_generator.function_params)
+                metrics.count('lineas_asm', len(self.machine_code))
             self.display_machine_code()
+            self.display_performance()
             
             # Fase 7: Ejecución
-            # Crear callback para entrada interactiva
             # Limpiar área de ejecución primero
             self.execution_text.config(state='normal')
             self.execution_text.delete('1.0', 'end')
             self.execution_text.insert('1.0', "SALIDA DE LA EJECUCIÓN\n" + "=" * 120 + "\n\n")
             self.execution_text.config(state='disabled')
             self.execution_text.see('end')
-            self.execution_text.update()
-            
-            # Crear callback para entrada interactiva directamente en execution_text
-            def get_user_input(prompt=""):
-                """Callback para obtener entrada del usuario directamente en execution_text"""
-                # Habilitar edición en execution_text
-                self.execution_text.config(state='normal')
-                
-                # Formatear y mostrar el prompt en la consola de ejecución
-                if prompt:
-                    # Limpiar espacios al inicio y final del prompt
-                    prompt = prompt.strip()
-                    # Agregar espacio después del prompt si no termina en dos puntos o espacio
-                    if prompt and not prompt.endswith(':') and not prompt.endswith(' '):
-                        prompt = prompt + " "
-                    # Mostrar el prompt con formato mejorado
-                    self.execution_text.insert('end', prompt)
-                    self.execution_text.see('end')
-                    self.execution_text.update()
-                
-                # Marcar el inicio de la entrada del usuario
-                self.input_start_mark = self.execution_text.index('end-1c')
-                self.execution_text.mark_set('input_start', self.input_start_mark)
-                
-                # Configurar entrada pendiente
-                self.input_pending = True
-                self.input_prompt = prompt
-                self.input_prompt_shown = True
-                
-                # Crear variable para almacenar el resultado
-                result_var = {'value': None, 'ready': False}
-                
-                def set_input_value(value):
-                    result_var['value'] = value
-                    result_var['ready'] = True
-                
-                self.input_callback_var = set_input_value
-                
-                # Enfocar execution_text y mover cursor al final
-                self.execution_text.focus_set()
-                self.execution_text.mark_set(tk.INSERT, 'end-1c')
-                self.execution_text.see('end')
-                
-                # Esperar a que el usuario ingrese el valor
-                while not result_var['ready']:
-                    self.root.update()
-                    import time
-                    time.sleep(0.05)
-                
-                return result_var['value'] or ""
-            
-            # Crear wrapper del intérprete que muestre salida en tiempo real
-            class RealTimeInterpreter(TACInterpreter):
-                def __init__(self, execution_text_widget, input_callback):
-                    super().__init__(input_callback=input_callback)
-                    self.execution_text_widget = execution_text_widget
-                
-                def execute_instruction(self, instr, instructions=None):
-                    # Ejecutar la instrucción normalmente
-                    super().execute_instruction(instr, instructions)
-                    
-                    # Si es PRINT, mostrar inmediatamente en execution_text con formato mejorado
-                    if instr.op == 'PRINT':
-                        value = self.get_value(instr.arg1)
-                        output_str = str(value)
-                        # Agregar salida al widget en tiempo real con formato
-                        self.execution_text_widget.config(state='normal')
-                        # Si el output no termina en nueva línea, agregarla
-                        if output_str and not output_str.endswith('\n'):
-                            self.execution_text_widget.insert('end', output_str + '\n')
-                        else:
-                            self.execution_text_widget.insert('end', output_str)
-                        self.execution_text_widget.see('end')
-                        self.execution_text_widget.update()
-                        # Solo deshabilitar si no hay entrada pendiente
-                        if not hasattr(self.execution_text_widget.master.master, 'input_pending') or not self.execution_text_widget.master.master.input_pending:
-                            self.execution_text_widget.config(state='disabled')
-            
-            interpreter = RealTimeInterpreter(self.execution_text, get_user_input)
-            self.execution_output = interpreter.interpret(self.optimized_tac, self.tac_generator.function_params)
-            self.display_execution()
-            
-            self.status_bar.config(
-                text="✅ Análisis completado exitosamente",
-                bg=COLORS['accent_green'],
-                fg='#000000'
-            )
+            self.start_execution()
             
         except LexerError as e:
             messagebox.showerror("Error Léxico", str(e))
@@ -703,6 +698,133 @@ class PythonCompilerIDE:
             messagebox.showerror("Error", f"Error inesperado: {str(e)}")
             self.status_bar.config(text=f"❌ Error", bg=COLORS['accent_red'])
     
+    def start_execution(self):
+        """Ejecuta el TAC optimizado en un hilo de trabajo y empieza a mostrar su salida"""
+        # Con "Medir rendimiento" también se perfila la ejecución
+        self.clear_hot_lines()
+        self.execution_worker = ExecutionWorker(self.optimized_tac, self.tac_generator.function_params,
+                                                profile=self.measure_performance.get())
+        self.execution_worker.start()
+        self.status_bar.config(text="⏳ Ejecutando programa...", bg=COLORS['accent_yellow'], fg='#000000')
+        self.execution_job = self.root.after(OUTPUT_FRAME_MS, self.poll_execution)
+    
+    def poll_execution(self):
+        """Atiende los mensajes del hilo de ejecución una vez por cuadro"""
+        self.execution_job = None
+        worker = self.execution_worker
+        if worker is None:
+            return
+        
+        lines = []
+        for kind, data in worker.drain():
+            if kind == OUTPUT:
+                lines.extend(data)
+                continue
+            # La salida acumulada va antes del prompt o del resultado final
+            self.append_execution_output(lines)
+            lines = []
+            if kind == INPUT:
+                self.request_execution_input(data, worker)
+            elif kind == DONE:
+                self.execution_worker = None
+                self.execution_output = data
+                self.display_execution()
+                if worker.interpreter.profile is not None:
+                    self.display_profile(worker.interpreter.profile)
+                self.status_bar.config(
+                    text="✅ Análisis completado exitosamente",
+                    bg=COLORS['accent_green'],
+                    fg='#000000'
+                )
+                return
+            elif kind == ERROR:
+                self.execution_worker = None
+                messagebox.showerror("Error", f"Error inesperado: {data}")
+                self.status_bar.config(text=f"❌ Error", bg=COLORS['accent_red'])
+                return
+        self.append_execution_output(lines)
+        self.execution_job = self.root.after(OUTPUT_FRAME_MS, self.poll_execution)
+    
+    def append_execution_output(self, lines):
+        """Agrega un lote de líneas de salida con un solo insert"""
+        if not lines:
+            return
+        # Cada PRINT termina en nueva línea
+        text = ''.join(line + '\n' if line and not line.endswith('\n') else line for line in lines)
+        self.execution_text.config(state='normal')
+        self.execution_text.insert('end', text)
+        self.execution_text.see('end')
+        # Solo deshabilitar si no hay entrada pendiente
+        if not self.input_pending:
+            self.execution_text.config(state='disabled')
+    
+    def request_execution_input(self, prompt, worker):
+        """Muestra el prompt de input() en execution_text; Enter entrega el valor al hilo"""
+        # Habilitar edición en execution_text
+        self.execution_text.config(state='normal')
+        
+        # Formatear y mostrar el prompt en la consola de ejecución
+        if prompt:
+            # Limpiar espacios al inicio y final del prompt
+            prompt = prompt.strip()
+            # Agregar espacio después del prompt si no termina en dos puntos o espacio
+            if prompt and not prompt.endswith(':') and not prompt.endswith(' '):
+                prompt = prompt + " "
+            self.execution_text.insert('end', prompt)
+        
+        # Marcar el inicio de la entrada del usuario
+        self.input_start_mark = self.execution_text.index('end-1c')
+        self.execution_text.mark_set('input_start', self.input_start_mark)
+        
+        # Configurar entrada pendiente; on_execution_text_enter llama al callback
+        self.input_pending = True
+        self.input_prompt = prompt
+        self.input_prompt_shown = True
+        self.input_callback_var = worker.provide_input
+        
+        # Enfocar execution_text y mover cursor al final
+        self.execution_text.focus_set()
+        self.execution_text.mark_set(tk.INSERT, 'end-1c')
+        self.execution_text.see('end')
+    
+    def display_profile(self, profile):
+        """Agrega el perfil de la ejecución a la pestaña de rendimiento y marca las líneas calientes"""
+        self.performance_text.insert('end', "\n\nPERFIL DE EJECUCIÓN\n" + "=" * 120 + "\n\n")
+        self.performance_text.insert('end', profile.format() + "\n")
+        
+        hot_lines = profile.hot_lines(len(HOT_LINE_COLORS) * 2)
+        if not hot_lines:
+            return
+        hottest = hot_lines[0].time or 1.0
+        for entry in hot_lines:
+            level = min(len(HOT_LINE_COLORS) - 1, int(entry.time / hottest * len(HOT_LINE_COLORS)))
+            self.code_editor.tag_add(f'hot_{level}', f"{entry.key}.0", f"{entry.key}.0 lineend")
+    
+    def clear_hot_lines(self):
+        for level in range(len(HOT_LINE_COLORS)):
+            self.code_editor.tag_remove(f'hot_{level}', '1.0', 'end')
+    
+    def cancel_execution(self):
+        """Detiene el hilo de ejecución; retorna True si había un programa corriendo"""
+        worker = self.execution_worker
+        if worker is None:
+            return False
+        worker.stop()
+        self.execution_worker = None
+        if self.execution_job is not None:
+            self.root.after_cancel(self.execution_job)
+            self.execution_job = None
+        self.input_pending = False
+        self.input_callback_var = None
+        self.input_start_mark = None
+        self.execution_text.config(state='disabled')
+        return True
+    
+    def stop_execution(self):
+        """Detiene el programa en ejecución (botón Detener)"""
+        if self.cancel_execution():
+            self.status_bar.config(text="⏹ Ejecución detenida", bg=COLORS['accent_yellow'], fg='#000000')
+    
     # Los métodos de display se continuarán en la siguiente parte...
     
     def display_lexical_analysis(self):
@@ -736,83 +858,7 @@ class PythonCompilerIDE:
     
     def format_ast(self, node, indent):
         """Formatea el AST"""
-        indent_str = "  " * indent
-        result = f"{indent_str}├─ {node.__class__.__name__}\n"
-        
-        if isinstance(node, ProgramNode):
-            for stmt in node.statements:
-                result += self.format_ast(stmt, indent + 1)
-        elif isinstance(node, AssignmentNode):
-            result += f"{indent_str}│  ├─ Variable: {node.identifier}\n"
-            result += f"{indent_str}│  └─ Expresión:\n"
-            result += self.format_ast(node.expression, indent + 2)
-        elif isinstance(node, PrintNode):
-            result += f"{indent_str}│  └─ Expresiones ({len(node.expressions)}):\n"
-            for i, expr in enumerate(node.expressions):
-                result += f"{indent_str}│     [{i}]:\n"
-                result += self.format_ast(expr, indent + 3)
-        elif isinstance(node, IfNode):
-            result += f"{indent_str}│  ├─ Condición:\n"
-            result += self.format_ast(node.condition, indent + 2)
-            result += f"{indent_str}│  ├─ Bloque Then:\n"
-            result += self.format_ast(node.then_block, indent + 2)
-            if node.else_block:
-                result += f"{indent_str}│  └─ Bloque Else:\n"
-                result += self.format_ast(node.else_block, indent + 2)
-        elif isinstance(node, WhileNode):
-            result += f"{indent_str}│  ├─ Condición:\n"
-            result += self.format_ast(node.condition, indent + 2)
-            result += f"{indent_str}│  └─ Bloque:\n"
-            result += self.format_ast(node.block, indent + 2)
-        elif isinstance(node, ForNode):
-            result += f"{indent_str}│  ├─ Variable: {node.identifier}\n"
-            result += f"{indent_str}│  ├─ Iterable:\n"
-            result += self.format_ast(node.iterable, indent + 2)
-            result += f"{indent_str}│  └─ Bloque:\n"
-            result += self.format_ast(node.block, indent + 2)
-        elif isinstance(node, BinaryOpNode):
-            result += f"{indent_str}│  ├─ Operador: {node.operator}\n"
-            result += f"{indent_str}│  ├─ Izquierda:\n"
-            result += self.format_ast(node.left, indent + 2)
-            result += f"{indent_str}│  └─ Derecha:\n"
-            result += self.format_ast(node.right, indent + 2)
-        elif isinstance(node, NumberNode):
-            result += f"{indent_str}│  └─ Valor: {node.value}\n"
-        elif isinstance(node, StringNode):
-            result += f"{indent_str}│  └─ Valor: \"{node.value}\"\n"
-        elif isinstance(node, IdentifierNode):
-            result += f"{indent_str}│  └─ Nombre: {node.name}\n"
-        elif isinstance(node, ListNode):
-            result += f"{indent_str}│  └─ Elementos: {len(node.elements)}\n"
-        elif isinstance(node, BlockNode):
-            for stmt in node.statements:
-                result += self.format_ast(stmt, indent + 1)
-        elif isinstance(node, FunctionNode):
-            result += f"{indent_str}│  ├─ Nombre: {node.name}\n"
-            result += f"{indent_str}│  ├─ Parámetros: {', '.join(node.parameters)}\n"
-            result += f"{indent_str}│  └─ Cuerpo:\n"
-            result += self.format_ast(node.body, indent + 2)
-        elif isinstance(node, ReturnNode):
-            if node.expression:
-                result += f"{indent_str}│  └─ Expresión:\n"
-                result += self.format_ast(node.expression, indent + 2)
-            else:
-                result += f"{indent_str}│  └─ (sin valor)\n"
-        elif isinstance(node, DictNode):
-            result += f"{indent_str}│  └─ Elementos: {len(node.items)}\n"
-            for i, (key, value) in enumerate(node.items):
-                result += f"{indent_str}│     ├─ [{i}] Clave:\n"
-                result += self.format_ast(key, indent + 3)
-                result += f"{indent_str}│     └─ Valor:\n"
-                result += self.format_ast(value, indent + 3)
-        elif isinstance(node, InputNode):
-            if node.prompt:
-                result += f"{indent_str}│  └─ Prompt:\n"
-                result += self.format_ast(node.prompt, indent + 2)
-            else:
-                result += f"{indent_str}│  └─ (sin prompt)\n"
-        
-        return result
+        return format_ast(node, indent)
     
     def display_semantic_analysis(self):
         """Muestra el análisis semántico"""
@@ -864,6 +910,19 @@ class PythonCompilerIDE:
         
         self.machine_code_text.insert('1.0', output)
     
+    def display_performance(self):
+        """Muestra el reporte de rendimiento por fase"""
+        self.performance_text.delete('1.0', 'end')
+        
+        output = "RENDIMIENTO POR FASE\n"
+        output += "=" * 120 + "\n\n"
+        if self.performance_report is None:
+            output += "Medición desactivada: marque \"📊 Medir rendimiento\" y vuelva a analizar.\n"
+        else:
+            output += self.performance_report.format() + "\n"
+        
+        self.performance_text.insert('1.0', output)
+    
     def display_execution(self):
         """Muestra la salida de ejecución"""
         # No sobrescribir si hay entrada pendiente - el contenido ya está en execution_text
@@ -975,6 +1034,8 @@ class PythonCompilerIDE:
     
     def clear_output(self):
         """Limpia todas las salidas"""
+        self.cancel_execution()
+        self.clear_hot_lines()
         self.lexical_text.delete('1.0', 'end')
         self.syntax_text.delete('1.0', 'end')
         self.semantic_text.delete('1.0', 'end')
@@ -982,6 +1043,7 @@ class PythonCompilerIDE:
         self.optimization_text.delete('1.0', 'end')
         self.machine_code_text.delete('1.0', 'end')
         self.execution_text.delete('1.0', 'end')
+        self.performance_text.delete('1.0', 'end')
         self.status_bar.config(text="Salidas limpiadas", bg=COLORS['accent_green'], fg='#000000')
     
     def load_selected_example(self):
@@ -1238,6 +1300,7 @@ class PythonCompilerIDE:
         self.style.theme_use('clam')
         
         # Datos de compilación
+        self.incremental_lexer = IncrementalLexer()
         self.tokens = []
         self.ast = None
         self.semantic_analyzer = None
@@ -1702,8 +1765,8 @@ class PythonCompilerIDE:
         
         try:
             # Fase 1: Análisis Léxico
-            lexer = Lexer(source_code)
-            self.tokens = lexer.tokenize()
+            # Solo se re-tokenizan las líneas modificadas desde el último análisis
+            self.tokens = self.incremental_lexer.update(source_code)
             self.display_lexical_analysis()
             
             # Fase 2: Análisis Sintáctico
@@ -0,0 +1,265 @@
+"""
+Grafo de Flujo de Control del Código TAC
+Divide el TAC en bloques básicos (cortando en LABEL, GOTO, IF_FALSE, CALL y
+RETURN), enlaza predecesores y sucesores, calcula dominadores y ciclos
+naturales y vuelve a la lista lineal de instrucciones sin perder ninguna
+"""
+
+from functools import cached_property
+
+
+BLOCK_END_OPS = ('GOTO', 'IF_FALSE', 'CALL', 'RETURN')  # Terminan un bloque básico
+
+
+class BasicBlock:
+    """Instrucciones que se ejecutan siempre juntas: se entra por la primera y se sale por la última"""
+
+    def __init__(self, index, instructions):
+        self.index = index
+        self.instructions = instructions
+        self.preds = []  # Índices de los bloques predecesores
+        self.succs = []  # Índices de los sucesores; en IF_FALSE primero el que sigue y luego el destino
+
+    @property
+    def label(self):
+        """Etiqueta con la que empieza el bloque, o None"""
+        first = self.instructions[0]
+        return first.arg1 if first.op == 'LABEL' else None
+
+    @property
+    def last(self):
+        return self.instructions[-1]
+
+    def __repr__(self):
+        return f"BasicBlock({self.index}, {len(self.instructions)} instrucciones, sucesores={self.succs})"
+
+
+class Loop:
+    """Ciclo natural: el encabezado domina todos sus bloques y las aristas de regreso vuelven a él"""
+
+    def __init__(self, header):
+        self.header = header
+        self.blocks = {header}
+        self.latches = []  # Bloques con una arista de regreso al encabezado
+
+    def __repr__(self):
+        return f"Loop(B{self.header}, {len(self.blocks)} bloques, regreso desde {self.latches})"
+
+
+class ControlFlowGraph:
+    """
+    Bloques básicos del TAC en su orden original, con aristas y dominadores
+
+    Las llamadas no agregan aristas hacia la función: CALL termina su bloque y
+    continúa en el siguiente, como si la llamada fuera una sola instrucción.
+    Las entradas son el primer bloque y cada bloque 'func_<nombre>'.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        # Como en el enlazador del intérprete, si una etiqueta se repite vale la última
+        self.labels = {block.label: block.index for block in blocks if block.label is not None}
+        self.entries = [block.index for block in blocks
+                        if block.index == 0 or str(block.label).startswith('func_')]
+        self.connect()
+
+    @classmethod
+    def from_instructions(cls, instructions):
+        groups = []
+        current = []
+        for instr in instructions:
+            if instr.op == 'LABEL' and current:
+                groups.append(current)
+                current = []
+            current.append(instr)
+            if instr.op in BLOCK_END_OPS:
+                groups.append(current)
+                current = []
+        if current:
+            groups.append(current)
+        return cls([BasicBlock(index, group) for index, group in enumerate(groups)])
+
+    def to_instructions(self):
+        """TAC lineal: las instrucciones de todos los bloques en orden"""
+        return [instr for block in self.blocks for instr in block.instructions]
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def connect(self):
+        count = len(self.blocks)
+        for block in self.blocks:
+            last = block.last
+            fallthrough = block.index + 1 if block.index + 1 < count else None
+            if last.op == 'GOTO':
+                targets = [self.labels.get(last.arg1)]
+            elif last.op == 'IF_FALSE':
+                targets = [fallthrough, self.labels.get(last.arg2)]
+            elif last.op == 'RETURN':
+                targets = []
+            else:
+                targets = [fallthrough]
+            # Un salto a una etiqueta inexistente no tiene arista (falla al ejecutarse)
+            for target in targets:
+                if target is not None and target not in block.succs:
+                    block.succs.append(target)
+                    self.blocks[target].preds.append(block.index)
+
+    def reverse_postorder(self):
+        """
+        Bloques alcanzables desde las entradas, en orden posterior inverso. Los
+        sucesores se recorren del último al primero para que el cuerpo de un
+        bucle quede antes que su salida
+        """
+        visited = set()
+        postorder = []
+        for entry in self.entries:
+            if entry in visited:
+                continue
+            visited.add(entry)
+            stack = [(entry, reversed(self.blocks[entry].succs))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if child not in visited:
+                        visited.add(child)
+                        stack.append((child, reversed(self.blocks[child].succs)))
+                        break
+                else:
+                    stack.pop()
+                    postorder.append(node)
+        postorder.reverse()
+        return postorder
+
+    @cached_property
+    def idom(self):
+        """Dominador inmediato de cada bloque alcanzable (se calcula la primera vez)"""
+        return self.compute_dominators()
+
+    def compute_dominators(self):
+        """
+        Dominador inmediato de cada bloque alcanzable (algoritmo de Cooper,
+        Harvey y Kennedy). Las entradas cuelgan de una raíz virtual y tienen
+        dominador None; los bloques inalcanzables no aparecen
+        """
+        root = -1
+        order = self.reverse_postorder()
+        position = {root: 0}
+        position.update((block, index + 1) for index, block in enumerate(order))
+        entries = set(self.entries)
+        idom = {root: root}
+
+        def intersect(a, b):
+            while a != b:
+                while position[a] > position[b]:
+                    a = idom[a]
+                while position[b] > position[a]:
+                    b = idom[b]
+            return a
+
+        changed = True
+        while changed:
+            changed = False
+            for block in order:
+                preds = [pred for pred in self.blocks[block].preds if pred in idom]
+                if block in entries:
+                    preds.append(root)
+                new_idom = preds[0]
+                for pred in preds[1:]:
+                    new_idom = intersect(pred, new_idom)
+                if idom.get(block) != new_idom:
+                    idom[block] = new_idom
+                    changed = True
+        del idom[root]
+        return {block: (None if dominator == root else dominator) for block, dominator in idom.items()}
+
+    def dominates(self, a, b):
+        """True si todo camino desde una entrada hasta el bloque b pasa por a"""
+        if b not in self.idom:
+            return False
+        while b is not None:
+            if b == a:
+                return True
+            b = self.idom[b]
+        return False
+
+    def dominance_frontiers(self):
+        """
+        Frontera de dominancia de cada bloque alcanzable: los bloques donde un
+        camino que sale de su región dominada se junta con otro
+        """
+        idom = self.idom
+        entries = set(self.entries)
+        frontiers = {block: set() for block in idom}
+        for block in idom:
+            preds = [pred for pred in self.blocks[block].preds if pred in idom]
+            # Una entrada también recibe el camino desde la raíz virtual
+            if len(preds) + (block in entries) < 2:
+                continue
+            for pred in preds:
+                runner = pred
+                while runner is not None and runner != idom[block]:
+                    frontiers[runner].add(block)
+                    runner = idom[runner]
+        return frontiers
+
+    def dominator_tree(self):
+        """Hijos de cada bloque en el árbol de dominadores (None agrupa las entradas)"""
+        tree = {}
+        for block in sorted(self.idom):
+            tree.setdefault(self.idom[block], []).append(block)
+        return tree
+
+    def natural_loops(self):
+        """
+        Ciclos naturales, de los más internos a los más externos. Una arista
+        b -> h es de regreso si h domina a b, y el ciclo es h más los bloques
+        que llegan a b sin pasar por h; los que comparten encabezado se juntan
+        """
+        loops = {}
+        for block in self.idom:
+            for succ in self.blocks[block].succs:
+                if not self.dominates(succ, block):
+                    continue
+                loop = loops.setdefault(succ, Loop(succ))
+                loop.latches.append(block)
+                pending = [block]
+                while pending:
+                    index = pending.pop()
+                    if index not in loop.blocks:
+                        loop.blocks.add(index)
+                        pending.extend(pred for pred in self.blocks[index].preds if pred in self.idom)
+        return sorted(loops.values(), key=lambda loop: (len(loop.blocks), loop.header))
+
+    def preheader(self, loop):
+        """
+        Bloque que cae en el encabezado del ciclo si es su única entrada desde
+        afuera, o None. Lo que se agrega al final de ese bloque queda justo
+        antes de la etiqueta del encabezado y se ejecuta una vez por entrada
+        """
+        header = loop.header
+        previous = header - 1
+        outside = [pred for pred in self.blocks[header].preds if pred not in loop.blocks]
+        if header in self.entries or outside != [previous]:
+            return None
+        last = self.blocks[previous].last
+        if last.op in ('GOTO', 'RETURN') or (last.op == 'IF_FALSE' and self.labels.get(last.arg2) == header):
+            return None
+        return previous
+
+    def format(self):
+        """Bloques con sus aristas y dominador inmediato, para mostrar en el IDE o la consola"""
+        def names(indices):
+            return ', '.join(f"B{index}" for index in indices) or '-'
+
+        lines = []
+        for block in self.blocks:
+            idom = self.idom.get(block.index)
+            dominator = f"B{idom}" if idom is not None else ('-' if block.index in self.idom else 'inalcanzable')
+            lines.append(f"B{block.index}  pred: {names(block.preds)}  succ: {names(block.succs)}  idom: {dominator}")
+            for instr in block.instructions:
+                lines.append(f"    {instr}")
+        return '\n'.join(lines)
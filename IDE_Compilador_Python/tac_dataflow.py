@@ -0,0 +1,540 @@
+"""
+Análisis de Flujo de Datos sobre el CFG
+Resolvedor genérico de problemas monótonos (hacia adelante o hacia atrás, con
+unión o intersección) guiado por una lista de trabajo, con los conjuntos
+representados como vectores de bits (enteros de Python), y los análisis
+clásicos: variables vivas, definiciones que alcanzan y expresiones disponibles
+
+Las funciones comparten las variables de quien las llama (alcance dinámico),
+así que un CALL puede leer y escribir todo lo que toca la función llamada y
+las que ésta llama, y al volver de una función siguen vivas las variables que
+se leen después de cada llamada a ella
+"""
+
+import heapq
+from collections import namedtuple
+from functools import lru_cache
+
+from tac_interpreter import BUILTIN_CALLS, FALLBACK_PARAMS, decode_operand
+
+
+BINARY_OPS = ('ADD', 'SUB', 'MUL', 'DIV', 'MOD', 'EQ', 'NEQ', 'LT', 'GT', 'LTE', 'GTE')
+
+# Operaciones que no asignan su campo result (LIST_SET y DICT_SET lo usan como valor)
+NO_DEFINITION_OPS = ('LIST_SET', 'DICT_SET')
+
+# Operaciones que cambian el contenido de la lista o diccionario de arg1
+MUTATION_OPS = ('LIST_APPEND', 'LIST_REMOVE', 'LIST_SET', 'DICT_SET')
+
+
+@lru_cache(maxsize=65536)
+def is_variable(operand):
+    return operand is not None and not isinstance(operand, tuple) and not decode_operand(operand)[0]
+
+
+def is_temporary(name):
+    """True para los temporales t<n> del generador"""
+    return name[:1] == 't' and name[1:].isdigit()
+
+
+def is_user_call(instr):
+    return instr.op == 'CALL' and instr.arg1 not in BUILTIN_CALLS
+
+
+def instruction_uses(instr):
+    """Variables que lee la instrucción (sin contar lo que lee una función llamada)"""
+    op = instr.op
+    if op in ('LABEL', 'GOTO', 'LIST_CREATE', 'DICT_CREATE'):
+        fields = ()
+    elif op in ('IF_FALSE', 'PRINT', 'RETURN', 'INPUT', 'NEG', 'NOT', 'ASSIGN'):
+        fields = (instr.arg1,)
+    elif op == 'CALL':
+        fields = instr.arg2 if isinstance(instr.arg2, tuple) else (instr.arg2,)
+    elif op in NO_DEFINITION_OPS:
+        fields = (instr.arg1, instr.arg2, instr.result)
+    else:
+        fields = (instr.arg1, instr.arg2)
+    return [field for field in fields if is_variable(field)]
+
+
+def instruction_definition(instr):
+    """Variable que la instrucción asigna siempre, o None"""
+    if instr.op in NO_DEFINITION_OPS or not is_variable(instr.result):
+        return None
+    return instr.result
+
+
+def expression_of(instr):
+    """Clave (op, arg1, arg2) del cálculo de una operación binaria, o None"""
+    if instr.op in BINARY_OPS:
+        return (instr.op, instr.arg1, instr.arg2)
+    return None
+
+
+def reads_container(key):
+    """
+    True si el valor de la expresión (op, arg1, arg2) puede cambiar cuando
+    cambia una lista sin asignarla (por un alias, por ejemplo). Con un
+    operando constante no: comparar una lista con una constante siempre da
+    lo mismo y las demás operaciones fallan; salvo MUL, que repite la lista
+    """
+    op, arg1, arg2 = key
+    return op == 'MUL' or is_variable(arg1) and (arg2 is None or is_variable(arg2))
+
+
+def bits(mask):
+    """Índices de los bits encendidos de mask, de menor a mayor"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Universe:
+    """Numera los elementos de un análisis: un conjunto es un entero con un bit por elemento"""
+
+    def __init__(self, items=()):
+        self.items = []
+        self.index = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self.index:
+            self.index[item] = len(self.items)
+            self.items.append(item)
+        return 1 << self.index[item]
+
+    def bit(self, item):
+        index = self.index.get(item)
+        return 0 if index is None else 1 << index
+
+    def mask(self, items):
+        result = 0
+        for item in items:
+            result |= self.bit(item)
+        return result
+
+    def members(self, mask):
+        return [self.items[index] for index in bits(mask)]
+
+    @property
+    def full(self):
+        return (1 << len(self.items)) - 1
+
+    def __len__(self):
+        return len(self.items)
+
+
+class CallEffects:
+    """
+    Resumen de cada función del usuario: las variables que una llamada puede
+    modificar (mod) y las que puede leer (ref), contando el código alcanzable
+    desde su etiqueta y, transitivamente, las funciones a las que llama
+    """
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.functions = {label[5:]: index for label, index in cfg.labels.items() if label.startswith('func_')}
+        self.reachable = {name: self.reachable_from(entry) for name, entry in self.functions.items()}
+        # Lo que lee y asigna cada instrucción, calculado una vez para todos los análisis
+        self.uses = {}
+        self.definition = {}
+        self.variables = variables = set()
+        block_reads = []
+        block_writes = []
+        block_calls = []
+        for block in cfg:
+            reads = set()
+            writes = set()
+            calls = set()
+            for instr in block.instructions:
+                uses = self.uses[id(instr)] = instruction_uses(instr)
+                definition = self.definition[id(instr)] = instruction_definition(instr)
+                reads.update(uses)
+                if definition:
+                    writes.add(definition)
+                if is_user_call(instr) and instr.arg1 in self.functions:
+                    calls.add(instr.arg1)
+            variables |= reads | writes
+            block_reads.append(reads)
+            block_writes.append(writes)
+            block_calls.append(calls)
+        # Los argumentos van a los parámetros, y uno que empieza con 't' no se restaura
+        # al volver aunque la función no lo mencione (los temporales t<n> no son parámetros)
+        assigned_by_call = set(FALLBACK_PARAMS) | {name for name in variables
+                                                    if name.startswith('t') and not is_temporary(name)}
+
+        self.mod = {}
+        self.ref = {}
+        callees = {}
+        for name, blocks in self.reachable.items():
+            ref = set().union(*(block_reads[index] for index in blocks))
+            self.ref[name] = ref
+            self.mod[name] = ref.union(assigned_by_call, *(block_writes[index] for index in blocks))
+            callees[name] = set().union(*(block_calls[index] for index in blocks))
+
+        changed = True
+        while changed:
+            changed = False
+            for name, called in callees.items():
+                for callee in called:
+                    if not self.mod[callee] <= self.mod[name] or not self.ref[callee] <= self.ref[name]:
+                        self.mod[name] |= self.mod[callee]
+                        self.ref[name] |= self.ref[callee]
+                        changed = True
+
+    def reachable_from(self, entry):
+        seen = {entry}
+        pending = [entry]
+        while pending:
+            for succ in self.cfg.blocks[pending.pop()].succs:
+                if succ not in seen:
+                    seen.add(succ)
+                    pending.append(succ)
+        return seen
+
+    def modified(self, instr):
+        """Variables que puede cambiar una llamada del usuario (vacío si la función no existe)"""
+        return self.mod.get(instr.arg1, ()) if is_user_call(instr) else ()
+
+    def referenced(self, instr):
+        """Variables que puede leer la función llamada"""
+        return self.ref.get(instr.arg1, ()) if is_user_call(instr) else ()
+
+    def return_sites(self):
+        """Para cada bloque con RETURN, los bloques donde puede continuar la ejecución al volver"""
+        sites = {}
+        for block in self.cfg:
+            instr = block.last
+            if is_user_call(instr) and instr.arg1 in self.functions and block.index + 1 < len(self.cfg):
+                for index in self.reachable[instr.arg1]:
+                    if self.cfg.blocks[index].last.op == 'RETURN':
+                        sites.setdefault(index, set()).add(block.index + 1)
+        return {index: sorted(targets) for index, targets in sites.items()}
+
+
+class DataflowProblem:
+    """
+    Problema monótono sobre un CFG con conjuntos de bits. Las subclases llenan
+    gen y kill de cada bloque, eligen la dirección (forward) y el encuentro
+    (may: unión; si no, intersección), y luego llaman a solve()
+    """
+
+    forward = True
+    may = True
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        count = len(cfg)
+        self.gen = [0] * count
+        self.kill = [0] * count
+        self.boundary = 0  # Valor en las entradas (hacia adelante) o en las salidas (hacia atrás)
+        self.top = 0  # Valor inicial: vacío para la unión, universo completo para la intersección
+        self.block_in = [0] * count  # Valor al comenzar cada bloque
+        self.block_out = [0] * count  # Valor al terminar cada bloque
+
+    def successors(self, index):
+        return self.cfg.blocks[index].succs
+
+    def predecessors(self, index):
+        return self.cfg.blocks[index].preds
+
+    def transfer(self, index, value):
+        return self.gen[index] | (value & ~self.kill[index])
+
+    def solve(self):
+        """
+        Itera hasta el punto fijo. La lista de trabajo saca siempre el bloque
+        pendiente que va primero en orden posterior inverso (orden posterior si
+        es hacia atrás), así cada ola de cambios recorre el grafo una sola vez
+        """
+        count = len(self.cfg)
+        order = self.cfg.reverse_postorder()
+        reached = set(order)
+        order.extend(index for index in range(count) if index not in reached)
+        if self.forward:
+            sources = [self.predecessors(index) for index in range(count)]
+            targets = [self.successors(index) for index in range(count)]
+            boundary = set(self.cfg.entries)
+        else:
+            order.reverse()
+            sources = [self.successors(index) for index in range(count)]
+            targets = [self.predecessors(index) for index in range(count)]
+            boundary = {index for index in range(count) if not sources[index]}
+        rank = [0] * count
+        for position, index in enumerate(order):
+            rank[index] = position
+
+        before = [self.top] * count
+        after = [self.top] * count
+        pending = list(range(count))  # Rangos pendientes (es un heap: ya está ordenado)
+        queued = [True] * count
+        while pending:
+            index = order[heapq.heappop(pending)]
+            queued[index] = False
+            neighbors = sources[index]
+            if index in boundary:
+                value = self.boundary
+            elif neighbors:
+                value = after[neighbors[0]]
+            else:
+                value = self.top
+            for neighbor in neighbors:
+                value = value | after[neighbor] if self.may else value & after[neighbor]
+            before[index] = value
+            value = self.transfer(index, value)
+            if value != after[index]:
+                after[index] = value
+                for target in targets[index]:
+                    if not queued[target]:
+                        queued[target] = True
+                        heapq.heappush(pending, rank[target])
+
+        if self.forward:
+            self.block_in, self.block_out = before, after
+        else:
+            self.block_in, self.block_out = after, before
+        return self
+
+
+class Liveness(DataflowProblem):
+    """
+    Variables vivas: las que algún camino vuelve a leer antes de asignarlas.
+    Con removable (instrucción -> bool, True si no tiene más efecto que su
+    asignación) calcula variables vivas fuertes: lo que lee una instrucción
+    así cuyo resultado está muerto no cuenta, de modo que una cadena entera
+    de cálculos inútiles queda muerta en una sola pasada
+    """
+
+    forward = False
+
+    def __init__(self, cfg, effects=None, removable=None):
+        super().__init__(cfg)
+        self.effects = effects or CallEffects(cfg)
+        self.variables = Universe()
+        self.uses = {}
+        self.definitions = {}
+        self.removable = set()  # id de las instrucciones que se pueden quitar si su resultado está muerto
+        referenced = {}  # Función -> variables que puede leer una llamada
+        for block in cfg:
+            for instr in block.instructions:
+                mask = 0
+                for name in self.effects.uses[id(instr)]:
+                    mask |= self.variables.add(name)
+                if is_user_call(instr):
+                    if instr.arg1 not in referenced:
+                        referenced[instr.arg1] = 0
+                        for name in sorted(self.effects.referenced(instr)):
+                            referenced[instr.arg1] |= self.variables.add(name)
+                    mask |= referenced[instr.arg1]
+                self.uses[id(instr)] = mask
+                definition = self.effects.definition[id(instr)]
+                self.definitions[id(instr)] = self.variables.add(definition) if definition else 0
+                if definition and removable and removable(instr):
+                    self.removable.add(id(instr))
+        # Al volver de una función siguen vivas las variables vivas después de cada llamada
+        self.return_targets = self.effects.return_sites()
+        self.return_sources = {}
+        for index, targets in self.return_targets.items():
+            for target in targets:
+                self.return_sources.setdefault(target, []).append(index)
+        for block in cfg:
+            gen = kill = 0
+            for instr in reversed(block.instructions):
+                defined = self.definitions[id(instr)]
+                gen = (gen & ~defined) | self.uses[id(instr)]
+                kill |= defined
+            self.gen[block.index] = gen
+            self.kill[block.index] = kill
+        self.solve()
+
+    def transfer(self, index, value):
+        if not self.removable:
+            return super().transfer(index, value)
+        # Las vivas fuertes no se resumen en gen y kill: se recorre el bloque
+        for instr in reversed(self.cfg.blocks[index].instructions):
+            value = self.step(instr, value)
+        return value
+
+    def successors(self, index):
+        return self.cfg.blocks[index].succs + self.return_targets.get(index, [])
+
+    def predecessors(self, index):
+        return self.cfg.blocks[index].preds + self.return_sources.get(index, [])
+
+    def step(self, instr, live):
+        """Variables vivas antes de instr, dadas las vivas después"""
+        if self.is_dead(instr, live):
+            return live
+        return (live & ~self.definitions[id(instr)]) | self.uses[id(instr)]
+
+    def is_dead(self, instr, live):
+        """True si instr se puede quitar: no tiene otro efecto y su resultado no está vivo después"""
+        return id(instr) in self.removable and not live & self.definitions[id(instr)]
+
+    def is_live(self, name, live):
+        return bool(live & self.variables.bit(name))
+
+    def live_after(self, index):
+        """Variables vivas después de cada instrucción del bloque, en orden"""
+        live = self.block_out[index]
+        result = []
+        for instr in reversed(self.cfg.blocks[index].instructions):
+            result.append(live)
+            live = self.step(instr, live)
+        result.reverse()
+        return result
+
+
+class Definition(namedtuple('Definition', 'variable block position')):
+    """
+    Asignación a una variable en la instrucción position del bloque block. Con
+    block None es un valor desconocido: el que trae la variable al entrar a una
+    función o el que le puede dejar una llamada
+    """
+    __slots__ = ()
+
+    def __new__(cls, variable, block=None, position=None):
+        return super().__new__(cls, variable, block, position)
+
+    @property
+    def known(self):
+        return self.block is not None
+
+
+class ReachingDefinitions(DataflowProblem):
+    """
+    Definiciones que alcanzan: las asignaciones que pueden haber dado su valor
+    a cada variable. Con variables se siguen solo esas (menos bits por conjunto)
+    """
+
+    def __init__(self, cfg, effects=None, variables=None):
+        super().__init__(cfg)
+        self.effects = effects or CallEffects(cfg)
+        tracked = self.effects.variables if variables is None else self.effects.variables & set(variables)
+        self.definitions = Universe()
+        self.of_variable = {}  # Variable -> máscara de todas sus definiciones
+        registered = []
+        unknown_after_call = {}  # Función -> valores desconocidos que deja una llamada
+        for block in cfg:
+            for position, instr in enumerate(block.instructions):
+                definition = self.effects.definition[id(instr)]
+                if definition not in tracked:
+                    definition = None
+                bit = self.add(Definition(definition, block.index, position)) if definition else 0
+                unknown = 0
+                if is_user_call(instr):
+                    if instr.arg1 not in unknown_after_call:
+                        unknown_after_call[instr.arg1] = 0
+                        for name in tracked.intersection(self.effects.modified(instr)):
+                            unknown_after_call[instr.arg1] |= self.add(Definition(name))
+                    unknown = unknown_after_call[instr.arg1]
+                registered.append((instr, unknown, definition, bit))
+        for name in sorted(tracked):
+            self.boundary |= self.add(Definition(name))
+        # id(instrucción) -> (desconocidas que agrega, definiciones que reemplaza, la suya)
+        self.effect = {id(instr): (unknown, self.of_variable[definition] if definition else 0, bit)
+                       for instr, unknown, definition, bit in registered}
+        for block in cfg:
+            reaching = kill = 0
+            for instr in block.instructions:
+                reaching = self.step(instr, reaching)
+                kill |= self.effect[id(instr)][1]
+            self.gen[block.index] = reaching
+            self.kill[block.index] = kill
+        self.solve()
+
+    def add(self, definition):
+        bit = self.definitions.add(definition)
+        self.of_variable[definition.variable] = self.of_variable.get(definition.variable, 0) | bit
+        return bit
+
+    def step(self, instr, reaching):
+        """Definiciones que alcanzan después de instr, dadas las que alcanzan antes"""
+        unknown, replaced, bit = self.effect[id(instr)]
+        return ((reaching | unknown) & ~replaced) | bit
+
+    def walk(self, index):
+        """(posición, instrucción, definiciones que la alcanzan) para cada instrucción del bloque"""
+        reaching = self.block_in[index]
+        for position, instr in enumerate(self.cfg.blocks[index].instructions):
+            yield position, instr, reaching
+            reaching = self.step(instr, reaching)
+
+    def reaching(self, name, mask):
+        """Definiciones de la variable name incluidas en mask"""
+        return self.definitions.members(mask & self.of_variable.get(name, 0))
+
+    def instruction(self, definition):
+        return self.cfg.blocks[definition.block].instructions[definition.position]
+
+
+class AvailableExpressions(DataflowProblem):
+    """Expresiones disponibles: cálculos binarios hechos en todo camino y cuyos operandos no cambiaron"""
+
+    may = False
+
+    def __init__(self, cfg, effects=None):
+        super().__init__(cfg)
+        self.effects = effects or CallEffects(cfg)
+        self.expressions = Universe()
+        self.using = {}  # Variable -> máscara de las expresiones que la leen
+        self.containers = 0  # Expresiones que pueden leer una lista o diccionario
+        for block in cfg:
+            for instr in block.instructions:
+                key = expression_of(instr)
+                if key:
+                    bit = self.expressions.add(key)
+                    for name in self.effects.uses[id(instr)]:
+                        self.using[name] = self.using.get(name, 0) | bit
+                    if reads_container(key):
+                        self.containers |= bit
+        self.top = self.expressions.full
+        self.effect = {}  # id(instrucción) -> (expresiones que invalida, la que calcula)
+        killed_by_call = {}  # Función -> expresiones que invalida una llamada
+        for block in cfg:
+            gen = kill = 0
+            for instr in block.instructions:
+                killed = 0
+                if is_user_call(instr):
+                    # La función puede cambiar una lista que recibió como argumento
+                    if instr.arg1 not in killed_by_call:
+                        killed_by_call[instr.arg1] = self.using_any(self.effects.modified(instr)) | self.containers
+                    killed = killed_by_call[instr.arg1]
+                elif instr.op in MUTATION_OPS:
+                    killed = self.containers | self.using.get(instr.arg1, 0)
+                definition = self.effects.definition[id(instr)]
+                if definition:
+                    killed |= self.using.get(definition, 0)
+                key = expression_of(instr)
+                # x = x + 1 calcula la expresión pero cambia su operando
+                generated = self.expressions.bit(key) if key and not killed & self.expressions.bit(key) else 0
+                self.effect[id(instr)] = (killed, generated)
+                gen = (gen & ~killed) | generated
+                kill |= killed
+            self.gen[block.index] = gen
+            self.kill[block.index] = kill
+        self.solve()
+
+    def using_any(self, names):
+        """Expresiones que leen alguna de las variables names"""
+        mask = 0
+        for name in names:
+            mask |= self.using.get(name, 0)
+        return mask
+
+    def step(self, instr, available):
+        """Expresiones disponibles después de instr, dadas las disponibles antes"""
+        killed, generated = self.effect[id(instr)]
+        return (available & ~killed) | generated
+
+    def walk(self, index):
+        """(posición, instrucción, expresiones disponibles antes de ella) para cada instrucción del bloque"""
+        available = self.block_in[index]
+        for position, instr in enumerate(self.cfg.blocks[index].instructions):
+            yield position, instr, available
+            available = self.step(instr, available)
+
+    def is_available(self, key, mask):
+        return bool(mask & self.expressions.bit(key))
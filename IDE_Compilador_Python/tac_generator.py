@@ -6,13 +6,21 @@ Convierte el AST en código de tres direcciones
 from python_compiler import *
 
 
+def operands(value):
+    """Operandos de un campo TAC: los argumentos de un CALL son una tupla, el resto un solo valor"""
+    if isinstance(value, tuple):
+        return value
+    return (value,) if value else ()
+
+
 class TACInstruction:
     """Representa una instrucción TAC"""
-    def __init__(self, op, arg1=None, arg2=None, result=None):
+    def __init__(self, op, arg1=None, arg2=None, result=None, line=0):
         self.op = op
         self.arg1 = arg1
         self.arg2 = arg2
         self.result = result
+        self.line = line  # Línea del código fuente que la generó (0 si no se conoce)
     
     def __str__(self):
         if self.op == 'ASSIGN':
@@ -51,7 +59,7 @@ class TACInstruction:
             return f"{self.arg1}[{self.arg2}] = {self.result}"
         elif self.op == 'CALL':
             if self.arg2:
-                return f"{self.result} = {self.arg1}({self.arg2})"
+                return f"{self.result} = {self.arg1}({', '.join(operands(self.arg2))})"
             else:
                 return f"{self.result} = {self.arg1}()"
         elif self.op == 'RETURN':
@@ -77,24 +85,27 @@ class TACInstruction:
 class TACGenerator:
     """Generador de Código de Tres Direcciones"""
     
-    def __init__(self):
+    def __init__(self, symbols=None):
         self.instructions = []
+        # Los nombres generados se internan igual que los identificadores del lexer
+        self.symbols = symbols if symbols is not None else SymbolTable()
         self.temp_counter = 0
         self.label_counter = 0
         self.function_params = {}  # {nombre_funcion: [param1, param2, ...]}
+        self.current_line = 0  # Línea del nodo que se está visitando
     
     def new_temp(self):
-        temp = f"t{self.temp_counter}"
+        temp = self.symbols.intern(f"t{self.temp_counter}")
         self.temp_counter += 1
         return temp
     
     def new_label(self):
-        label = f"L{self.label_counter}"
+        label = self.symbols.intern(f"L{self.label_counter}")
         self.label_counter += 1
         return label
     
     def emit(self, op, arg1=None, arg2=None, result=None):
-        instr = TACInstruction(op, arg1, arg2, result)
+        instr = TACInstruction(op, arg1, arg2, result, self.current_line)
         self.instructions.append(instr)
         return instr
     
@@ -105,7 +116,15 @@ class TACGenerator:
     def visit(self, node):
         method_name = f'visit_{node.__class__.__name__}'
         visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        line = getattr(node, 'line', 0)
+        if not line:
+            return visitor(node)
+        # Las instrucciones emitidas llevan la línea del nodo más interno que la conoce
+        previous_line = self.current_line
+        self.current_line = line
+        result = visitor(node)
+        self.current_line = previous_line
+        return result
     
     def generic_visit(self, node):
         raise Exception(f'No hay método visit para {node.__class__.__name__}')
@@ -182,7 +201,7 @@ class TACGenerator:
             self.emit('LABEL', end_label)
         else:
             list_result = self.visit(node.iterable)
-            counter = f"_idx_{node.identifier}"
+            counter = self.symbols.intern(f"_idx_{node.identifier}")
             list_len = self.new_temp()
             
             self.emit('CALL', 'len', list_result, list_len)
@@ -295,10 +314,9 @@ class TACGenerator:
             # El intérprete manejará la asignación de argumentos a parámetros
             # en el contexto de la función llamada, no en el contexto actual
             
-            # Emitir la llamada con los argumentos
-            args_str = ', '.join(args_results) if args_results else None
+            # Emitir la llamada con los argumentos como tupla de operandos
             temp = self.new_temp()
-            self.emit('CALL', node.function, args_str, temp)
+            self.emit('CALL', node.function, tuple(args_results), temp)
             return temp
     
     def visit_BlockNode(self, node):
@@ -312,7 +330,7 @@ class TACGenerator:
         self.function_params[node.name] = node.parameters
         
         # Etiqueta para el inicio de la función
-        func_label = f"func_{node.name}"
+        func_label = self.symbols.intern(f"func_{node.name}")
         self.emit('LABEL', func_label)
         
         # Los parámetros se asignarán cuando se llame la función
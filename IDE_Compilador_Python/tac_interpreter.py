@@ -3,21 +3,234 @@ Intérprete de Código TAC
 Ejecuta el código de tres direcciones y genera la salida
 """
 
+import operator
+import time
+
 from tac_generator import TACInstruction
+from tac_profiler import ExecutionProfile
+
+
+ENGINES = ('classic', 'closure')
+
+JUMP_OPS = {'GOTO': 'arg1', 'IF_FALSE': 'arg2'}  # Operación de salto -> campo con la etiqueta
+
+BUILTIN_CALLS = ('len', 'int', 'input')
+
+# Operaciones que usan arg1 como nombre de variable (la leen sin exigir que exista)
+NAMED_ARG1_OPS = ('LIST_APPEND', 'LIST_REMOVE', 'DICT_SET', 'LIST_SET')
+
+# Nombres que reciben los argumentos cuando no se conocen los parámetros de la función
+FALLBACK_PARAMS = ['n', 'x', 'y', 'z', 'a', 'b', 'c']
+
+UNDEFINED = object()  # Contenido de un slot de variable aún no asignada
+
+STEP_CHUNK = 1000  # Instrucciones entre consultas al reloj en step_until()
+
+
+def decode_operand(operand):
+    """
+    Clasifica un operando una sola vez: (True, valor) si es una constante
+    (None, string entre comillas, número, True/False) o (False, nombre) si es
+    una variable
+    """
+    if operand is None:
+        return (True, None)
+    
+    if isinstance(operand, str) and operand.startswith('"') and operand.endswith('"'):
+        return (True, operand[1:-1])
+    
+    try:
+        if '.' in str(operand):
+            return (True, float(operand))
+        else:
+            return (True, int(operand))
+    except (ValueError, TypeError):
+        pass
+    
+    if operand == 'True':
+        return (True, True)
+    if operand == 'False':
+        return (True, False)
+    
+    return (False, operand)
+
+
+class LinkedInstruction(TACInstruction):
+    """
+    Instrucción TAC enlazada: saltos resueltos y operandos ya decodificados.
+    Los operandos variables quedan como (False, slot), con slot el índice de la
+    variable en el arreglo de variables del intérprete
+    """
+
+    def __init__(self, instr, source_index, slots):
+        super().__init__(instr.op, instr.arg1, instr.arg2, instr.result, instr.line)
+        op = instr.op
+        user_call = op == 'CALL' and instr.arg1 not in BUILTIN_CALLS
+        self.source_index = source_index  # Posición en la lista TAC original
+        self.target = None  # Índice del destino de un salto (None si la etiqueta no existe)
+        no_operand = (True, None)
+        self.arg1_operand = no_operand if op in ('GOTO', 'CALL') else slots.resolve(instr.arg1)
+        self.arg2_operand = no_operand if op == 'IF_FALSE' or user_call else slots.resolve(instr.arg2)
+        self.result_operand = slots.resolve(instr.result)
+        self.arg1_slot = slots.slot(instr.arg1) if op in NAMED_ARG1_OPS else None
+        self.result_slot = slots.slot(instr.result)  # Destino del resultado
+        # Argumentos de una llamada a función del usuario (arg2 es una tupla de operandos)
+        self.call_operands = [slots.resolve(arg) for arg in instr.arg2] if user_call and instr.arg2 else []
+
+
+class SlotTable:
+    """Asigna a cada nombre de variable un índice fijo (slot) en el arreglo de variables"""
+
+    def __init__(self):
+        self.index = {}
+        self.names = []
+
+    def slot(self, name):
+        slot = self.index.get(name)
+        if slot is None:
+            slot = self.index[name] = len(self.names)
+            self.names.append(name)
+        return slot
+
+    def resolve(self, operand):
+        """decode_operand con las variables traducidas a su slot"""
+        is_constant, value = decode_operand(operand)
+        if is_constant:
+            return (True, value)
+        return (False, self.slot(value))
+
+    def __len__(self):
+        return len(self.names)
+
+
+class LinkedProgram:
+    """Programa TAC listo para ejecutar: sin LABEL, con saltos a índices enteros"""
+
+    def __init__(self, code, labels, functions, slots):
+        self.code = code            # Lista de LinkedInstruction
+        self.labels = labels        # {etiqueta: índice en code}
+        self.functions = functions  # {nombre: (inicio, fin)} en índices de code
+        self.slots = slots          # SlotTable con las variables del programa
+
+
+def link(instructions):
+    """
+    Enlaza una lista de instrucciones TAC
+
+    Quita las instrucciones LABEL (cada etiqueta apunta a la siguiente
+    instrucción real), resuelve los destinos de GOTO/IF_FALSE a índices,
+    enhebra los saltos que caen en un GOTO para que vayan directo a su destino
+    final y elimina los GOTO que saltan a la instrucción siguiente. Cada
+    variable recibe un slot.
+    """
+    slots = SlotTable()
+    code = []
+    labels = {}
+    function_labels = []
+    for i, instr in enumerate(instructions):
+        if instr.op == 'LABEL':
+            labels[instr.arg1] = len(code)
+            if instr.arg1.startswith('func_'):
+                function_labels.append(instr.arg1)
+        else:
+            code.append(LinkedInstruction(instr, i, slots))
+
+    for instr in code:
+        field = JUMP_OPS.get(instr.op)
+        if field is not None:
+            instr.target = labels.get(getattr(instr, field))
+
+    # Enhebrado: un salto a un GOTO va directo al destino del GOTO
+    for instr in code:
+        if instr.target is None:
+            continue
+        seen = set()
+        target = instr.target
+        while (target < len(code) and code[target].op == 'GOTO'
+               and code[target].target is not None and target not in seen):
+            seen.add(target)
+            target = code[target].target
+        instr.target = target
+
+    # Un GOTO a la instrucción siguiente equivale a seguir de largo
+    removed = [instr.op == 'GOTO' and instr.target == index + 1 for index, instr in enumerate(code)]
+    if any(removed):
+        new_index = []
+        kept = 0
+        for flag in removed:
+            new_index.append(kept)
+            kept += not flag
+        new_index.append(kept)
+        code = [instr for instr, flag in zip(code, removed) if not flag]
+        for instr in code:
+            if instr.target is not None:
+                instr.target = new_index[instr.target]
+        labels = {label: new_index[index] for label, index in labels.items()}
+
+    functions = {}
+    for position, label in enumerate(function_labels):
+        # La función termina donde empieza la siguiente (o al final del programa)
+        end = labels[function_labels[position + 1]] if position + 1 < len(function_labels) else len(code)
+        functions[label[5:]] = (labels[label], end)  # Quitar 'func_'
+    return LinkedProgram(code, labels, functions, slots)
+
+
+def function_parameters(func_name, function_params=None):
+    """Nombres de los parámetros de una función (con nombres comunes si no se conocen)"""
+    # Obtener parámetros desde function_params si está disponible
+    if function_params and func_name in function_params:
+        return function_params[func_name]
+    # Fallback: usar nombres comunes basados en el nombre de la función
+    if func_name == 'factorial':
+        return ['n']
+    elif func_name == 'suma':
+        return ['a', 'b']
+    return []
 
 
 class TACInterpreter:
     """Intérprete para código TAC"""
     
-    def __init__(self, input_callback=None):
-        self.variables = {}
+    # Operaciones binarias del motor de clausuras: (función, mensaje si el divisor es cero)
+    BINARY_OPERATIONS = {
+        'ADD': (operator.add, None),
+        'SUB': (operator.sub, None),
+        'MUL': (operator.mul, None),
+        'DIV': (operator.truediv, "Error de ejecución: División por cero"),
+        'MOD': (operator.mod, "Error de ejecución: Módulo por cero"),
+        'EQ': (operator.eq, None),
+        'NEQ': (operator.ne, None),
+        'LT': (operator.lt, None),
+        'GT': (operator.gt, None),
+        'LTE': (operator.le, None),
+        'GTE': (operator.ge, None),
+    }
+    
+    def __init__(self, input_callback=None, engine='closure', profile=False):
+        """
+        Args:
+            input_callback: Función que recibe el prompt y retorna la entrada del usuario
+            engine: 'closure' compila cada instrucción a una función especializada;
+                'classic' ejecuta con execute_instruction (las subclases que lo
+                redefinen deben usar este motor)
+            profile: Mide cada instrucción ejecutada; el resultado queda en self.profile
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de ejecución desconocido: {engine} (opciones: {', '.join(ENGINES)})")
+        self.engine = engine
+        self.slots = []  # Valor de cada variable por slot (UNDEFINED si no fue asignada)
+        self.slot_names = []
+        self.slot_index = {}
         self.output = []
         self.pc = 0
+        self.code = []  # Programa enlazado que se está ejecutando
+        self.steps = []  # Una clausura por instrucción (motor 'closure')
         self.labels = {}
         self.call_stack = []  # Pila de llamadas para funciones
         self.functions = {}  # Diccionario de funciones: {nombre: (inicio_pc, fin_pc)}
         self.return_value = None
         self.input_callback = input_callback  # Callback para obtener entrada del usuario
+        self.profile = ExecutionProfile() if profile else None
     
     def interpret(self, instructions, function_params=None):
         """Ejecuta las instrucciones TAC
@@ -26,42 +239,42 @@ class TACInterpreter:
             instructions: Lista de instrucciones TAC
             function_params: Diccionario con parámetros de funciones {nombre: [param1, param2, ...]}
         """
-        self.variables = {}
+        self.start(instructions, function_params)
+        self.run()
+        return '\n'.join(self.output)
+    
+    def start(self, instructions, function_params=None):
+        """Prepara la ejecución sin ejecutar instrucciones; después se avanza con run() o step_until()"""
         self.output = []
         self.pc = 0
         self.labels = {}
         self.call_stack = []
         self.functions = {}
         self.return_value = None
-        self.function_info = {}  # {nombre: {'start': pc, 'end': pc, 'params': [...]}}
-        
-        # Primera pasada: identificar funciones y etiquetas
-        
-        for i, instr in enumerate(instructions):
-            if instr.op == 'LABEL':
-                self.labels[instr.arg1] = i
-                if instr.arg1.startswith('func_'):
-                    func_name = instr.arg1[5:]  # Quitar 'func_'
-                    # Buscar el final de la función (siguiente función o fin)
-                    end_pc = len(instructions)
-                    for j in range(i + 1, len(instructions)):
-                        if instructions[j].op == 'LABEL' and instructions[j].arg1.startswith('func_'):
-                            end_pc = j
-                            break
-                    self.functions[func_name] = (i, end_pc)  # (start, end)
-                    # Obtener parámetros desde function_params si está disponible
-                    params = []
-                    if function_params and func_name in function_params:
-                        params = function_params[func_name]
-                    else:
-                        # Fallback: usar nombres comunes basados en el nombre de la función
-                        if func_name == 'factorial':
-                            params = ['n']
-                        elif func_name == 'suma':
-                            params = ['a', 'b']
-                        elif func_name == 'main':
-                            params = []
-                    self.function_info[func_name] = {'start': i, 'end': end_pc, 'params': params}
+        self.function_info = {}  # {nombre: {'start': pc, 'end': pc, 'params': [...], ...}}
+        
+        # Enlazar: etiquetas resueltas a índices, sin LABEL y con saltos enhebrados
+        program = link(instructions)
+        code = program.code
+        slots = program.slots
+        self.labels = program.labels
+        self.functions = program.functions
+        for func_name, (start, end_pc) in self.functions.items():
+            params = function_parameters(func_name, function_params)
+            self.function_info[func_name] = {
+                'start': start,
+                'end': end_pc,
+                'params': params,
+                'param_slots': [slots.slot(name) for name in params],
+                # Al volver se restauran los parámetros del llamador; los que empiezan
+                # con 't' se tratan como temporales y conservan el valor de la función
+                'restore_slots': [slots.slot(name) for name in params if not str(name).startswith('t')],
+            }
+        for name in FALLBACK_PARAMS:
+            slots.slot(name)
+        self.slot_names = slots.names
+        self.slot_index = slots.index
+        self.slots = [UNDEFINED] * len(slots)
         
         # Buscar la función main() y comenzar desde ahí
         # Si no existe main(), comenzar desde el inicio
@@ -71,123 +284,204 @@ class TACInterpreter:
         else:
             self.pc = 0  # Comenzar desde el inicio si no hay main()
         
-        # Ejecutar instrucciones
-        while self.pc < len(instructions):
-            instr = instructions[self.pc]
-            self.execute_instruction(instr, instructions)
-            self.pc += 1
+        self.code = code
+        if self.engine == 'closure':
+            self.steps = [self.compile_instruction(instr, code) for instr in code]
+        if self.profile is not None:
+            self.profile.begin(code, self.functions, self.pc)
+    
+    @property
+    def finished(self):
+        return self.pc >= len(self.code)
+    
+    def run(self, max_steps=None):
+        """Ejecuta hasta terminar el programa o hasta completar max_steps instrucciones
         
-        return '\n'.join(self.output)
+        El pc, la pila de llamadas, las variables y la salida se conservan entre
+        llamadas, así que la ejecución se puede reanudar. Retorna True si el
+        programa terminó.
+        """
+        if self.profile is not None:
+            return self.run_profiled(max_steps)
+        # El pc ya apunta a la siguiente instrucción al ejecutar cada una
+        code = self.code
+        end = len(code)
+        if self.engine == 'closure':
+            steps = self.steps
+            if max_steps is None:
+                while self.pc < end:
+                    step = steps[self.pc]
+                    self.pc += 1
+                    step()
+            else:
+                for _ in range(max_steps):
+                    if self.pc >= end:
+                        break
+                    step = steps[self.pc]
+                    self.pc += 1
+                    step()
+        else:
+            if max_steps is None:
+                while self.pc < end:
+                    instr = code[self.pc]
+                    self.pc += 1
+                    self.execute_instruction(instr, code)
+            else:
+                for _ in range(max_steps):
+                    if self.pc >= end:
+                        break
+                    instr = code[self.pc]
+                    self.pc += 1
+                    self.execute_instruction(instr, code)
+        return self.pc >= end
+    
+    def run_profiled(self, max_steps=None):
+        """run() midiendo el tiempo de cada instrucción en self.profile"""
+        profile = self.profile
+        counts, times, stacks, lines = profile.counts, profile.times, profile.stacks, profile.lines
+        code = self.code
+        end = len(code)
+        steps = self.steps if self.engine == 'closure' else None
+        call_stack = self.call_stack
+        clock = time.perf_counter
+        depth = None
+        executed = 0
+        while self.pc < end and (max_steps is None or executed < max_steps):
+            index = self.pc
+            # La pila de funciones solo cambia con CALL/RETURN
+            if len(call_stack) != depth:
+                depth = len(call_stack)
+                path = profile.path(call_stack)
+            self.pc += 1
+            started = clock()
+            if steps is not None:
+                steps[index]()
+            else:
+                self.execute_instruction(code[index], code)
+            elapsed = clock() - started
+            counts[index] += 1
+            times[index] += elapsed
+            stacks[path, lines[index]] += elapsed
+            executed += 1
+        return self.pc >= end
+    
+    def step_until(self, deadline, chunk=STEP_CHUNK):
+        """Ejecuta tramos de chunk instrucciones hasta terminar o hasta pasar deadline
+        (en segundos de time.perf_counter()). Retorna True si el programa terminó"""
+        while not self.run(chunk):
+            if time.perf_counter() >= deadline:
+                return False
+        return True
     
     def execute_instruction(self, instr, instructions=None):
         """Ejecuta una instrucción individual"""
         
         if instr.op == 'ASSIGN':
-            value = self.get_value(instr.arg1)
-            self.variables[instr.result] = value
+            value = self.load(instr.arg1_operand)
+            self.slots[instr.result_slot] = value
         
         elif instr.op == 'ADD':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left + right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left + right
         
         elif instr.op == 'SUB':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left - right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left - right
         
         elif instr.op == 'MUL':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left * right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left * right
         
         elif instr.op == 'DIV':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
             if right == 0:
                 raise Exception("Error de ejecución: División por cero")
-            self.variables[instr.result] = left / right
+            self.slots[instr.result_slot] = left / right
         
         elif instr.op == 'MOD':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
             if right == 0:
                 raise Exception("Error de ejecución: Módulo por cero")
-            self.variables[instr.result] = left % right
+            self.slots[instr.result_slot] = left % right
         
         elif instr.op == 'NEG':
-            value = self.get_value(instr.arg1)
-            self.variables[instr.result] = -value
+            value = self.load(instr.arg1_operand)
+            self.slots[instr.result_slot] = -value
         
         elif instr.op == 'NOT':
-            value = self.get_value(instr.arg1)
-            self.variables[instr.result] = not value
+            value = self.load(instr.arg1_operand)
+            self.slots[instr.result_slot] = not value
         
         elif instr.op == 'EQ':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left == right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left == right
         
         elif instr.op == 'NEQ':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left != right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left != right
         
         elif instr.op == 'LT':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left < right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left < right
         
         elif instr.op == 'GT':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left > right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left > right
         
         elif instr.op == 'LTE':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left <= right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left <= right
         
         elif instr.op == 'GTE':
-            left = self.get_value(instr.arg1)
-            right = self.get_value(instr.arg2)
-            self.variables[instr.result] = left >= right
+            left = self.load(instr.arg1_operand)
+            right = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = left >= right
         
         elif instr.op == 'PRINT':
-            value = self.get_value(instr.arg1)
+            value = self.load(instr.arg1_operand)
             self.output.append(str(value))
         
         elif instr.op == 'LABEL':
             pass
         
         elif instr.op == 'GOTO':
-            if instr.arg1 in self.labels:
-                self.pc = self.labels[instr.arg1] - 1
+            if instr.target is not None:
+                self.pc = instr.target
             else:
                 raise Exception(f"Error de ejecución: Etiqueta no encontrada: {instr.arg1}")
         
         elif instr.op == 'IF_FALSE':
-            condition = self.get_value(instr.arg1)
+            condition = self.load(instr.arg1_operand)
             if not condition:
-                if instr.arg2 in self.labels:
-                    self.pc = self.labels[instr.arg2] - 1
+                if instr.target is not None:
+                    self.pc = instr.target
                 else:
                     raise Exception(f"Error de ejecución: Etiqueta no encontrada: {instr.arg2}")
         
         elif instr.op == 'LIST_CREATE':
-            self.variables[instr.result] = []
+            self.slots[instr.result_slot] = []
         
         elif instr.op == 'LIST_APPEND':
-            list_var = self.variables.get(instr.arg1, [])
-            value = self.get_value(instr.arg2)
+            list_var = self.lookup(instr.arg1_slot, [])
+            value = self.load(instr.arg2_operand)
             if isinstance(list_var, list):
                 list_var.append(value)
             else:
                 raise Exception(f"Error de ejecución: {instr.arg1} no es una lista")
         
         elif instr.op == 'LIST_REMOVE':
-            list_var = self.variables.get(instr.arg1, [])
-            value = self.get_value(instr.arg2)
+            list_var = self.lookup(instr.arg1_slot, [])
+            value = self.load(instr.arg2_operand)
             if isinstance(list_var, list):
                 try:
                     list_var.remove(value)
@@ -198,99 +492,48 @@ class TACInterpreter:
         
         elif instr.op == 'INPUT':
             # Entrada dinámica interactiva
-            prompt = ""
+            prompt_val = UNDEFINED
             if instr.arg1:
                 try:
-                    prompt_val = self.get_value(instr.arg1)
-                    if prompt_val:
-                        prompt = str(prompt_val)
-                except Exception as e:
-                    # Si arg1 es un string literal directo, usarlo
-                    if isinstance(instr.arg1, str):
-                        # Quitar comillas si las tiene
-                        prompt = instr.arg1.strip('"').strip("'")
-            
-            # Mostrar prompt si existe y solicitar entrada del usuario
-            if prompt:
-                print(prompt, end='', flush=True)
-                self.output.append(prompt)
-            
-            # Leer entrada del usuario usando callback si está disponible, sino usar input()
-            if self.input_callback:
-                user_input = self.input_callback(prompt)
-            else:
-                try:
-                    user_input = input()
-                except EOFError:
-                    user_input = "5"  # Valor por defecto
+                    prompt_val = self.load(instr.arg1_operand)
+                except Exception:
+                    pass
+            user_input = self.read_input(instr.arg1, prompt_val)
             
             if instr.result:
-                self.variables[instr.result] = user_input
+                self.slots[instr.result_slot] = user_input
         
         elif instr.op == 'DICT_CREATE':
-            self.variables[instr.result] = {}
+            self.slots[instr.result_slot] = {}
         
         elif instr.op == 'DICT_GET':
-            dict_var = self.get_value(instr.arg1)
-            key = self.get_value(instr.arg2)
-            if isinstance(dict_var, dict):
-                if key in dict_var:
-                    self.variables[instr.result] = dict_var[key]
-                else:
-                    raise Exception(f"Error de ejecución: Clave no encontrada: {key}")
-            else:
-                raise Exception(f"Error de ejecución: {instr.arg1} no es un diccionario")
+            dict_var = self.load(instr.arg1_operand)
+            key = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = self.dict_get(dict_var, key, instr.arg1)
         
         elif instr.op == 'DICT_SET':
-            dict_var = self.variables.get(instr.arg1, None)
+            dict_var = self.lookup(instr.arg1_slot, None)
             if dict_var is None:
-                self.variables[instr.arg1] = {}
-                dict_var = self.variables[instr.arg1]
+                dict_var = self.slots[instr.arg1_slot] = {}
             if isinstance(dict_var, dict):
-                key = self.get_value(instr.arg2)
-                value = self.get_value(instr.result)
+                key = self.load(instr.arg2_operand)
+                value = self.load(instr.result_operand)
                 dict_var[key] = value
             else:
                 raise Exception(f"Error de ejecución: {instr.arg1} no es un diccionario")
         
         elif instr.op == 'LIST_GET':
-            list_var = self.get_value(instr.arg1)
-            index = self.get_value(instr.arg2)
-            if isinstance(list_var, str):
-                # Si es una cadena, permitir acceso por índice
-                if isinstance(index, (int, float)):
-                    index = int(index)
-                    if 0 <= index < len(list_var):
-                        self.variables[instr.result] = list_var[index]
-                    else:
-                        raise Exception(f"Error de ejecución: Índice fuera de rango: {index}")
-                else:
-                    raise Exception(f"Error de ejecución: Índice debe ser número: {index}")
-            elif isinstance(list_var, list):
-                if isinstance(index, (int, float)):
-                    index = int(index)
-                    if 0 <= index < len(list_var):
-                        self.variables[instr.result] = list_var[index]
-                    else:
-                        raise Exception(f"Error de ejecución: Índice fuera de rango: {index}")
-                else:
-                    raise Exception(f"Error de ejecución: Índice debe ser número: {index}")
-            elif isinstance(list_var, dict):
-                # Si es un diccionario, intentar acceso por clave
-                if index in list_var:
-                    self.variables[instr.result] = list_var[index]
-                else:
-                    raise Exception(f"Error de ejecución: Clave no encontrada: {index}")
-            else:
-                raise Exception(f"Error de ejecución: {instr.arg1} no es una lista, diccionario ni string")
+            list_var = self.load(instr.arg1_operand)
+            index = self.load(instr.arg2_operand)
+            self.slots[instr.result_slot] = self.index_value(list_var, index, instr.arg1)
         
         elif instr.op == 'LIST_SET':
-            list_var = self.variables.get(instr.arg1, None)
+            list_var = self.lookup(instr.arg1_slot, None)
             if isinstance(list_var, list):
-                index = self.get_value(instr.arg2)
+                index = self.load(instr.arg2_operand)
                 if isinstance(index, (int, float)):
                     index = int(index)
-                    value = self.get_value(instr.result)
+                    value = self.load(instr.result_operand)
                     if 0 <= index < len(list_var):
                         list_var[index] = value
                     else:
@@ -302,191 +545,427 @@ class TACInterpreter:
         
         elif instr.op == 'CALL':
             if instr.arg1 == 'len':
-                list_var = self.get_value(instr.arg2)
+                list_var = self.load(instr.arg2_operand)
                 if isinstance(list_var, (list, str)):
-                    self.variables[instr.result] = len(list_var)
+                    self.slots[instr.result_slot] = len(list_var)
                 else:
                     raise Exception(f"Error de ejecución: len() requiere una lista o string")
             elif instr.arg1 == 'int':
                 # Conversión de string a entero
-                arg_value = self.get_value(instr.arg2)
-                if isinstance(arg_value, str):
-                    try:
-                        self.variables[instr.result] = int(arg_value)
-                    except ValueError:
-                        raise Exception(f"Error de ejecución: No se puede convertir '{arg_value}' a entero")
-                elif isinstance(arg_value, (int, float)):
-                    self.variables[instr.result] = int(arg_value)
-                else:
-                    raise Exception(f"Error de ejecución: int() requiere un número o string")
+                arg_value = self.load(instr.arg2_operand)
+                self.slots[instr.result_slot] = self.to_int(arg_value)
             elif instr.arg1 == 'input':
                 # Entrada dinámica interactiva
-                prompt = ""
+                prompt_val = UNDEFINED
                 if instr.arg2:
                     try:
-                        prompt_val = self.get_value(instr.arg2)
-                        if prompt_val:
-                            prompt = str(prompt_val)
-                    except Exception as e:
-                        # Si arg2 es un string literal directo, usarlo
-                        if isinstance(instr.arg2, str):
-                            # Quitar comillas si las tiene
-                            prompt = instr.arg2.strip('"').strip("'")
-                
-                # Mostrar prompt si existe y solicitar entrada del usuario
-                if prompt:
-                    print(prompt, end='', flush=True)
-                    self.output.append(prompt)
-                
-                # Leer entrada del usuario usando callback si está disponible, sino usar input()
-                if self.input_callback:
-                    user_input = self.input_callback(prompt)
-                else:
-                    try:
-                        user_input = input()
-                    except EOFError:
-                        user_input = "5"  # Valor por defecto
+                        prompt_val = self.load(instr.arg2_operand)
+                    except Exception:
+                        pass
+                user_input = self.read_input(instr.arg2, prompt_val)
                 
                 if instr.result:
-                    self.variables[instr.result] = user_input
+                    self.slots[instr.result_slot] = user_input
             else:
                 # Llamada a función definida por el usuario
                 if instr.arg1 in self.functions:
-                    func_start, func_end = self.functions[instr.arg1]
-                    
-                    # Parsear argumentos de la llamada
-                    args_values = []
-                    if instr.arg2:
-                        args_str = str(instr.arg2)
-                        args_parts = [a.strip() for a in args_str.split(',')]
-                        for arg_part in args_parts:
-                            args_values.append(self.get_value(arg_part))
-                    
-                    # Guardar estado actual en la pila (ANTES de cambiar variables)
-                    saved_vars = self.variables.copy()
-                    self.call_stack.append({
-                        'pc': self.pc + 1,  # Continuar después de esta instrucción
-                        'variables': saved_vars,
-                        'result_var': instr.result,  # Variable donde guardar el resultado
-                        'func_name': instr.arg1  # Nombre de la función para identificar parámetros
-                    })
-                    
-                    # Obtener nombres de parámetros desde function_info
-                    func_info = self.function_info.get(instr.arg1, {})
-                    func_params = func_info.get('params', [])
-                    
-                    # IMPORTANTE: Crear nuevo contexto de variables para la función
-                    # COPIANDO las variables globales del contexto anterior
-                    # Esto permite que las funciones accedan a variables globales como 'estudiantes'
-                    function_vars = saved_vars.copy()  # Copiar variables globales
-                    
-                    # Asignar argumentos a parámetros en el nuevo contexto (sobrescribir si existen)
-                    if func_params:
-                        # Usar los nombres de parámetros reales de la función
-                        for i, param_name in enumerate(func_params):
-                            if i < len(args_values):
-                                function_vars[param_name] = args_values[i]
-                    elif args_values:
-                        # Fallback: usar nombres comunes de parámetros
-                        if instr.arg1 == 'factorial' and len(args_values) >= 1:
-                            function_vars['n'] = args_values[0]
-                        elif instr.arg1 == 'suma' and len(args_values) >= 2:
-                            function_vars['a'] = args_values[0]
-                            function_vars['b'] = args_values[1]
-                        else:
-                            common_param_names = ['n', 'x', 'y', 'z', 'a', 'b', 'c']
-                            for i, arg_val in enumerate(args_values):
-                                if i < len(common_param_names):
-                                    param_name = common_param_names[i]
-                                    function_vars[param_name] = arg_val
-                    
-                    # Reemplazar el contexto de variables con el nuevo contexto de la función
-                    self.variables = function_vars
-                    
-                    # Saltar al inicio de la función (LABEL)
-                    # El pc apuntará a func_start, el loop lo incrementará y ejecutará func_start + 1
-                    # IMPORTANTE: Los parámetros ya están asignados en self.variables antes de saltar
-                    self.pc = func_start
-                    return  # No incrementar PC aquí, el loop lo hará y ejecutará func_start + 1
+                    # Argumentos de la llamada (decodificados al enlazar)
+                    args_values = [self.load(operand) for operand in instr.call_operands]
+                    self.call_function(instr.arg1, args_values, instr.result_slot if instr.result else None)
                 else:
                     raise Exception(f"Error de ejecución: Función '{instr.arg1}' no definida")
         
         elif instr.op == 'RETURN':
             if instr.arg1 is not None:
-                return_val = self.get_value(instr.arg1)
+                return_val = self.load(instr.arg1_operand)
             else:
                 return_val = None
+            self.return_from_function(return_val, len(instructions) if instructions else self.pc)
+    
+    def compile_instruction(self, instr, code):
+        """
+        Convierte una instrucción enlazada en una función sin argumentos que la
+        ejecuta con los operandos ya resueltos. Las operaciones poco frecuentes
+        (diccionarios, input, int, etc.) delegan en execute_instruction
+        """
+        op = instr.op
+        if op in self.BINARY_OPERATIONS:
+            return self._compile_binary(instr)
+        if op == 'ASSIGN':
+            return self._compile_assign(instr)
+        if op in ('NEG', 'NOT', 'PRINT'):
+            return self._compile_unary(instr)
+        if op in ('GOTO', 'IF_FALSE'):
+            return self._compile_jump(instr)
+        if op in ('LIST_CREATE', 'DICT_CREATE'):
+            return self._compile_create(instr)
+        if op == 'LIST_GET':
+            return self._compile_list_get(instr)
+        if op == 'LIST_APPEND':
+            return self._compile_list_append(instr)
+        if op == 'CALL' and instr.arg1 not in ('len', 'int', 'input'):
+            return self._compile_call(instr)
+        if op == 'CALL' and instr.arg1 == 'len':
+            return self._compile_len(instr)
+        if op == 'RETURN':
+            return self._compile_return(instr, len(code))
+        execute = self.execute_instruction
+        return lambda: execute(instr, code)
+    
+    def _compile_loader(self, operand):
+        """Función que retorna el valor de un operando decodificado"""
+        is_constant, value = operand
+        if is_constant:
+            return lambda: value
+        slots = self.slots
+        message = f"Error de ejecución: Variable no definida: {self.slot_names[value]}"
+        
+        def load_variable():
+            result = slots[value]
+            if result is UNDEFINED:
+                raise Exception(message)
+            return result
+        return load_variable
+    
+    def _undefined(self, slot):
+        return Exception(f"Error de ejecución: Variable no definida: {self.slot_names[slot]}")
+    
+    def _compile_binary(self, instr):
+        operation, zero_message = self.BINARY_OPERATIONS[instr.op]
+        result = instr.result_slot
+        left_constant, left = instr.arg1_operand
+        right_constant, right = instr.arg2_operand
+        slots = self.slots
+        undefined = self._undefined
+        
+        # Casos frecuentes especializados: variable op variable y variable op constante
+        if not left_constant and not right_constant:
+            def step():
+                a = slots[left]
+                b = slots[right]
+                if a is UNDEFINED or b is UNDEFINED:
+                    raise undefined(left if a is UNDEFINED else right)
+                if zero_message and b == 0:
+                    raise Exception(zero_message)
+                slots[result] = operation(a, b)
+        elif not left_constant:
+            b = right
+            if zero_message and b == 0:
+                def step():
+                    if slots[left] is UNDEFINED:
+                        raise undefined(left)
+                    raise Exception(zero_message)
+            else:
+                def step():
+                    a = slots[left]
+                    if a is UNDEFINED:
+                        raise undefined(left)
+                    slots[result] = operation(a, b)
+        else:
+            load_left = self._compile_loader(instr.arg1_operand)
+            load_right = self._compile_loader(instr.arg2_operand)
             
-            # Si hay una llamada en la pila, restaurar estado
-            if self.call_stack:
-                saved_state = self.call_stack.pop()
-                # Guardar el valor de retorno antes de restaurar variables
-                result_var = saved_state.get('result_var')
-                
-                # IMPORTANTE: Guardar variables de la función antes de restaurar
-                function_vars = self.variables.copy()
-                
-                # Restaurar variables del contexto anterior
-                self.variables = saved_state['variables'].copy()
-                
-                # IMPORTANTE: Actualizar variables globales modificadas en la función
-                # Si una variable global fue modificada en la función, actualizarla en el contexto global
-                func_name = saved_state.get('func_name', '')
-                func_info = self.function_info.get(func_name, {})
-                func_params = func_info.get('params', [])
-                
-                for var_name, var_value in function_vars.items():
-                    # Si la variable existe en el contexto global y no es un parámetro local
-                    if var_name in saved_state['variables']:
-                        # Verificar si es un parámetro de la función
-                        if var_name not in func_params:
-                            # Es una variable global, actualizarla
-                            self.variables[var_name] = var_value
-                    elif var_name not in func_params and not var_name.startswith('t'):
-                        # Nueva variable global creada en la función (no temporal)
-                        self.variables[var_name] = var_value
-                
-                # Agregar variables temporales creadas en la función
-                temp_vars = {}
-                for var_name, var_value in function_vars.items():
-                    if var_name.startswith('t'):
-                        temp_vars[var_name] = var_value
-                self.variables.update(temp_vars)
+            def step():
+                a = load_left()
+                b = load_right()
+                if zero_message and b == 0:
+                    raise Exception(zero_message)
+                slots[result] = operation(a, b)
+        return step
+    
+    def _compile_assign(self, instr):
+        result = instr.result_slot
+        is_constant, value = instr.arg1_operand
+        slots = self.slots
+        if is_constant:
+            def step():
+                slots[result] = value
+        else:
+            undefined = self._undefined
+            
+            def step():
+                source = slots[value]
+                if source is UNDEFINED:
+                    raise undefined(value)
+                slots[result] = source
+        return step
+    
+    def _compile_unary(self, instr):
+        load = self._compile_loader(instr.arg1_operand)
+        result = instr.result_slot
+        slots = self.slots
+        if instr.op == 'PRINT':
+            interpreter = self
+            
+            def step():
+                interpreter.output.append(str(load()))
+        elif instr.op == 'NEG':
+            def step():
+                slots[result] = -load()
+        else:
+            def step():
+                slots[result] = not load()
+        return step
+    
+    def _compile_jump(self, instr):
+        target = instr.target
+        interpreter = self
+        if instr.op == 'GOTO':
+            if target is None:
+                message = f"Error de ejecución: Etiqueta no encontrada: {instr.arg1}"
                 
-                # Asignar el valor de retorno a la variable resultado
-                if result_var:
-                    self.variables[result_var] = return_val
-                # Continuar desde donde se quedó
-                self.pc = saved_state['pc'] - 1  # -1 porque el loop incrementará
-                return  # No ejecutar más instrucciones en esta iteración
+                def step():
+                    raise Exception(message)
             else:
-                # Return sin función llamante - terminar ejecución
-                # Saltar al final
-                self.pc = len(instructions) if instructions else self.pc
-                return
+                def step():
+                    interpreter.pc = target
+            return step
+        
+        load = self._compile_loader(instr.arg1_operand)
+        message = f"Error de ejecución: Etiqueta no encontrada: {instr.arg2}"
+        
+        def step():
+            if not load():
+                if target is None:
+                    raise Exception(message)
+                interpreter.pc = target
+        return step
     
-    def get_value(self, operand):
-        """Obtiene el valor de un operando (constante o variable)"""
-        if operand is None:
-            return None
+    def _compile_create(self, instr):
+        result = instr.result_slot
+        factory = list if instr.op == 'LIST_CREATE' else dict
+        slots = self.slots
+        
+        def step():
+            slots[result] = factory()
+        return step
+    
+    def _compile_list_get(self, instr):
+        load_list = self._compile_loader(instr.arg1_operand)
+        load_index = self._compile_loader(instr.arg2_operand)
+        result = instr.result_slot
+        name = instr.arg1
+        slots = self.slots
+        index_value = self.index_value
+        
+        def step():
+            list_var = load_list()
+            index = load_index()
+            slots[result] = index_value(list_var, index, name)
+        return step
+    
+    def _compile_list_append(self, instr):
+        name = instr.arg1
+        slot = instr.arg1_slot
+        load = self._compile_loader(instr.arg2_operand)
+        slots = self.slots
+        
+        def step():
+            list_var = slots[slot]
+            value = load()
+            if isinstance(list_var, list):
+                list_var.append(value)
+            elif list_var is not UNDEFINED:
+                raise Exception(f"Error de ejecución: {name} no es una lista")
+        return step
+    
+    def _compile_len(self, instr):
+        load = self._compile_loader(instr.arg2_operand)
+        result = instr.result_slot
+        slots = self.slots
+        
+        def step():
+            list_var = load()
+            if isinstance(list_var, (list, str)):
+                slots[result] = len(list_var)
+            else:
+                raise Exception(f"Error de ejecución: len() requiere una lista o string")
+        return step
+    
+    def _compile_call(self, instr):
+        func_name = instr.arg1
+        result = instr.result_slot if instr.result else None
+        if func_name not in self.functions:
+            message = f"Error de ejecución: Función '{func_name}' no definida"
+            
+            def step():
+                raise Exception(message)
+            return step
         
-        if isinstance(operand, str) and operand.startswith('"') and operand.endswith('"'):
-            return operand[1:-1]
+        loaders = [self._compile_loader(operand) for operand in instr.call_operands]
+        call_function = self.call_function
         
+        def step():
+            call_function(func_name, [load() for load in loaders], result)
+        return step
+    
+    def _compile_return(self, instr, code_length):
+        load = self._compile_loader(instr.arg1_operand) if instr.arg1 is not None else lambda: None
+        return_from_function = self.return_from_function
+        
+        def step():
+            return_from_function(load(), code_length)
+        return step
+    
+    def read_input(self, raw, prompt_val):
+        """
+        Muestra el prompt y lee una entrada del usuario. raw es el operando tal
+        como aparece en el TAC y prompt_val su valor (UNDEFINED si no se pudo leer)
+        """
+        prompt = ""
+        if raw:
+            if prompt_val is UNDEFINED:
+                # Si el operando es un string literal directo, usarlo
+                if isinstance(raw, str):
+                    # Quitar comillas si las tiene
+                    prompt = raw.strip('"').strip("'")
+            elif prompt_val:
+                prompt = str(prompt_val)
+        
+        # Mostrar prompt si existe y solicitar entrada del usuario
+        if prompt:
+            print(prompt, end='', flush=True)
+            self.output.append(prompt)
+        
+        # Leer entrada del usuario usando callback si está disponible, sino usar input()
+        if self.input_callback:
+            return self.input_callback(prompt)
         try:
-            if '.' in str(operand):
-                return float(operand)
+            return input()
+        except EOFError:
+            return "5"  # Valor por defecto
+    
+    def dict_get(self, dict_var, key, name):
+        """Valor de dict_var[key], con los errores del lenguaje"""
+        if isinstance(dict_var, dict):
+            if key in dict_var:
+                return dict_var[key]
             else:
-                return int(operand)
-        except:
-            pass
-        
-        if operand == 'True':
-            return True
-        if operand == 'False':
-            return False
-        
-        if operand in self.variables:
-            return self.variables[operand]
+                raise Exception(f"Error de ejecución: Clave no encontrada: {key}")
+        else:
+            raise Exception(f"Error de ejecución: {name} no es un diccionario")
+    
+    def to_int(self, arg_value):
+        """Conversión de int() a entero desde string o número"""
+        if isinstance(arg_value, str):
+            try:
+                return int(arg_value)
+            except ValueError:
+                raise Exception(f"Error de ejecución: No se puede convertir '{arg_value}' a entero")
+        elif isinstance(arg_value, (int, float)):
+            return int(arg_value)
+        else:
+            raise Exception(f"Error de ejecución: int() requiere un número o string")
+    
+    def index_value(self, list_var, index, name):
+        """Elemento list_var[index] de una lista, string o diccionario, con los errores del lenguaje"""
+        if isinstance(list_var, str):
+            # Si es una cadena, permitir acceso por índice
+            if isinstance(index, (int, float)):
+                index = int(index)
+                if 0 <= index < len(list_var):
+                    return list_var[index]
+                else:
+                    raise Exception(f"Error de ejecución: Índice fuera de rango: {index}")
+            else:
+                raise Exception(f"Error de ejecución: Índice debe ser número: {index}")
+        elif isinstance(list_var, list):
+            if isinstance(index, (int, float)):
+                index = int(index)
+                if 0 <= index < len(list_var):
+                    return list_var[index]
+                else:
+                    raise Exception(f"Error de ejecución: Índice fuera de rango: {index}")
+            else:
+                raise Exception(f"Error de ejecución: Índice debe ser número: {index}")
+        elif isinstance(list_var, dict):
+            # Si es un diccionario, intentar acceso por clave
+            if index in list_var:
+                return list_var[index]
+            else:
+                raise Exception(f"Error de ejecución: Clave no encontrada: {index}")
+        else:
+            raise Exception(f"Error de ejecución: {name} no es una lista, diccionario ni string")
+    
+    def call_function(self, func_name, args_values, result_slot):
+        """
+        Entra a una función del usuario. La función ve y modifica las variables
+        del llamador; solo sus parámetros las ocultan, así que la pila guarda
+        únicamente los valores que los parámetros tapan (sin copiar variables)
+        """
+        func_start, func_end = self.functions[func_name]
+        func_info = self.function_info[func_name]
+        slots = self.slots
+        
+        self.call_stack.append({
+            'pc': self.pc,  # Continuar después de esta instrucción
+            'saved': [(slot, slots[slot]) for slot in func_info['restore_slots']],
+            'result_slot': result_slot,  # Slot donde guardar el resultado
+            'func_name': func_name,
+        })
+        
+        # Asignar argumentos a parámetros (sobrescribir si existen)
+        param_slots = func_info['param_slots']
+        if param_slots:
+            # Usar los nombres de parámetros reales de la función
+            for slot, value in zip(param_slots, args_values):
+                slots[slot] = value
+        elif args_values:
+            # Fallback: usar nombres comunes de parámetros
+            if func_name == 'factorial' and len(args_values) >= 1:
+                slots[self.slot_index['n']] = args_values[0]
+            elif func_name == 'suma' and len(args_values) >= 2:
+                slots[self.slot_index['a']] = args_values[0]
+                slots[self.slot_index['b']] = args_values[1]
+            else:
+                for name, value in zip(FALLBACK_PARAMS, args_values):
+                    slots[self.slot_index[name]] = value
         
-        raise Exception(f"Error de ejecución: Variable no definida: {operand}")
+        # Saltar a la primera instrucción de la función
+        self.pc = func_start
+    
+    def return_from_function(self, return_val, end_pc):
+        """Vuelve de una función restaurando los parámetros del llamador; sin llamador termina en end_pc"""
+        if self.call_stack:
+            frame = self.call_stack.pop()
+            slots = self.slots
+            for slot, value in frame['saved']:
+                slots[slot] = value
+            # Asignar el valor de retorno a la variable resultado
+            if frame['result_slot'] is not None:
+                slots[frame['result_slot']] = return_val
+            # Continuar desde donde se quedó
+            self.pc = frame['pc']
+        else:
+            # Return sin función llamante - terminar ejecución
+            self.pc = end_pc
+    
+    def load(self, operand):
+        """Valor de un operando decodificado: la constante o el contenido del slot"""
+        is_constant, value = operand
+        if is_constant:
+            return value
+        result = self.slots[value]
+        if result is UNDEFINED:
+            raise Exception(f"Error de ejecución: Variable no definida: {self.slot_names[value]}")
+        return result
+    
+    def lookup(self, slot, default):
+        """Contenido de un slot, o default si la variable no fue asignada"""
+        value = self.slots[slot]
+        return default if value is UNDEFINED else value
+    
+    def get_value(self, operand):
+        """Obtiene el valor de un operando (constante o variable)"""
+        is_constant, value = decode_operand(operand)
+        if is_constant:
+            return value
+        slot = self.slot_index.get(value)
+        if slot is None or self.slots[slot] is UNDEFINED:
+            raise Exception(f"Error de ejecución: Variable no definida: {value}")
+        return self.slots[slot]
+    
+    @property
+    def variables(self):
+        """Variables asignadas como diccionario {nombre: valor} (copia, para inspección)"""
+        return {name: value for name, value in zip(self.slot_names, self.slots) if value is not UNDEFINED}
@@ -3,7 +3,30 @@ Optimizador de Código TAC
 Aplica optimizaciones al código de tres direcciones
 """
 
+import itertools
+
 from tac_generator import TACInstruction
+from tac_cfg import ControlFlowGraph
+from tac_dataflow import (
+    BINARY_OPS, MUTATION_OPS, AvailableExpressions, CallEffects, Liveness,
+    expression_of, instruction_definition, is_temporary, is_variable,
+)
+from tac_interpreter import decode_operand
+from tac_ssa import (
+    DEFINED, INT, INTEGER, NOT_YET, NUMBER, VARYING, SSAForm, SparseConditionalConstants, ValueKinds,
+)
+
+
+# Operaciones cuyo arg1 / arg2 es un valor; en las demás es un nombre (etiqueta, función o lista)
+VALUE_ARG1_OPS = BINARY_OPS + ('ASSIGN', 'NEG', 'NOT', 'PRINT', 'IF_FALSE', 'RETURN', 'INPUT')
+VALUE_ARG2_OPS = BINARY_OPS + ('LIST_APPEND', 'LIST_REMOVE', 'LIST_GET', 'LIST_SET', 'DICT_GET', 'DICT_SET', 'CALL')
+
+# Operaciones sin efectos: se eliminan si nadie lee su resultado (DIV y MOD solo
+# con divisor constante distinto de cero, porque si no pueden fallar)
+PURE_OPS = ('ASSIGN', 'ADD', 'SUB', 'MUL', 'EQ', 'NEQ', 'LT', 'GT', 'LTE', 'GTE', 'NEG', 'NOT')
+
+# Operaciones cuyo resultado no cambia al intercambiar los operandos (ADD no: concatena strings y listas)
+COMMUTATIVE_OPS = ('MUL', 'EQ', 'NEQ')
 
 
 class TACOptimizer:
@@ -13,199 +36,268 @@ class TACOptimizer:
         self.optimizations_applied = []
     
     def optimize(self, instructions):
-        """Aplica todas las optimizaciones al código TAC"""
+        """
+        Aplica todas las optimizaciones al código TAC. SCCP llega a su punto
+        fijo por sí sola, así que cada pasada se aplica una vez
+        """
         self.optimizations_applied = []
         optimized = list(instructions)
         
-        changed = True
-        iteration = 0
-        while changed and iteration < 10:
-            changed = False
-            old_len = len(optimized)
-            
-            optimized = self.constant_folding(optimized)
-            optimized = self.constant_propagation(optimized)
-            optimized = self.dead_code_elimination(optimized)
-            optimized = self.strength_reduction(optimized)
-            optimized = self.remove_redundant_assignments(optimized)
-            optimized = self.eliminate_dead_jumps(optimized)
-            
-            if len(optimized) != old_len or iteration == 0:
-                changed = True
-            
-            iteration += 1
+        optimized = self.sparse_conditional_constant_propagation(optimized)
+        optimized = self.loop_optimizations(optimized)
+        optimized = self.common_subexpression_elimination(optimized)
+        optimized = self.local_value_numbering(optimized)
+        optimized = self.remove_redundant_assignments(optimized)
+        optimized = self.dead_code_elimination(optimized)
+        optimized = self.eliminate_dead_jumps(optimized)
         
         return optimized
     
-    def constant_folding(self, instructions):
-        """Plegado de constantes"""
-        optimized = []
+    def sparse_conditional_constant_propagation(self, instructions):
+        """
+        Propagación de constantes condicional dispersa sobre la forma SSA
         
-        for instr in instructions:
-            if instr.op in ['ADD', 'SUB', 'MUL', 'DIV', 'MOD']:
-                try:
-                    left = self._parse_number(instr.arg1)
-                    right = self._parse_number(instr.arg2)
-                    
-                    if left is not None and right is not None:
-                        result = None
-                        if instr.op == 'ADD':
-                            result = left + right
-                        elif instr.op == 'SUB':
-                            result = left - right
-                        elif instr.op == 'MUL':
-                            result = left * right
-                        elif instr.op == 'DIV' and right != 0:
-                            result = left / right
-                        elif instr.op == 'MOD' and right != 0:
-                            result = left % right
-                        
-                        if result is not None:
-                            optimized.append(TACInstruction('ASSIGN', str(result), None, instr.result))
-                            self.optimizations_applied.append(
-                                f"Plegado de constantes: {left} {instr.op} {right} = {result}"
-                            )
-                            continue
-                except:
-                    pass
-            
-            optimized.append(instr)
+        Reemplaza las variables que valen siempre el mismo número, pliega las
+        operaciones que dan un número, resuelve los IF_FALSE con condición
+        constante y quita los bloques que solo se alcanzaban por la rama
+        descartada. Con los tipos de ValueKinds reduce además x * 0, x * 1 y x + 0
+        """
+        cfg = ControlFlowGraph.from_instructions(instructions)
+        ssa = SSAForm(cfg)
+        constants = SparseConditionalConstants(ssa)
+        # Los tipos se calculan antes de reescribir y solo si hay algo que reducir
+        kinds = ValueKinds(ssa) if self._has_identity_operand(cfg, constants) else None
+        for block in cfg.blocks:
+            # Lo que ni siquiera el CFG alcanza (código de nivel superior después del
+            # return de una función) sí se ejecuta en el ensamblador: se deja como está
+            if block.index not in cfg.idom:
+                continue
+            if not constants.is_executable(block.index):
+                for instr in block.instructions:
+                    self.optimizations_applied.append(
+                        f"Código inalcanzable eliminado: {str(instr)}"
+                    )
+                block.instructions = []
+                continue
+            optimized = []
+            for instr in block.instructions:
+                known = {}
+                for name in ssa.uses[id(instr)]:
+                    text = self._constant_text(constants.operand_value(instr, name))
+                    if text is not None:
+                        known[name] = text
+                new_instr = self._replace_with_constants(instr, known)
+                
+                if instr.op == 'IF_FALSE':
+                    condition = constants.operand_value(instr, instr.arg1)
+                    if condition is not NOT_YET and condition is not VARYING:
+                        self.optimizations_applied.append(
+                            f"Salto condicional resuelto: {str(new_instr)} "
+                            f"({'siempre salta' if not condition else 'nunca salta'})"
+                        )
+                        if not condition:
+                            optimized.append(TACInstruction('GOTO', instr.arg2, None, None, instr.line))
+                        continue
+                elif instr.op != 'ASSIGN' and self._is_removable(new_instr):
+                    text = self._constant_text(constants.result_value(instr))
+                    if text is not None:
+                        self.optimizations_applied.append(
+                            f"Plegado de constantes: {str(new_instr)} = {text}"
+                        )
+                        new_instr = TACInstruction('ASSIGN', text, None, instr.result, instr.line)
+                if kinds is not None and new_instr.op in ('MUL', 'ADD'):
+                    new_instr = self._reduce_strength(instr, new_instr, kinds)
+                optimized.append(new_instr)
+            block.instructions = optimized
         
-        return optimized
+        return ssa.lower()
     
-    def constant_propagation(self, instructions):
-        """Propagación de constantes"""
-        constants = {}
-        optimized = []
+    def _has_identity_operand(self, cfg, constants):
+        """True si algún MUL o ADD alcanzable tiene un operando que vale 0 o 1"""
+        for block in cfg.blocks:
+            if block.index not in cfg.idom:
+                continue
+            for instr in block.instructions:
+                if instr.op in ('MUL', 'ADD') and any(
+                    type(value) is int and value in (0, 1)
+                    for value in (constants.operand_value(instr, instr.arg1),
+                                  constants.operand_value(instr, instr.arg2))
+                ):
+                    return True
+        return False
+    
+    def _reduce_strength(self, instr, new_instr, kinds):
+        """
+        Reducción de fuerza sobre new_instr, que es instr con las constantes ya
+        sustituidas. Depende del tipo del otro operando: 2.5 * 0 da 0.0,
+        True * 1 da 1 y 'a' * 0 da '', así que x * 0 = 0 pide un entero y
+        x * 1 = x y x + 0 = x piden un int
+        """
+        identity = '1' if instr.op == 'MUL' else '0'
+        symbol = '*' if instr.op == 'MUL' else '+'
+        for constant, other, original in ((new_instr.arg2, new_instr.arg1, instr.arg1),
+                                          (new_instr.arg1, new_instr.arg2, instr.arg2)):
+            kind = kinds.operand(instr, original)
+            if instr.op == 'MUL' and constant == '0' and kind <= INTEGER:
+                self.optimizations_applied.append(
+                    f"Reducción de fuerza: multiplicación por 0 = 0"
+                )
+                return TACInstruction('ASSIGN', '0', None, instr.result, instr.line)
+            if constant == identity and kind == INT:
+                self.optimizations_applied.append(
+                    f"Reducción de fuerza: {other} {symbol} {identity} = {other}"
+                )
+                return TACInstruction('ASSIGN', other, None, instr.result, instr.line)
+        return new_instr
+    
+    def loop_optimizations(self, instructions):
+        """
+        Optimización de ciclos naturales
         
-        for instr in instructions:
-            if instr.op == 'ASSIGN':
-                const_val = self._parse_number(instr.arg1)
-                if const_val is not None:
-                    constants[instr.result] = instr.arg1
-            
-            new_instr = self._replace_with_constants(instr, constants)
-            optimized.append(new_instr)
-            
-            if instr.op in ['ASSIGN', 'ADD', 'SUB', 'MUL', 'DIV', 'MOD', 'NEG']:
-                if instr.result in constants:
-                    del constants[instr.result]
+        Saca al preencabezado los cálculos invariantes (cada uno al del ciclo
+        más externo en que lo es) y cambia i * k, con i una variable de
+        inducción entera que avanza de a c, por un temporal que empieza en
+        i * k y suma c * k cada vez que i avanza
+        """
+        cfg = ControlFlowGraph.from_instructions(instructions)
+        loops = [(loop, cfg.preheader(loop)) for loop in cfg.natural_loops()]
+        loops = [(loop, preheader) for loop, preheader in loops
+                 if preheader is not None and self._has_loop_candidates(cfg, loop)]
+        if not loops:
+            return instructions
+        ssa = SSAForm(cfg)
+        kinds = ValueKinds(ssa)
+        definitions = {loop.header: self._loop_definitions(ssa, loop) for loop, _ in loops}
+        temporaries = self._new_temporaries(instructions)
+        moved = set()  # id de las instrucciones que salen de su ciclo
+        replaced = {}  # id(instrucción) -> instrucción que la reemplaza
+        inserted = {}  # id(instrucción) -> instrucciones que van después de ella
+        entering = {}  # Preencabezado -> instrucciones que van al final
+        # De afuera hacia adentro, para que un cálculo salga de todos los ciclos en que es invariante
+        for loop, preheader in reversed(loops):
+            for instr in self._loop_invariants(ssa, kinds, loop, definitions[loop.header], moved):
+                self.optimizations_applied.append(
+                    f"Código invariante sacado del ciclo: {str(instr)}"
+                )
+                moved.add(id(instr))
+                entering.setdefault(preheader, []).append(instr)
+        for loop, preheader in loops:
+            reduced = {}  # (i, k) -> temporal con i * k
+            for variable, factor, increment, step, instr in self._induction_products(
+                    ssa, kinds, loop, definitions[loop.header], moved, replaced):
+                temporary = reduced.get((variable, factor))
+                if temporary is None:
+                    temporary = reduced[(variable, factor)] = next(temporaries)
+                    entering.setdefault(preheader, []).append(
+                        TACInstruction('MUL', variable, factor, temporary, instr.line))
+                    inserted.setdefault(id(increment), []).append(
+                        TACInstruction('ADD', temporary, str(step * int(factor)), temporary, increment.line))
+                self.optimizations_applied.append(
+                    f"Reducción de fuerza: {str(instr)} -> {instr.result} = {temporary} "
+                    f"({temporary} suma {step * int(factor)} por vuelta)"
+                )
+                replaced[id(instr)] = TACInstruction('ASSIGN', temporary, None, instr.result, instr.line)
         
-        return optimized
+        for block in cfg.blocks:
+            optimized = []
+            for instr in block.instructions:
+                if id(instr) in moved:
+                    continue
+                optimized.append(replaced.get(id(instr), instr))
+                optimized.extend(inserted.get(id(instr), ()))
+            optimized.extend(entering.get(block.index, ()))
+            block.instructions = optimized
+        
+        return cfg.to_instructions()
     
-    def dead_code_elimination(self, instructions):
-        """Eliminación de código muerto"""
-        changed = True
-        used_vars = set()
+    def common_subexpression_elimination(self, instructions):
+        """
+        Eliminación global de subexpresiones comunes con expresiones disponibles
         
-        while changed:
-            changed = False
-            
-            for instr in instructions:
-                if instr.result and instr.result in used_vars:
-                    if instr.arg1 and instr.arg1 not in used_vars:
-                        used_vars.add(instr.arg1)
-                        changed = True
-                    if instr.arg2 and instr.arg2 not in used_vars:
-                        used_vars.add(instr.arg2)
-                        changed = True
-                
-                # IMPORTANTE: Las variables usadas en RETURN son necesarias
-                if instr.op == 'RETURN':
-                    if instr.arg1 and instr.arg1 not in used_vars:
-                        used_vars.add(instr.arg1)
-                        changed = True
-                
-                if instr.op in ['PRINT', 'IF_FALSE']:
-                    if instr.arg1 and instr.arg1 not in used_vars:
-                        used_vars.add(instr.arg1)
-                        changed = True
-                
-                if instr.op == 'ASSIGN' and instr.result in used_vars:
-                    if instr.arg1 and instr.arg1 not in used_vars:
-                        used_vars.add(instr.arg1)
-                        changed = True
-                
-                if instr.op in ['ADD', 'SUB', 'MUL', 'DIV', 'MOD', 'EQ', 'NEQ', 'LT', 'GT', 'LTE', 'GTE']:
-                    if instr.result in used_vars:
-                        if instr.arg1 and instr.arg1 not in used_vars:
-                            used_vars.add(instr.arg1)
-                            changed = True
-                        if instr.arg2 and instr.arg2 not in used_vars:
-                            used_vars.add(instr.arg2)
-                            changed = True
-                
-                if instr.op in ['LIST_APPEND', 'LIST_GET', 'LIST_SET']:
-                    if instr.arg1:
-                        used_vars.add(instr.arg1)
-                    if instr.arg2:
-                        used_vars.add(instr.arg2)
-                
-                if instr.result and not instr.result.startswith('t') and not instr.result.startswith('_'):
-                    used_vars.add(instr.result)
+        Si a op b ya se calculó en todo camino que llega a una instrucción y sus
+        operandos no cambiaron, los cálculos que llegan guardan el valor en un
+        temporal nuevo (uno por expresión) y la instrucción repetida lo copia
+        """
+        cfg = ControlFlowGraph.from_instructions(instructions)
+        available = AvailableExpressions(cfg)
+        temporaries = None
+        holders = {}  # Expresión -> temporal que guarda su valor
+        reused = {}  # id(instrucción repetida) -> temporal
+        computed = {}  # id(cálculo que llega a una repetida) -> temporal
+        for block in cfg.blocks:
+            # Lo que el CFG no alcanza sí se ejecuta en el ensamblador: no se toca
+            if block.index not in cfg.idom:
+                continue
+            for position, instr, mask in available.walk(block.index):
+                key = expression_of(instr)
+                if not key or not available.is_available(key, mask):
+                    continue
+                sites = self._reaching_evaluations(cfg, available, key, block.index, position)
+                if not sites:
+                    continue
+                if key not in holders:
+                    if temporaries is None:
+                        temporaries = self._new_temporaries(instructions)
+                    holders[key] = next(temporaries)
+                reused[id(instr)] = holders[key]
+                for site in sites:
+                    computed[id(site)] = holders[key]
+        if not reused:
+            return instructions
         
         optimized = []
         for instr in instructions:
-            keep = True
-            
-            # IMPORTANTE: RETURN debe mantenerse siempre
-            if instr.op in ['PRINT', 'LABEL', 'GOTO', 'IF_FALSE', 'LIST_CREATE', 
-                           'LIST_APPEND', 'LIST_GET', 'LIST_SET', 'CALL', 'RETURN', 'INPUT']:
-                keep = True
-            elif instr.result:
-                keep = instr.result in used_vars
-            
-            if keep:
-                optimized.append(instr)
-            else:
+            temporary = reused.get(id(instr))
+            if temporary:
                 self.optimizations_applied.append(
-                    f"Código muerto eliminado: {str(instr)}"
+                    f"Subexpresión común eliminada: {str(instr)} -> {instr.result} = {temporary}"
                 )
+                optimized.append(TACInstruction('ASSIGN', temporary, None, instr.result, instr.line))
+            elif id(instr) in computed:
+                temporary = computed[id(instr)]
+                optimized.append(TACInstruction(instr.op, instr.arg1, instr.arg2, temporary, instr.line))
+                optimized.append(TACInstruction('ASSIGN', temporary, None, instr.result, instr.line))
+            else:
+                optimized.append(instr)
         
         return optimized
     
-    def strength_reduction(self, instructions):
-        """Reducción de fuerza"""
-        optimized = []
+    def local_value_numbering(self, instructions):
+        """
+        Numeración de valores local
         
-        for instr in instructions:
-            if instr.op == 'MUL':
-                if instr.arg1 == '0' or instr.arg2 == '0':
-                    optimized.append(TACInstruction('ASSIGN', '0', None, instr.result))
-                    self.optimizations_applied.append(
-                        f"Reducción de fuerza: multiplicación por 0 = 0"
-                    )
-                    continue
-                elif instr.arg2 == '1':
-                    optimized.append(TACInstruction('ASSIGN', instr.arg1, None, instr.result))
-                    self.optimizations_applied.append(
-                        f"Reducción de fuerza: {instr.arg1} * 1 = {instr.arg1}"
-                    )
-                    continue
-                elif instr.arg1 == '1':
-                    optimized.append(TACInstruction('ASSIGN', instr.arg2, None, instr.result))
-                    self.optimizations_applied.append(
-                        f"Reducción de fuerza: 1 * {instr.arg2} = {instr.arg2}"
-                    )
-                    continue
-            
-            if instr.op == 'ADD':
-                if instr.arg2 == '0':
-                    optimized.append(TACInstruction('ASSIGN', instr.arg1, None, instr.result))
-                    self.optimizations_applied.append(
-                        f"Reducción de fuerza: {instr.arg1} + 0 = {instr.arg1}"
-                    )
-                    continue
-                elif instr.arg1 == '0':
-                    optimized.append(TACInstruction('ASSIGN', instr.arg2, None, instr.result))
+        Dentro de cada bloque básico da el mismo número a los valores que son
+        iguales con seguridad (copias, operandos intercambiados en * == !=), así
+        un cálculo repetido pasa a ser una copia y cada uso de un temporal lee
+        la variable que tuvo primero ese valor, con lo que las copias
+        intermedias quedan muertas
+        """
+        cfg = ControlFlowGraph.from_instructions(instructions)
+        effects = CallEffects(cfg)
+        for block in cfg.blocks:
+            block.instructions = self._number_values(block.instructions, effects)
+        
+        return cfg.to_instructions()
+    
+    def dead_code_elimination(self, instructions):
+        """Eliminación de código muerto: asignaciones sin efectos a variables que no están vivas"""
+        cfg = ControlFlowGraph.from_instructions(instructions)
+        liveness = Liveness(cfg, removable=self._is_removable)
+        for block in cfg.blocks:
+            live = liveness.block_out[block.index]
+            kept = []
+            for instr in reversed(block.instructions):
+                if liveness.is_dead(instr, live):
                     self.optimizations_applied.append(
-                        f"Reducción de fuerza: 0 + {instr.arg2} = {instr.arg2}"
+                        f"Código muerto eliminado: {str(instr)}"
                     )
                     continue
-            
-            optimized.append(instr)
+                live = liveness.step(instr, live)
+                kept.append(instr)
+            kept.reverse()
+            block.instructions = kept
         
-        return optimized
+        return cfg.to_instructions()
     
     def remove_redundant_assignments(self, instructions):
         """Elimina asignaciones redundantes"""
@@ -250,13 +342,283 @@ class TACOptimizer:
         except:
             return None
     
+    def _is_removable(self, instr):
+        # 'lista[INDEX] = valor' llega como ASSIGN y el generador de ensamblador lo guarda en memoria
+        if not instruction_definition(instr) or '[' in instr.result:
+            return False
+        if instr.op in ('DIV', 'MOD'):
+            return bool(self._parse_number(instr.arg2))
+        return instr.op in PURE_OPS
+    
+    def _has_loop_candidates(self, cfg, loop):
+        """
+        Filtro barato antes de armar la SSA: True si en el ciclo hay una
+        multiplicación por una variable que cambia en él o un cálculo cuyos
+        operandos no se asignan en él (toda cadena invariante empieza por uno)
+        """
+        instructions = [instr for index in loop.blocks for instr in cfg.blocks[index].instructions]
+        assigned = {instruction_definition(instr) for instr in instructions}
+        for instr in instructions:
+            if instr.op == 'MUL' and (instr.arg1 in assigned or instr.arg2 in assigned):
+                return True
+            if (instr.op in BINARY_OPS or instr.op in ('NEG', 'NOT')) and is_temporary(instr.result) \
+                    and instr.arg1 not in assigned and (instr.arg2 is None or instr.arg2 not in assigned):
+                return True
+        return False
+    
+    def _loop_definitions(self, ssa, loop):
+        """Variable -> cuántas veces se define dentro del ciclo, contando φ y lo que cambian las llamadas"""
+        counts = {}
+        for index in loop.blocks:
+            for phi in ssa.phis[index]:
+                counts[phi.variable] = counts.get(phi.variable, 0) + 1
+            for instr in ssa.cfg.blocks[index].instructions:
+                for name in ssa.defs[id(instr)]:
+                    counts[name] = counts.get(name, 0) + 1
+        return counts
+    
+    def _loop_invariants(self, ssa, kinds, loop, definitions, moved):
+        """
+        Cálculos del ciclo que se pueden hacer una vez antes de entrar, en un
+        orden en que cada uno va después de los que usa. El resultado debe ser
+        un temporal que solo se asigna ahí y que no está vivo al salir del ciclo
+        """
+        liveness = ssa.liveness
+        live_out = 0
+        for index in loop.blocks:
+            for succ in liveness.successors(index):
+                if succ not in loop.blocks:
+                    live_out |= liveness.block_in[succ]
+        invariant = []
+        marked = set()
+        changed = True
+        while changed:
+            changed = False
+            for index in sorted(loop.blocks):
+                for instr in ssa.cfg.blocks[index].instructions:
+                    if id(instr) in marked or id(instr) in moved:
+                        continue
+                    if instr.op not in BINARY_OPS and instr.op not in ('NEG', 'NOT'):
+                        continue
+                    if not is_temporary(instr.result) or definitions.get(instr.result) != 1:
+                        continue
+                    if liveness.is_live(instr.result, live_out):
+                        continue
+                    if any(site_index in loop.blocks and id(site) not in marked and id(site) not in moved
+                           for site_index, site in (ssa.sites.get(key, (None, None))
+                                                    for key in ssa.uses[id(instr)].items())):
+                        continue
+                    # Fuera del encabezado puede no ejecutarse nunca: antes del ciclo no debe poder fallar
+                    if index != loop.header and not self._cannot_fail(instr, kinds):
+                        continue
+                    marked.add(id(instr))
+                    invariant.append(instr)
+                    changed = True
+        return invariant
+    
+    def _cannot_fail(self, instr, kinds):
+        """True si la operación no puede lanzar un error con los valores que pueden llegarle"""
+        operands = (instr.arg1,) if instr.op in ('NEG', 'NOT') else (instr.arg1, instr.arg2)
+        worst = max(kinds.operand(instr, operand) for operand in operands)
+        if instr.op in ('EQ', 'NEQ', 'NOT'):
+            return worst <= DEFINED
+        if instr.op in ('DIV', 'MOD'):
+            return worst <= NUMBER and bool(self._parse_number(instr.arg2))
+        return worst <= NUMBER
+    
+    def _induction_products(self, ssa, kinds, loop, definitions, moved, replaced):
+        """
+        (i, k, instrucción que avanza i, paso, instrucción) por cada r = i * k
+        del ciclo con k una constante entera e i una variable de inducción
+        entera: su única asignación en el ciclo es i = t, con t = i + c o
+        t = i - c antes en el mismo bloque
+        """
+        header_phis = {phi.variable: phi for phi in ssa.phis[loop.header]}
+        steps = {}  # Variable de inducción -> (instrucción que la avanza, paso)
+        for index in loop.blocks:
+            instructions = ssa.cfg.blocks[index].instructions
+            for position, instr in enumerate(instructions):
+                variable = instr.result
+                if instr.op != 'ASSIGN' or variable not in header_phis or definitions.get(variable) != 2:
+                    continue
+                if kinds.of(variable, header_phis[variable].version) > INTEGER:
+                    continue
+                step = self._induction_step(instr, instructions[:position], definitions)
+                if step is not None:
+                    steps[variable] = (instr, step)
+        
+        for index in sorted(loop.blocks):
+            for instr in ssa.cfg.blocks[index].instructions:
+                # Lo que ya salió a un preencabezado se calcula una vez por entrada al ciclo
+                if instr.op != 'MUL' or id(instr) in moved or id(instr) in replaced:
+                    continue
+                for variable, factor in ((instr.arg1, instr.arg2), (instr.arg2, instr.arg1)):
+                    is_constant, value = decode_operand(factor)
+                    if variable in steps and is_constant and type(value) is int:
+                        increment, step = steps[variable]
+                        yield variable, factor, increment, step, instr
+                        break
+    
+    def _induction_step(self, assign, before, definitions):
+        """c si assign es i = t y t = i + c o t = i - c (c entero) está en before, o None"""
+        variable, temporary = assign.result, assign.arg1
+        if not is_temporary(temporary) or definitions.get(temporary) != 1:
+            return None
+        for instr in reversed(before):
+            if instruction_definition(instr) != temporary:
+                continue
+            if instr.op == 'ADD' and instr.arg1 == variable:
+                literal = instr.arg2
+            elif instr.op == 'ADD' and instr.arg2 == variable:
+                literal = instr.arg1
+            elif instr.op == 'SUB' and instr.arg1 == variable:
+                literal = instr.arg2
+            else:
+                return None
+            is_constant, value = decode_operand(literal)
+            if not is_constant or type(value) is not int:
+                return None
+            return -value if instr.op == 'SUB' else value
+        return None
+    
+    def _reaching_evaluations(self, cfg, available, key, index, position):
+        """
+        Cálculos de key que llegan a la instrucción position del bloque index:
+        en cada camino hacia atrás, el primero que se encuentra. None si algún
+        camino no lo calcula
+        """
+        bit = available.expressions.bit(key)
+        entries = set(cfg.entries)
+        sites = []
+        seen = set()
+        pending = [(index, position)]
+        while pending:
+            index, end = pending.pop()
+            instructions = cfg.blocks[index].instructions
+            # Un bloque entero que no calcula ni invalida key se cruza sin recorrerlo
+            if end == len(instructions) and not (available.gen[index] | available.kill[index]) & bit:
+                instructions = ()
+            for instr in reversed(instructions[:end]):
+                killed, generated = available.effect[id(instr)]
+                if generated & bit:
+                    sites.append(instr)
+                    break
+                if killed & bit:
+                    return None
+            else:
+                preds = [pred for pred in cfg.blocks[index].preds if pred in cfg.idom]
+                if index in entries or not preds:
+                    return None
+                for pred in preds:
+                    if pred not in seen:
+                        seen.add(pred)
+                        pending.append((pred, len(cfg.blocks[pred].instructions)))
+        return sites
+    
+    def _new_temporaries(self, instructions):
+        """Nombres t<n> que no aparecen en el código"""
+        last = -1
+        for instr in instructions:
+            fields = (instr.arg1, instr.result) + (instr.arg2 if isinstance(instr.arg2, tuple) else (instr.arg2,))
+            for field in fields:
+                if isinstance(field, str) and is_temporary(field):
+                    last = max(last, int(field[1:]))
+        return (f"t{number}" for number in itertools.count(last + 1))
+    
+    def _number_values(self, instructions, effects):
+        """Numeración de valores de un bloque básico"""
+        counter = itertools.count()
+        numbers = {}  # Variable u operando constante -> número de su valor
+        holders = {}  # Número -> variable que lo guarda
+        expressions = {}  # (op, número, número) -> número del resultado
+        constants = set()  # Números de los operandos constantes
+        
+        def number(operand):
+            if operand not in numbers:
+                value = numbers[operand] = next(counter)
+                if is_variable(operand):
+                    holders[value] = operand
+                else:
+                    constants.add(value)
+            return numbers[operand]
+        
+        def define(name, value):
+            numbers[name] = value
+            holder = holders.get(value)
+            # 'lista[INDEX]' es un destino del ensamblador, no una variable que se pueda leer
+            if '[' not in name and (holder is None or numbers.get(holder) != value):
+                holders[value] = name
+        
+        def holds(name, value):
+            return name is not None and numbers.get(name) == value
+        
+        optimized = []
+        for instr in instructions:
+            # Solo se reemplazan temporales: el generador de ensamblador deduce
+            # el tipo de las variables del usuario por su nombre
+            copies = {}
+            for name in effects.uses[id(instr)]:
+                holder = holders.get(numbers.get(name))
+                if is_temporary(name) and holder != name and holds(holder, numbers.get(name)):
+                    copies[name] = holder
+            definition = effects.definition[id(instr)]
+            modified = effects.modified(instr)
+            instr = self._replace_with_constants(instr, copies)
+            
+            if instr.op in BINARY_OPS or instr.op in ('NEG', 'NOT'):
+                left = number(instr.arg1)
+                right = number(instr.arg2) if instr.op in BINARY_OPS else None
+                if instr.op in COMMUTATIVE_OPS and right < left:
+                    left, right = right, left
+                key = (instr.op, left, right)
+                value = expressions.get(key)
+                if value is None:
+                    value = expressions[key] = next(counter)
+                elif holds(holders.get(value), value) and holders[value] != definition:
+                    self.optimizations_applied.append(
+                        f"Numeración de valores: {str(instr)} -> {instr.result} = {holders[value]}"
+                    )
+                    instr = TACInstruction('ASSIGN', holders[value], None, instr.result, instr.line)
+                define(definition, value)
+            elif instr.op == 'ASSIGN':
+                define(definition, number(instr.arg1))
+            else:
+                if instr.op in MUTATION_OPS:
+                    # Un alias de la lista también cambia: se olvida lo que pudo leerla
+                    expressions = {key: value for key, value in expressions.items()
+                                   if key[0] != 'MUL' and (key[1] in constants or key[2] in constants)}
+                    if instr.op == 'DICT_SET':  # Crea el diccionario si la variable no tenía uno
+                        numbers[instr.arg1] = next(counter)
+                for name in modified:
+                    numbers[name] = next(counter)
+                if definition:
+                    define(definition, next(counter))
+            optimized.append(instr)
+        
+        return optimized
+    
+    def _constant_text(self, value):
+        """Operando TAC de un número conocido, o None (los booleanos no: print muestra True y no 1)"""
+        if type(value) not in (int, float):
+            return None
+        text = str(value)
+        return text if self._parse_number(text) == value else None
+    
     def _replace_with_constants(self, instr, constants):
         """Reemplaza variables con sus valores constantes conocidos"""
-        new_arg1 = constants.get(instr.arg1, instr.arg1) if instr.arg1 else instr.arg1
-        new_arg2 = constants.get(instr.arg2, instr.arg2) if instr.arg2 else instr.arg2
+        if not constants:
+            return instr
+        new_arg1 = instr.arg1
+        if instr.arg1 and instr.op in VALUE_ARG1_OPS:
+            new_arg1 = constants.get(instr.arg1, instr.arg1)
+        new_arg2 = instr.arg2
+        if isinstance(instr.arg2, tuple):
+            new_arg2 = tuple(constants.get(arg, arg) for arg in instr.arg2)
+        elif instr.arg2 and instr.op in VALUE_ARG2_OPS:
+            new_arg2 = constants.get(instr.arg2, instr.arg2)
         
         if new_arg1 != instr.arg1 or new_arg2 != instr.arg2:
-            return TACInstruction(instr.op, new_arg1, new_arg2, instr.result)
+            return TACInstruction(instr.op, new_arg1, new_arg2, instr.result, instr.line)
         
         return instr
     
@@ -0,0 +1,112 @@
+"""
+Perfilador del Intérprete TAC
+Acumula ejecuciones y tiempo de cada instrucción TAC y los agrupa por operación,
+por función y por línea del código fuente. También exporta pilas colapsadas
+('main;factorial;línea 7 <microsegundos>' por línea), el formato que leen
+flamegraph.pl y speedscope
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+
+ROOT_FRAME = '<programa>'  # Instrucciones fuera de toda función
+
+
+@dataclass
+class ProfileEntry:
+    """Fila del reporte: instrucción, operación, función o línea con sus mediciones"""
+    key: object
+    count: int
+    time: float  # Segundos
+
+
+class ExecutionProfile:
+    """Mediciones de una ejecución del TACInterpreter creado con profile=True"""
+
+    def __init__(self):
+        self.begin([], {}, 0)
+
+    def begin(self, code, functions, start_pc):
+        """Reinicia las mediciones para el programa enlazado code"""
+        self.code = code
+        # Las instrucciones se reportan con su índice en el TAC que recibió el intérprete
+        # (el de --emit opt-tac), no con el del código enlazado, que ya no tiene las LABEL
+        self.source = {instr.source_index: instr for instr in code}
+        self.lines = [instr.line for instr in code]
+        self.counts = [0] * len(code)
+        self.times = [0.0] * len(code)
+        self.stacks = defaultdict(float)  # (pila de funciones, línea) -> segundos
+        self.function_of = [ROOT_FRAME] * len(code)
+        for name, (start, end) in functions.items():
+            self.function_of[start:end] = [name] * (end - start)
+        self.root = self.function_of[start_pc] if start_pc < len(code) else ROOT_FRAME
+
+    def path(self, call_stack):
+        """Pila de funciones activas, de la raíz a la función actual"""
+        return (self.root,) + tuple(frame['func_name'] for frame in call_stack)
+
+    @property
+    def total_count(self):
+        return sum(self.counts)
+
+    @property
+    def total_time(self):
+        return sum(self.times)
+
+    def group(self, key_of):
+        """Suma las mediciones por key_of(índice); filas ordenadas de mayor a menor tiempo"""
+        counts = defaultdict(int)
+        times = defaultdict(float)
+        for index, count in enumerate(self.counts):
+            if count:
+                key = key_of(index)
+                counts[key] += count
+                times[key] += self.times[index]
+        entries = [ProfileEntry(key, counts[key], times[key]) for key in counts]
+        entries.sort(key=lambda entry: (-entry.time, -entry.count))
+        return entries
+
+    def by_instruction(self):
+        return self.group(lambda index: self.code[index].source_index)
+
+    def by_opcode(self):
+        return self.group(lambda index: self.code[index].op)
+
+    def by_function(self):
+        return self.group(lambda index: self.function_of[index])
+
+    def by_line(self):
+        return self.group(lambda index: self.lines[index])
+
+    def hot_lines(self, limit=5):
+        """Las líneas del código fuente con más tiempo acumulado"""
+        return [entry for entry in self.by_line() if entry.key][:limit]
+
+    def collapsed_stacks(self, root=None):
+        """Pilas colapsadas con el tiempo en microsegundos (pesos enteros, mínimo 1);
+        root agrega un marco inicial, por ejemplo el nombre del archivo"""
+        lines = []
+        for (path, line), seconds in sorted(self.stacks.items()):
+            frames = ((root,) if root else ()) + path + ((f"línea {line}",) if line else ())
+            lines.append(f"{';'.join(frames)} {max(1, round(seconds * 1e6))}")
+        return lines
+
+    def format(self, limit=10):
+        """Reporte de texto: las filas más costosas de cada agrupación"""
+        total = self.total_time or 1.0
+        lines = [f"{self.total_count} instrucciones ejecutadas en {self.total_time * 1000:.3f} ms"]
+        sections = (
+            ('Línea', self.by_line(), lambda key: str(key) if key else '-'),
+            ('Función', self.by_function(), str),
+            ('Operación', self.by_opcode(), str),
+            ('Instrucción', self.by_instruction(), lambda key: f"{key:4d}: {self.source[key]}"),
+        )
+        for title, entries, label in sections:
+            lines.append('')
+            lines.append(f"{title:<40} {'Ejecuciones':>12} {'Tiempo (ms)':>12} {'%':>7}")
+            lines.append('-' * 74)
+            for entry in entries[:limit]:
+                lines.append(f"{label(entry.key)[:40]:<40} {entry.count:>12} "
+                             f"{entry.time * 1000:>12.3f} {entry.time / total:>7.1%}")
+        return '\n'.join(lines)
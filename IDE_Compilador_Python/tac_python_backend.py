@@ -0,0 +1,514 @@
+"""
+Backend de TAC a Python
+Traduce el TAC optimizado a código fuente Python y lo compila una sola vez con
+compile() en una función real. Cada variable del TAC es una variable local de
+esa función; los bloques básicos se despachan con una máquina de estados
+(pc + búsqueda binaria) y los bucles simples se emiten como `while True`.
+La salida y los errores de ejecución son los mismos que los de TACInterpreter
+"""
+
+import math
+import re
+
+from tac_interpreter import (
+    BUILTIN_CALLS, FALLBACK_PARAMS, UNDEFINED, TACInterpreter, function_parameters, link,
+)
+
+
+BINARY_SYMBOLS = {
+    'ADD': '+', 'SUB': '-', 'MUL': '*', 'DIV': '/', 'MOD': '%',
+    'EQ': '==', 'NEQ': '!=', 'LT': '<', 'GT': '>', 'LTE': '<=', 'GTE': '>=',
+}
+
+ZERO_MESSAGES = {
+    'DIV': "Error de ejecución: División por cero",
+    'MOD': "Error de ejecución: Módulo por cero",
+}
+
+MAX_INLINE_DEPTH = 40  # Anidamiento máximo al incrustar bloques (límite de indentación de Python)
+
+_LOCAL_NAME = re.compile(r"'v(\d+)'")
+
+
+class CompiledProgram:
+    """Programa TAC compilado a una función de Python"""
+
+    def __init__(self, source, function, slot_names):
+        self.source = source          # Código Python generado
+        self.function = function
+        self.slot_names = slot_names  # Nombre TAC de cada variable local v<slot>
+        self.output = []
+
+    def run(self, input_callback=None):
+        """Ejecuta el programa y retorna la salida, igual que TACInterpreter.interpret"""
+        runtime = TACInterpreter(input_callback=input_callback)
+        self.output = runtime.output
+        try:
+            self.function(runtime)
+        except NameError as e:
+            # Una variable sin asignar (local o nunca asignada) es una variable TAC no definida
+            match = _LOCAL_NAME.search(str(e))
+            if match is None:
+                raise
+            name = self.slot_names[int(match.group(1))]
+            raise Exception(f"Error de ejecución: Variable no definida: {name}") from None
+        return '\n'.join(self.output)
+
+
+class PythonBackend:
+    """Generador de código Python a partir de instrucciones TAC"""
+
+    def generate(self, instructions, function_params=None):
+        """Traduce y compila las instrucciones; retorna un CompiledProgram"""
+        program = link(instructions)
+        self.code = program.code
+        self.slots = program.slots
+        self.functions = program.functions
+        self.end = len(self.code)
+        self.constants = []
+        self.function_info = {}
+        for func_name in self.functions:
+            params = function_parameters(func_name, function_params)
+            self.function_info[func_name] = {
+                'param_slots': [self.slots.slot(name) for name in params],
+                'restore_slots': [self.slots.slot(name) for name in params if not str(name).startswith('t')],
+            }
+        for name in FALLBACK_PARAMS:
+            self.slots.slot(name)
+
+        self.find_blocks()
+        source = self.emit_program()
+        namespace = {'UNDEFINED': UNDEFINED, 'CONSTANTS': tuple(self.constants)}
+        exec(compile(source, '<tac>', 'exec'), namespace)
+        return CompiledProgram(source, namespace['tac_program'], list(self.slots.names))
+
+    # ---------------- Bloques básicos ----------------
+
+    def is_user_call(self, instr):
+        return instr.op == 'CALL' and instr.arg1 not in BUILTIN_CALLS
+
+    def find_blocks(self):
+        """Divide el código en bloques básicos y cuenta los predecesores de cada uno"""
+        code = self.code
+        self.start = self.functions['main'][0] if 'main' in self.functions else 0
+        self.entries = {self.start} | {start for start, _ in self.functions.values()}
+        leaders = set(self.entries)
+        for index, instr in enumerate(code):
+            if instr.target is not None:
+                leaders.add(instr.target)
+            if instr.op in ('GOTO', 'IF_FALSE', 'RETURN') or self.is_user_call(instr):
+                leaders.add(index + 1)
+        leaders = sorted(leader for leader in leaders if leader < self.end)
+
+        self.block_end = {}
+        for position, leader in enumerate(leaders):
+            self.block_end[leader] = leaders[position + 1] if position + 1 < len(leaders) else self.end
+
+        # Cada llamada vuelve a un bloque de aterrizaje propio que asigna el resultado
+        self.landings = {}
+        self.restores = {}
+        next_id = self.end + 1
+        for index, instr in enumerate(code):
+            if self.is_user_call(instr) and instr.arg1 in self.functions:
+                self.landings[index] = next_id
+                next_id += 1
+        for func_name in self.functions:
+            if self.function_info[func_name]['restore_slots']:
+                self.restores[func_name] = next_id
+                next_id += 1
+
+        self.predecessors = {}
+        for leader, end in self.block_end.items():
+            last = code[end - 1]
+            if last.op in ('GOTO', 'IF_FALSE') and last.target is not None:
+                self.add_edge(last.target)
+            if last.op == 'GOTO' or last.op == 'RETURN':
+                continue
+            if self.is_user_call(last):
+                if last.arg1 in self.functions:
+                    self.add_edge(end)  # Desde el bloque de aterrizaje
+                continue
+            self.add_edge(end)
+
+    def add_edge(self, target):
+        self.predecessors[target] = self.predecessors.get(target, 0) + 1
+
+    def can_inline(self, target):
+        """Un bloque con un único predecesor se emite dentro de él en lugar de despacharse"""
+        return (target != self.end and target not in self.entries and target not in self.emitted
+                and self.predecessors.get(target, 0) == 1)
+
+    # ---------------- Emisión ----------------
+
+    def emit_program(self):
+        self.emitted = set()
+        self.pending = [self.start]
+        self.roots = {}
+        lines = []
+        self.temp_counter = 0
+        self.pending.extend(self.landings.values())
+        self.pending.extend(self.restores.values())
+
+        while self.pending:
+            block_id = self.pending.pop()
+            if block_id in self.roots or block_id == self.end:
+                continue
+            body = []
+            if block_id > self.end:
+                self.emit_special(block_id, body)
+            else:
+                self.emit_block(block_id, 0, body)
+            self.roots[block_id] = body
+
+        lines.append("def tac_program(runtime):")
+        lines.append("    output_append = runtime.output.append")
+        lines.append("    read_input = runtime.read_input")
+        lines.append("    index_value = runtime.index_value")
+        lines.append("    dict_get = runtime.dict_get")
+        lines.append("    to_int = runtime.to_int")
+        lines.append("    stack = []")
+        lines.append("    _r = None")
+        if self.start == self.end:
+            lines.append("    return")
+            return '\n'.join(lines) + '\n'
+        lines.append(f"    pc = {self.start}")
+        lines.append("    while True:")
+        self.emit_dispatch(sorted(self.roots), 2, lines)
+        return '\n'.join(lines) + '\n'
+
+    def emit_dispatch(self, ids, indent, lines):
+        """Árbol de búsqueda binaria sobre pc que lleva al código de cada bloque raíz"""
+        pad = '    ' * indent
+        if len(ids) == 1:
+            for line in self.roots[ids[0]]:
+                lines.append(pad + line)
+            return
+        middle = len(ids) // 2
+        lines.append(f"{pad}if pc < {ids[middle]}:")
+        self.emit_dispatch(ids[:middle], indent + 1, lines)
+        lines.append(f"{pad}else:")
+        self.emit_dispatch(ids[middle:], indent + 1, lines)
+
+    def emit_goto(self, target, depth, lines, pad=''):
+        if target == self.end:
+            lines.append(pad + "return")
+        elif depth < MAX_INLINE_DEPTH and self.can_inline(target):
+            body = []
+            self.emit_block(target, depth + 1, body)
+            lines.extend(pad + line for line in body)
+        else:
+            lines.append(f"{pad}pc = {target}")
+            lines.append(pad + "continue")
+            self.pending.append(target)
+
+    def emit_block(self, leader, depth, lines):
+        self.emitted.add(leader)
+        loop = self.find_loop(leader)
+        if loop is not None:
+            self.emit_loop(leader, loop, depth, lines)
+            return
+
+        end = self.block_end[leader]
+        for instr in self.code[leader:end - 1]:
+            self.emit_statement(instr, lines)
+        last = self.code[end - 1]
+        if last.op == 'GOTO':
+            if last.target is None:
+                lines.append(f"raise Exception({self.message_label(last.arg1)})")
+            else:
+                self.emit_goto(last.target, depth, lines)
+        elif last.op == 'IF_FALSE':
+            lines.append(f"if not {self.operand(last.arg1_operand)}:")
+            if last.target is None:
+                lines.append(f"    raise Exception({self.message_label(last.arg2)})")
+            else:
+                self.emit_goto(last.target, depth, lines, '    ')
+            self.emit_goto(end, depth, lines)
+        elif last.op == 'RETURN':
+            self.emit_return(last, lines)
+        elif self.is_user_call(last):
+            self.emit_call(end - 1, last, lines)
+        else:
+            self.emit_statement(last, lines)
+            self.emit_goto(end, depth, lines)
+
+    def find_loop(self, header):
+        """
+        Bucle estructurable: la cabecera termina en IF_FALSE (salida) y sigue una
+        cadena de bloques sin ramas, cada uno con un solo predecesor, que vuelve
+        con GOTO a la cabecera. Retorna la cadena o None
+        """
+        last = self.code[self.block_end[header] - 1]
+        if last.op != 'IF_FALSE':
+            return None
+        chain = []
+        block = self.block_end[header]
+        while True:
+            if (block == self.end or block == header or block in self.entries or block in chain
+                    or block in self.emitted or self.predecessors.get(block, 0) != 1):
+                return None
+            end = self.block_end[block]
+            tail = self.code[end - 1]
+            if tail.op in ('IF_FALSE', 'RETURN') or self.is_user_call(tail):
+                return None
+            chain.append(block)
+            if tail.op == 'GOTO':
+                if tail.target == header:
+                    return chain
+                if tail.target is None:
+                    return None
+                block = tail.target
+            else:
+                block = end
+
+    def emit_loop(self, header, chain, depth, lines):
+        self.emitted.update(chain)
+        end = self.block_end[header]
+        exit_instr = self.code[end - 1]
+        lines.append("while True:")
+        body = []
+        for instr in self.code[header:end - 1]:
+            self.emit_statement(instr, body)
+        body.append(f"if not {self.operand(exit_instr.arg1_operand)}:")
+        if exit_instr.target is None:
+            body.append(f"    raise Exception({self.message_label(exit_instr.arg2)})")
+        else:
+            body.append("    break")
+        for block in chain:
+            block_end = self.block_end[block]
+            for instr in self.code[block:block_end]:
+                if instr.op != 'GOTO':
+                    self.emit_statement(instr, body)
+        lines.extend('    ' + line for line in body)
+        if exit_instr.target is not None:
+            self.emit_goto(exit_instr.target, depth, lines)
+
+    def emit_special(self, block_id, lines):
+        """Bloques de aterrizaje de llamadas y de restauración de parámetros"""
+        for call_index, landing in self.landings.items():
+            if landing == block_id:
+                instr = self.code[call_index]
+                if instr.result:
+                    lines.append(f"v{instr.result_slot} = _r")
+                self.emit_goto(call_index + 1, 0, lines)
+                return
+        for func_name, restore in self.restores.items():
+            if restore == block_id:
+                restore_slots = self.function_info[func_name]['restore_slots']
+                names = [self.new_temp() for _ in restore_slots]
+                lines.append(f"{', '.join(names)}, = _saved")
+                for slot, name in zip(restore_slots, names):
+                    lines.append(f"if {name} is UNDEFINED:")
+                    lines.append("    try:")
+                    lines.append(f"        del v{slot}")
+                    lines.append("    except NameError:")
+                    lines.append("        pass")
+                    lines.append("else:")
+                    lines.append(f"    v{slot} = {name}")
+                lines.append("pc = _landing")
+                lines.append("continue")
+                return
+
+    def emit_call(self, index, instr, lines):
+        func_name = instr.arg1
+        if func_name not in self.functions:
+            message = f"Error de ejecución: Función '{func_name}' no definida"
+            lines.append(f"raise Exception({self.literal(message)})")
+            return
+        args = []
+        for operand in instr.call_operands:
+            name = self.new_temp()
+            lines.append(f"{name} = {self.operand(operand)}")
+            args.append(name)
+
+        info = self.function_info[func_name]
+        saved = []
+        for slot in info['restore_slots']:
+            name = self.new_temp()
+            lines.append("try:")
+            lines.append(f"    {name} = v{slot}")
+            lines.append("except NameError:")
+            lines.append(f"    {name} = UNDEFINED")
+            saved.append(name)
+        landing = self.landings[index]
+        restore = self.restores.get(func_name, landing)
+        lines.append(f"stack.append(({restore}, {landing}, ({''.join(name + ', ' for name in saved)})))")
+
+        if info['param_slots']:
+            for slot, arg in zip(info['param_slots'], args):
+                lines.append(f"v{slot} = {arg}")
+        elif args:
+            names = FALLBACK_PARAMS
+            if func_name == 'factorial' and len(args) >= 1:
+                names = ['n']
+            elif func_name == 'suma' and len(args) >= 2:
+                names = ['a', 'b']
+            for name, arg in zip(names, args):
+                lines.append(f"v{self.slots.index[name]} = {arg}")
+
+        func_start = self.functions[func_name][0]
+        if func_start == self.end:
+            lines.append("return")
+        else:
+            lines.append(f"pc = {func_start}")
+            lines.append("continue")
+            self.pending.append(func_start)
+
+    def emit_return(self, instr, lines):
+        if instr.arg1 is not None:
+            lines.append(f"_r = {self.operand(instr.arg1_operand)}")
+        else:
+            lines.append("_r = None")
+        lines.append("if not stack:")
+        lines.append("    return")
+        lines.append("pc, _landing, _saved = stack.pop()")
+        lines.append("continue")
+
+    def emit_statement(self, instr, lines):
+        """Código de una instrucción que no cambia el flujo de control"""
+        op = instr.op
+        result = f"v{instr.result_slot}"
+        if op in BINARY_SYMBOLS:
+            left = self.operand(instr.arg1_operand)
+            right = self.operand(instr.arg2_operand)
+            symbol = BINARY_SYMBOLS[op]
+            if op in ZERO_MESSAGES:
+                right_constant, right_value = instr.arg2_operand
+                if right_constant and right_value == 0:
+                    lines.append(f"_a = {left}")
+                    lines.append(f"raise Exception({self.literal(ZERO_MESSAGES[op])})")
+                elif right_constant:
+                    lines.append(f"{result} = {left} {symbol} {right}")
+                else:
+                    lines.append(f"_a = {left}")
+                    lines.append(f"_b = {right}")
+                    lines.append("if _b == 0:")
+                    lines.append(f"    raise Exception({self.literal(ZERO_MESSAGES[op])})")
+                    lines.append(f"{result} = _a {symbol} _b")
+            else:
+                lines.append(f"{result} = {left} {symbol} {right}")
+        elif op == 'ASSIGN':
+            lines.append(f"{result} = {self.operand(instr.arg1_operand)}")
+        elif op == 'NEG':
+            lines.append(f"{result} = -{self.operand(instr.arg1_operand)}")
+        elif op == 'NOT':
+            lines.append(f"{result} = not {self.operand(instr.arg1_operand)}")
+        elif op == 'PRINT':
+            lines.append(f"output_append(str({self.operand(instr.arg1_operand)}))")
+        elif op == 'LIST_CREATE':
+            lines.append(f"{result} = []")
+        elif op == 'DICT_CREATE':
+            lines.append(f"{result} = {{}}")
+        elif op == 'LIST_GET':
+            lines.append(f"{result} = index_value({self.operand(instr.arg1_operand)}, "
+                         f"{self.operand(instr.arg2_operand)}, {self.literal(instr.arg1)})")
+        elif op == 'DICT_GET':
+            lines.append(f"{result} = dict_get({self.operand(instr.arg1_operand)}, "
+                         f"{self.operand(instr.arg2_operand)}, {self.literal(instr.arg1)})")
+        elif op in ('LIST_APPEND', 'LIST_REMOVE'):
+            self.emit_named_read(instr.arg1_slot, '_l', '[]', lines)
+            lines.append(f"_v = {self.operand(instr.arg2_operand)}")
+            lines.append("if isinstance(_l, list):")
+            if op == 'LIST_APPEND':
+                lines.append("    _l.append(_v)")
+            else:
+                lines.append("    try:")
+                lines.append("        _l.remove(_v)")
+                lines.append("    except ValueError:")
+                lines.append("        pass")
+            lines.append("else:")
+            lines.append(f"    raise Exception({self.literal(f'Error de ejecución: {instr.arg1} no es una lista')})")
+        elif op == 'DICT_SET':
+            self.emit_named_read(instr.arg1_slot, '_d', 'None', lines)
+            lines.append("if _d is None:")
+            lines.append(f"    _d = v{instr.arg1_slot} = {{}}")
+            lines.append("if isinstance(_d, dict):")
+            lines.append(f"    _k = {self.operand(instr.arg2_operand)}")
+            lines.append(f"    _d[_k] = {self.operand(instr.result_operand)}")
+            lines.append("else:")
+            lines.append(f"    raise Exception({self.literal(f'Error de ejecución: {instr.arg1} no es un diccionario')})")
+        elif op == 'LIST_SET':
+            self.emit_named_read(instr.arg1_slot, '_l', 'None', lines)
+            lines.append("if isinstance(_l, list):")
+            lines.append(f"    _i = {self.operand(instr.arg2_operand)}")
+            lines.append("    if isinstance(_i, (int, float)):")
+            lines.append("        _i = int(_i)")
+            lines.append(f"        _v = {self.operand(instr.result_operand)}")
+            lines.append("        if 0 <= _i < len(_l):")
+            lines.append("            _l[_i] = _v")
+            lines.append("        else:")
+            lines.append("            raise Exception('Error de ejecución: Índice fuera de rango: ' + str(_i))")
+            lines.append("    else:")
+            lines.append("        raise Exception('Error de ejecución: Índice debe ser número')")
+            lines.append("else:")
+            lines.append(f"    raise Exception({self.literal(f'Error de ejecución: {instr.arg1} no es una lista')})")
+        elif op == 'INPUT':
+            self.emit_input(instr.arg1, instr.arg1_operand, instr, lines)
+        elif op == 'CALL' and instr.arg1 == 'len':
+            lines.append(f"_x = {self.operand(instr.arg2_operand)}")
+            lines.append("if isinstance(_x, (list, str)):")
+            lines.append(f"    {result} = len(_x)")
+            lines.append("else:")
+            lines.append("    raise Exception('Error de ejecución: len() requiere una lista o string')")
+        elif op == 'CALL' and instr.arg1 == 'int':
+            lines.append(f"{result} = to_int({self.operand(instr.arg2_operand)})")
+        elif op == 'CALL' and instr.arg1 == 'input':
+            self.emit_input(instr.arg2, instr.arg2_operand, instr, lines)
+        # Cualquier otra operación no hace nada, como en TACInterpreter
+
+    def emit_named_read(self, slot, name, default, lines):
+        """Lee una variable por nombre sin exigir que exista (default si no fue asignada)"""
+        lines.append("try:")
+        lines.append(f"    {name} = v{slot}")
+        lines.append("except NameError:")
+        lines.append(f"    {name} = {default}")
+
+    def emit_input(self, raw, operand, instr, lines):
+        lines.append("_p = UNDEFINED")
+        if raw:
+            is_constant, value = operand
+            if is_constant:
+                lines.append(f"_p = {self.constant(value)}")
+            else:
+                lines.append("try:")
+                lines.append(f"    _p = v{value}")
+                lines.append("except NameError:")
+                lines.append("    pass")
+        lines.append(f"_x = read_input({self.literal(raw)}, _p)")
+        if instr.result:
+            lines.append(f"v{instr.result_slot} = _x")
+
+    # ---------------- Operandos ----------------
+
+    def operand(self, operand):
+        is_constant, value = operand
+        if is_constant:
+            return self.constant(value)
+        return f"v{value}"
+
+    def constant(self, value):
+        if value is None or isinstance(value, (bool, str)):
+            return repr(value)
+        if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
+            text = repr(value)
+            return f"({text})" if text.startswith('-') else text
+        self.constants.append(value)
+        return f"CONSTANTS[{len(self.constants) - 1}]"
+
+    def literal(self, value):
+        """Valor arbitrario del TAC como expresión Python (mensajes, nombres)"""
+        if value is None or isinstance(value, (bool, int, str)):
+            return repr(value)
+        return self.constant(value)
+
+    def message_label(self, label):
+        return self.literal(f"Error de ejecución: Etiqueta no encontrada: {label}")
+
+    def new_temp(self):
+        self.temp_counter += 1
+        return f"_t{self.temp_counter}"
+
+
+def compile_tac(instructions, function_params=None):
+    """Atajo: PythonBackend().generate(...)"""
+    return PythonBackend().generate(instructions, function_params)
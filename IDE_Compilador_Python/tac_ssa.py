@@ -0,0 +1,425 @@
+"""
+Forma SSA del Código TAC y Propagación de Constantes Condicional Dispersa
+Cada asignación crea una versión nueva de su variable, las funciones φ
+juntan las versiones que llegan a un bloque por caminos distintos (se ponen
+en la frontera de dominancia iterada, solo donde la variable está viva) y
+SCCP calcula sobre esa forma qué versiones son constantes y qué bloques
+pueden ejecutarse, en una sola pasada hasta su punto fijo. ValueKinds dice
+además qué versiones son seguro números, para saber qué cálculos no fallan
+
+Las funciones leen las variables de quien las llama por su nombre (alcance
+dinámico), así que el TAC no se renombra: las versiones se guardan aparte,
+por instrucción, y un CALL define una versión nueva de cada variable que la
+función llamada puede modificar
+"""
+
+from collections import deque
+
+from tac_dataflow import CallEffects, Liveness, instruction_definition, is_variable
+from tac_interpreter import TACInterpreter, decode_operand
+from tac_generator import TACInstruction
+
+
+class Phi:
+    """variable_version = φ(...) al comienzo de un bloque; args va de predecesor a versión"""
+
+    def __init__(self, variable, block):
+        self.variable = variable
+        self.block = block
+        self.version = None
+        self.args = {}  # Índice del predecesor (None = la raíz virtual de una entrada) -> versión
+
+    def __repr__(self):
+        return f"Phi({self.variable}_{self.version}, B{self.block}, {self.args})"
+
+
+class SSAForm:
+    """
+    El CFG en forma SSA. La versión 0 de una variable es el valor que trae al
+    entrar al programa o a una función (desconocido); uses y defs guardan,
+    por id de instrucción, la versión de cada variable que lee y que asigna
+    """
+
+    def __init__(self, cfg, effects=None):
+        self.cfg = cfg
+        self.effects = effects or CallEffects(cfg)
+        self.phis = {block.index: [] for block in cfg}
+        self.uses = {}
+        self.defs = {}
+        self.sites = {}  # (variable, versión) -> (bloque, instrucción o φ que la define)
+        self.liveness = Liveness(cfg, self.effects)
+        self.place_phis()
+        self.rename()
+
+    def definitions(self, instr):
+        """Variables que asigna la instrucción, contando lo que puede cambiar una llamada"""
+        names = sorted(self.effects.modified(instr))
+        definition = self.effects.definition[id(instr)]
+        if definition and definition not in names:
+            names.append(definition)
+        return names
+
+    def place_phis(self):
+        """φ podadas: en la frontera de dominancia iterada de las asignaciones, donde la variable entra viva"""
+        cfg = self.cfg
+        frontiers = cfg.dominance_frontiers()
+        liveness = self.liveness
+        assigned = {}  # Variable -> bloques alcanzables que la asignan
+        for block in cfg:
+            if block.index not in frontiers:
+                continue
+            for instr in block.instructions:
+                for name in self.definitions(instr):
+                    assigned.setdefault(name, set()).add(block.index)
+        for name in sorted(assigned):
+            bit = liveness.variables.bit(name)
+            blocks = assigned[name]
+            placed = set()
+            pending = list(blocks)
+            while pending:
+                for frontier in frontiers[pending.pop()]:
+                    if frontier in placed or not liveness.block_in[frontier] & bit:
+                        continue
+                    placed.add(frontier)
+                    self.phis[frontier].append(Phi(name, frontier))
+                    if frontier not in blocks:
+                        pending.append(frontier)
+
+    def rename(self):
+        """Numera las versiones recorriendo el árbol de dominadores (sin recursión)"""
+        cfg = self.cfg
+        tree = cfg.dominator_tree()
+        counters = {}
+        stacks = {}
+
+        def current(name):
+            stack = stacks.get(name)
+            return stack[-1] if stack else 0
+
+        def new_version(name):
+            version = counters[name] = counters.get(name, 0) + 1
+            stacks.setdefault(name, []).append(version)
+            return version
+
+        for entry in cfg.entries:
+            for phi in self.phis[entry]:
+                phi.args[None] = 0
+
+        pending = [(index, False) for index in reversed(tree.get(None, []))]
+        pushed = {}
+        while pending:
+            index, done = pending.pop()
+            if done:
+                for name in pushed.pop(index):
+                    stacks[name].pop()
+                continue
+            names = []
+            for phi in self.phis[index]:
+                phi.version = new_version(phi.variable)
+                self.sites[(phi.variable, phi.version)] = (index, phi)
+                names.append(phi.variable)
+            for instr in cfg.blocks[index].instructions:
+                self.uses[id(instr)] = {name: current(name) for name in self.effects.uses[id(instr)]}
+                defs = self.defs[id(instr)] = {}
+                for name in self.definitions(instr):
+                    defs[name] = new_version(name)
+                    self.sites[(name, defs[name])] = (index, instr)
+                    names.append(name)
+            for succ in cfg.blocks[index].succs:
+                for phi in self.phis[succ]:
+                    phi.args[index] = current(phi.variable)
+            pushed[index] = names
+            pending.append((index, True))
+            pending.extend((child, False) for child in reversed(tree.get(index, [])))
+
+    def versioned(self, instr):
+        """Copia de la instrucción con cada variable escrita como nombre_versión"""
+        uses = self.uses.get(id(instr), {})
+        defs = self.defs.get(id(instr), {})
+
+        def name(operand, versions):
+            if is_variable(operand) and operand in versions:
+                return f"{operand}_{versions[operand]}"
+            return operand
+
+        arg1 = instr.arg1 if instr.op in ('LABEL', 'GOTO', 'CALL') else name(instr.arg1, uses)
+        if isinstance(instr.arg2, tuple):
+            arg2 = tuple(name(arg, uses) for arg in instr.arg2)
+        else:
+            arg2 = name(instr.arg2, uses)
+        result = name(instr.result, defs if instruction_definition(instr) else uses)
+        return TACInstruction(instr.op, arg1, arg2, result, instr.line)
+
+    def format(self):
+        """Bloques con sus φ y las instrucciones versionadas, para mostrar en la consola"""
+        lines = []
+        for block in self.cfg:
+            if block.index not in self.cfg.idom:
+                lines.append(f"B{block.index}  (inalcanzable)")
+                continue
+            lines.append(f"B{block.index}")
+            for phi in self.phis[block.index]:
+                args = ', '.join(f"{'entrada' if pred is None else f'B{pred}'}: {phi.variable}_{version}"
+                                 for pred, version in sorted(phi.args.items(), key=lambda arg: -1 if arg[0] is None else arg[0]))
+                lines.append(f"    {phi.variable}_{phi.version} = φ({args})")
+            for instr in block.instructions:
+                text = f"    {self.versioned(instr)}"
+                clobbered = [f"{name}_{version}" for name, version in self.defs[id(instr)].items()
+                             if name != instruction_definition(instr)]
+                if clobbered:
+                    text += f"    # redefine {', '.join(clobbered)}"
+                lines.append(text)
+        return '\n'.join(lines)
+
+    def lower(self):
+        """
+        Sale de SSA: quita las φ y devuelve cada versión a su variable. No hacen
+        falta copias porque sobre la forma SSA solo se reemplazan usos por
+        constantes y se quitan saltos y bloques, así que dos versiones de una
+        misma variable nunca quedan vivas a la vez
+        """
+        return self.cfg.to_instructions()
+
+
+INT, INTEGER, NUMBER, DEFINED, UNKNOWN = range(5)  # Lo que se sabe de un valor, de más a menos
+
+
+class ValueKinds:
+    """
+    Qué se sabe de cada versión SSA en cualquier camino: que es un int, un
+    entero (int o bool), un número, algún valor, o nada (puede no estar
+    definida). Parte de lo mejor y empeora hasta el punto fijo, así i = i + 1
+    sigue siendo un int si empezó siéndolo
+    """
+
+    def __init__(self, ssa):
+        self.ssa = ssa
+        self.kinds = {}  # (variable, versión) -> INT, INTEGER, NUMBER, DEFINED o UNKNOWN
+        users = {}  # (variable, versión) -> φ e instrucciones que la usan
+        pending = deque()
+        for index in ssa.cfg.reverse_postorder():
+            for phi in ssa.phis[index]:
+                pending.append(phi)
+                for version in phi.args.values():
+                    users.setdefault((phi.variable, version), []).append(phi)
+            for instr in ssa.cfg.blocks[index].instructions:
+                pending.append(instr)
+                for key in ssa.uses[id(instr)].items():
+                    users.setdefault(key, []).append(instr)
+        while pending:
+            item = pending.popleft()
+            for key, kind in self.results(item):
+                if self.update(key, kind):
+                    pending.extend(users.get(key, ()))
+
+    def results(self, item):
+        """(variable, versión) y su tipo para lo que define una φ o instrucción"""
+        if isinstance(item, Phi):
+            kind = max([self.of(item.variable, version) for version in item.args.values()], default=UNKNOWN)
+            return [((item.variable, item.version), kind)]
+        definition = self.ssa.effects.definition[id(item)]
+        return [((name, version), self.evaluate(item) if name == definition else UNKNOWN)
+                for name, version in self.ssa.defs[id(item)].items()]
+
+    def update(self, key, kind):
+        if kind > self.kinds.get(key, INT):
+            self.kinds[key] = kind
+            return True
+        return False
+
+    def of(self, name, version):
+        return UNKNOWN if version == 0 else self.kinds.get((name, version), INT)
+
+    def operand(self, instr, operand):
+        """Lo que se sabe de un operando de instr"""
+        version = self.ssa.uses[id(instr)].get(operand)
+        if version is not None:
+            return self.of(operand, version)
+        value = decode_operand(operand)[1]
+        if isinstance(value, bool):
+            return INTEGER
+        if isinstance(value, int):
+            return INT
+        return NUMBER if isinstance(value, float) else DEFINED
+
+    def evaluate(self, instr):
+        op = instr.op
+        if op in ('EQ', 'NEQ', 'LT', 'GT', 'LTE', 'GTE', 'NOT'):
+            return INTEGER
+        if op == 'ASSIGN':
+            return self.operand(instr, instr.arg1)
+        if op in ('ADD', 'SUB', 'MUL', 'MOD', 'DIV', 'NEG'):
+            operands = [instr.arg1] if op == 'NEG' else [instr.arg1, instr.arg2]
+            kind = max(self.operand(instr, operand) for operand in operands)
+            if kind > NUMBER:
+                return DEFINED  # Si no falla, algo da
+            if op == 'DIV' or kind == NUMBER:
+                return NUMBER
+            return INT  # La aritmética con bools da int: True + True == 2
+        if op == 'CALL' and instr.arg1 in ('len', 'int'):
+            return INT
+        if op == 'CALL':
+            return DEFINED if instr.arg1 == 'input' else UNKNOWN
+        return DEFINED
+
+
+NOT_YET = object()  # ⊤: todavía no se sabe (ningún camino ejecutable lo asignó)
+VARYING = object()  # ⊥: no es constante
+
+CONSTANT_TYPES = (int, float, bool)
+
+
+def meet(a, b):
+    if a is NOT_YET:
+        return b
+    if b is NOT_YET or a is b:
+        return a
+    if a is VARYING or b is VARYING:
+        return VARYING
+    # True == 1, pero print muestra distinto cada uno
+    return a if type(a) is type(b) and a == b else VARYING
+
+
+class SparseConditionalConstants:
+    """
+    Propagación de constantes condicional dispersa (Wegman y Zadeck): avanza a
+    la vez por las aristas del CFG que pueden ejecutarse y por las aristas SSA
+    de cada versión a sus usos, evaluando las operaciones como el intérprete.
+    Un IF_FALSE con condición constante solo habilita uno de sus caminos, y
+    lo que llega por el otro no cuenta en las φ
+    """
+
+    def __init__(self, ssa):
+        self.ssa = ssa
+        self.cfg = ssa.cfg
+        self.values = {}  # (variable, versión) -> constante, NOT_YET o VARYING
+        self.executable = set()  # Bloques que pueden ejecutarse
+        self.edges = set()  # Aristas (predecesor, bloque) que pueden recorrerse
+        self.users = {}  # (variable, versión) -> [(bloque, instrucción o φ)]
+        for block in self.cfg:
+            for phi in ssa.phis[block.index]:
+                for version in phi.args.values():
+                    self.users.setdefault((phi.variable, version), []).append((block.index, phi))
+            for instr in block.instructions:
+                for name, version in ssa.uses.get(id(instr), {}).items():
+                    self.users.setdefault((name, version), []).append((block.index, instr))
+        self.solve()
+
+    def value(self, name, version):
+        if version == 0:
+            return VARYING
+        return self.values.get((name, version), NOT_YET)
+
+    def operand_value(self, instr, operand):
+        """Valor en el retículo de un operando de instr"""
+        version = self.ssa.uses[id(instr)].get(operand)
+        if version is not None:
+            return self.value(operand, version)
+        value = decode_operand(operand)[1]
+        return value if isinstance(value, CONSTANT_TYPES) else VARYING
+
+    def result_value(self, instr):
+        """Valor que asigna instr a su resultado, o VARYING si no asigna nada"""
+        definition = self.ssa.effects.definition[id(instr)]
+        if not definition:
+            return VARYING
+        return self.value(definition, self.ssa.defs[id(instr)][definition])
+
+    def solve(self):
+        self.flow = deque((None, entry) for entry in self.cfg.entries)
+        self.pending = deque()
+        while self.flow or self.pending:
+            while self.flow:
+                edge = self.flow.popleft()
+                if edge in self.edges:
+                    continue
+                self.edges.add(edge)
+                index = edge[1]
+                for phi in self.ssa.phis[index]:
+                    self.visit_phi(phi)
+                if index not in self.executable:
+                    self.executable.add(index)
+                    for instr in self.cfg.blocks[index].instructions:
+                        self.visit(index, instr)
+            while self.pending:
+                for index, user in self.users.get(self.pending.popleft(), ()):
+                    if index not in self.executable:
+                        continue
+                    if isinstance(user, Phi):
+                        self.visit_phi(user)
+                    else:
+                        self.visit(index, user)
+
+    def update(self, name, version, value):
+        key = (name, version)
+        old = self.values.get(key, NOT_YET)
+        new = meet(old, value)
+        if new is not old:
+            self.values[key] = new
+            self.pending.append(key)
+
+    def visit_phi(self, phi):
+        value = NOT_YET
+        for pred, version in phi.args.items():
+            if (pred, phi.block) in self.edges:
+                value = meet(value, self.value(phi.variable, version))
+        self.update(phi.variable, phi.version, value)
+
+    def visit(self, index, instr):
+        definition = self.ssa.effects.definition[id(instr)]
+        for name, version in self.ssa.defs[id(instr)].items():
+            self.update(name, version, self.evaluate(instr) if name == definition else VARYING)
+        block = self.cfg.blocks[index]
+        if instr is block.last:
+            for succ in self.branch_targets(block):
+                self.flow.append((index, succ))
+
+    def branch_targets(self, block):
+        """Sucesores de un bloque que pueden ejecutarse según su condición"""
+        instr = block.last
+        if instr.op != 'IF_FALSE':
+            return block.succs
+        condition = self.operand_value(instr, instr.arg1)
+        if condition is NOT_YET:
+            return []
+        if condition is VARYING:
+            return block.succs
+        if condition:
+            target = block.index + 1
+        else:
+            target = self.cfg.labels.get(instr.arg2)
+        return [target] if target is not None and target < len(self.cfg) else []
+
+    def evaluate(self, instr):
+        """Valor de una operación con los valores actuales de sus operandos"""
+        op = instr.op
+        if op in ('ASSIGN', 'NEG', 'NOT'):
+            operands = [self.operand_value(instr, instr.arg1)]
+        elif op in TACInterpreter.BINARY_OPERATIONS:
+            operands = [self.operand_value(instr, instr.arg1), self.operand_value(instr, instr.arg2)]
+        else:
+            return VARYING
+        if VARYING in operands:
+            return VARYING
+        if NOT_YET in operands:
+            return NOT_YET
+        if op == 'ASSIGN':
+            return operands[0]
+        if op == 'NOT':
+            return not operands[0]
+        try:
+            if op == 'NEG':
+                value = -operands[0]
+            else:
+                operation, zero_message = TACInterpreter.BINARY_OPERATIONS[op]
+                left, right = operands
+                # Dividir por cero falla al ejecutar: no se pliega
+                if zero_message and right == 0:
+                    return VARYING
+                value = operation(left, right)
+        except (ArithmeticError, TypeError, ValueError):
+            return VARYING
+        return value if isinstance(value, CONSTANT_TYPES) else VARYING
+
+    def is_executable(self, index):
+        return index in self.executable
@@ -0,0 +1,40 @@
+"""
+Pruebas del Optimizador TAC
+El TAC optimizado debe imprimir lo mismo que el TAC sin optimizar
+"""
+
+from compiler_pipeline import compile_source, tac_from_tuples
+from tac_interpreter import TACInterpreter
+
+
+# Reducción de fuerza con operandos que SCCP no conoce: el tipo decide si aplica
+PROGRAMS = [
+    # h termina siendo float: h * 0 da 0.0, no 0
+    ("k = 0\nh = 3\ni = 0\nwhile i < 2:\n    h = h / 2\n    i = i + 1\nr = h * k\nprint(r)\n", '0.0'),
+    ("h = 3\ni = 0\nwhile i < 2:\n    h = h / 2\n    i = i + 1\nr = h * 0\nprint(r)\n", '0.0'),
+    # En la segunda vuelta b es bool: b * 1 y 0 + b dan 1, no True
+    ("i = 0\nb = 5\nwhile i < 2:\n    r = b * 1\n    s = 0 + b\n    print(r)\n    print(s)\n"
+     "    b = i < 1\n    i = i + 1\n", '5\n5\n1\n1'),
+    # Con un int sí se reduce
+    ("i = 0\nwhile i < 2:\n    i = i + 1\nr = i * 0\ns = 1 * i\nprint(r)\nprint(s)\n", '0\n2'),
+]
+
+
+def run(rows, function_params):
+    interpreter = TACInterpreter()
+    interpreter.start(tac_from_tuples(rows), function_params)
+    assert interpreter.run()
+    return '\n'.join(interpreter.output)
+
+
+def test_optimized_output():
+    for source, expected in PROGRAMS:
+        result = compile_source(source)
+        assert result.ok, result.errors
+        assert run(result.tac, result.function_params) == expected, source
+        assert run(result.optimized_tac, result.function_params) == expected, source
+
+
+def test_int_identities_reduced():
+    result = compile_source(PROGRAMS[-1][0])
+    assert not any(row[0] == 'MUL' for row in result.optimized_tac)
@@ -1,5 +1,7 @@
 
 
+from array import array
+from collections import deque
 from enum import Enum, auto
 
 
@@ -56,6 +58,8 @@ class TokenType(Enum):
 class Token:
     """Represents a single token in the source code"""
     
+    __slots__ = ('type', 'value', 'line', 'column')  # No per-instance __dict__
+    
     def __init__(self, token_type, value, line, column):
         self.type = token_type
         self.value = value
@@ -69,6 +73,145 @@ class Token:
         return f"{self.type.name}({self.value})"
 
 
+class TokenBuffer:
+    """
+    Columnar token store: type, line and column live in array('i') columns
+    and each value is an index into a table of interned values. Token
+    objects are only built on access, one at a time.
+    
+    Compilers with their own Token class and TokenType enum subclass it and
+    override TOKEN_CLASS and TYPES_BY_CODE.
+    """
+    
+    TOKEN_CLASS = Token
+    TYPES_BY_CODE = {token_type.value: token_type for token_type in TokenType}
+    
+    def __init__(self):
+        self.types = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.value_ids = array('i')
+        self.values = []  # Interned value table
+        self.value_index = {}  # (value class, value) -> position in self.values
+    
+    @classmethod
+    def from_tokens(cls, tokens):
+        """Build a buffer from any token iterable, e.g. Lexer.iter_tokens()"""
+        buffer = cls()
+        for token in tokens:
+            buffer.append(token.type, token.value, token.line, token.column)
+        return buffer
+    
+    def intern_value(self, value):
+        """Return the value-table index for value, adding it if new"""
+        key = (value.__class__, value)  # Keeps 1, 1.0 and True apart
+        value_id = self.value_index.get(key)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self.value_index[key] = value_id
+        return value_id
+    
+    def append(self, token_type, value, line, column):
+        """Store one token given its fields"""
+        self.types.append(token_type.value)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.value_ids.append(self.intern_value(value))
+    
+    def type_at(self, index):
+        return self.TYPES_BY_CODE[self.types[index]]
+    
+    def value_at(self, index):
+        return self.values[self.value_ids[index]]
+    
+    def __len__(self):
+        return len(self.types)
+    
+    def __getitem__(self, index):
+        """Materialize the token at index"""
+        return self.TOKEN_CLASS(self.type_at(index), self.value_at(index), self.lines[index], self.columns[index])
+    
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self[index]
+
+
+class TokenStream:
+    """Bounded lookahead buffer over a token list or a lazy token iterator"""
+    
+    def __init__(self, tokens, lookahead=2):
+        self.iterator = iter(tokens)
+        self.buffer = deque()
+        self.lookahead = lookahead  # Current token plus lookahead - 1 more
+    
+    def peek(self, offset=0):
+        """Return the token offset positions ahead, or None past the end"""
+        if offset >= self.lookahead:
+            raise ValueError(f"Lookahead {offset} exceeds buffer size {self.lookahead}")
+        while len(self.buffer) <= offset:
+            token = next(self.iterator, None)
+            if token is None:
+                return None
+            self.buffer.append(token)
+        return self.buffer[offset]
+    
+    def type_at(self, offset=0):
+        token = self.peek(offset)
+        return token.type if token is not None else None
+    
+    def value_at(self, offset=0):
+        return self.peek(offset).value
+    
+    def line_at(self, offset=0):
+        return self.peek(offset).line
+    
+    def advance(self):
+        """Drop the current token; the last one (EOF) is never dropped"""
+        if self.peek(1) is None:
+            return False
+        self.buffer.popleft()
+        return True
+
+
+class BufferCursor:
+    """
+    Index cursor over a TokenBuffer with the TokenStream interface: types,
+    values and lines are read straight from the columns, and a Token is only
+    built when peek() asks for one
+    """
+    
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.index = 0
+    
+    def peek(self, offset=0):
+        index = self.index + offset
+        return self.buffer[index] if index < len(self.buffer) else None
+    
+    def type_at(self, offset=0):
+        index = self.index + offset
+        return self.buffer.type_at(index) if index < len(self.buffer) else None
+    
+    def value_at(self, offset=0):
+        return self.buffer.value_at(self.index + offset)
+    
+    def line_at(self, offset=0):
+        return self.buffer.lines[self.index + offset]
+    
+    def advance(self):
+        """Move to the next token; the last one (EOF) is never passed"""
+        if self.index + 1 >= len(self.buffer):
+            return False
+        self.index += 1
+        return True
+
+
+def token_cursor(tokens):
+    """BufferCursor for a TokenBuffer, TokenStream for a token list or iterator"""
+    return BufferCursor(tokens) if isinstance(tokens, TokenBuffer) else TokenStream(tokens)
+
+
 # Keywords mapping
 KEYWORDS = {
     'print': TokenType.PRINT,
@@ -3,8 +3,12 @@ Lexical Analyzer Module
 Performs tokenization of MiniLang source code
 """
 
+import codecs
+import io
+import mmap
 import re
-from token_types import Token, TokenType, KEYWORDS
+import sys
+from token_types import Token, TokenBuffer, TokenType, KEYWORDS
 
 
 class LexerError(Exception):
@@ -12,16 +16,79 @@ class LexerError(Exception):
     pass
 
 
+# Master pattern for the regex engine: one alternative per lexeme class.
+# Comments come before operators so that '//' is not read as two DIVIDEs.
+MASTER_PATTERN = re.compile(r"""
+    (?P<NUMBER>\d[\d.]*)
+  | (?P<STRING>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<NAME>[^\W\d]\w*)
+  | (?P<COMMENT>(?:\#|//)[^\n]*)
+  | (?P<OP>==|!=|<=|>=|[-+*/=<>():,;])
+  | (?P<NEWLINE>\n)
+  | (?P<SKIP>[ \t]+)
+""", re.VERBOSE | re.DOTALL)
+
+INDENT_PATTERN = re.compile(r'[ \t]*')
+ESCAPE_PATTERN = re.compile(r'\\(.)', re.DOTALL)
+ESCAPE_MAP = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', '"': '"', "'": "'"}
+
+OPERATORS = {
+    '==': TokenType.EQUAL,
+    '!=': TokenType.NOT_EQUAL,
+    '<=': TokenType.LESS_EQUAL,
+    '>=': TokenType.GREATER_EQUAL,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    '=': TokenType.ASSIGN,
+    '<': TokenType.LESS,
+    '>': TokenType.GREATER,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    ':': TokenType.COLON,
+    ',': TokenType.COMMA,
+    ';': TokenType.SEMICOLON,
+}
+
+
+class SymbolTable:
+    """
+    Identifiers of one compilation: classifies each name and interns it
+    (sys.intern), so equal names are the same object in every later phase
+    """
+    
+    def __init__(self):
+        # text -> (token type, interned text); seeded with the keywords
+        self.entries = {word: (token_type, sys.intern(word)) for word, token_type in KEYWORDS.items()}
+    
+    def lookup(self, text):
+        """Classify and intern an identifier with a single dict probe"""
+        entry = self.entries.get(text)
+        if entry is None:
+            text = sys.intern(text)
+            entry = self.entries[text] = (TokenType.IDENTIFIER, text)
+        return entry
+
+
 class Lexer:
     """Lexical analyzer for MiniLang"""
     
-    def __init__(self, source_code):
+    ENGINES = ('char', 'regex')
+    
+    def __init__(self, source_code, engine='char', symbols=None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown lexer engine: {engine}")
         self.source = source_code
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.engine = engine  # 'char' (one character per step) or 'regex' (master pattern)
         self.position = 0
         self.line = 1
         self.column = 1
         self.tokens = []
         self.indent_stack = [0]  # Track indentation levels
+        self.at_line_start = True
+        self.final = True  # False while lexing a chunk that more input will follow
         
     def error(self, message):
         """Raise a lexer error with position information"""
@@ -104,13 +171,16 @@ class Lexer:
         """Read an identifier or keyword"""
         start_line = self.line
         start_column = self.column
-        identifier = ''
+        source = self.source
+        start = end = self.position
         
-        while self.peek() and (self.peek().isalnum() or self.peek() == '_'):
-            identifier += self.advance()
+        # Slice the name out of the source instead of growing it one character at a time
+        while end < len(source) and (source[end].isalnum() or source[end] == '_'):
+            end += 1
+        self.position = end
+        self.column += end - start
         
-        # Check if it's a keyword
-        token_type = KEYWORDS.get(identifier, TokenType.IDENTIFIER)
+        token_type, identifier = self.symbols.lookup(source[start:end])
         return Token(token_type, identifier, start_line, start_column)
     
     def handle_indentation(self, indent_level):
@@ -134,7 +204,32 @@ class Lexer:
     def tokenize(self):
         """Main tokenization method - converts source code to tokens"""
         self.tokens = []
-        at_line_start = True
+        self.tokens.extend(self.iter_tokens())
+        return self.tokens
+    
+    def tokenize_buffer(self):
+        """Tokenize into a columnar TokenBuffer instead of a list of Token objects"""
+        return TokenBuffer.from_tokens(self.iter_tokens())
+    
+    def iter_tokens(self):
+        """
+        Streaming tokenization - yields tokens lazily, INDENT/DEDENT included
+        
+        Nothing is stored in self.tokens, so a Parser fed with this iterator
+        keeps only its lookahead window in memory.
+        """
+        if self.engine == 'regex':
+            return self.iter_tokens_regex()
+        return self.iter_tokens_char()
+    
+    def string_in_chunk(self):
+        """Check that the string literal at the cursor is closed before the chunk ends"""
+        match = MASTER_PATTERN.match(self.source, self.position)
+        return match is not None and match.lastgroup == 'STRING'
+    
+    def iter_tokens_char(self):
+        """Character engine - advances one character per step"""
+        at_line_start = self.at_line_start
         
         while self.position < len(self.source):
             # Handle indentation at the start of lines
@@ -156,8 +251,7 @@ class Lexer:
                     continue
                 
                 # Generate indent/dedent tokens
-                indent_tokens = self.handle_indentation(indent_level)
-                self.tokens.extend(indent_tokens)
+                yield from self.handle_indentation(indent_level)
                 at_line_start = False
             
             self.skip_whitespace()
@@ -177,99 +271,279 @@ class Lexer:
             # Newline
             elif char == '\n':
                 self.advance()
-                self.tokens.append(Token(TokenType.NEWLINE, '\\n', start_line, start_column))
+                yield Token(TokenType.NEWLINE, '\\n', start_line, start_column)
                 at_line_start = True
             
             # Numbers
             elif char.isdigit():
-                self.tokens.append(self.read_number())
+                yield self.read_number()
             
             # Strings
             elif char in '"\'':
-                self.tokens.append(self.read_string())
+                if not self.final and not self.string_in_chunk():
+                    break  # The literal continues in the next chunk
+                yield self.read_string()
             
             # Identifiers and keywords
             elif char.isalpha() or char == '_':
-                self.tokens.append(self.read_identifier())
+                yield self.read_identifier()
             
             # Two-character operators
             elif char == '=' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.EQUAL, '==', start_line, start_column))
+                yield Token(TokenType.EQUAL, '==', start_line, start_column)
             
             elif char == '!' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.NOT_EQUAL, '!=', start_line, start_column))
+                yield Token(TokenType.NOT_EQUAL, '!=', start_line, start_column)
             
             elif char == '<' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.LESS_EQUAL, '<=', start_line, start_column))
+                yield Token(TokenType.LESS_EQUAL, '<=', start_line, start_column)
             
             elif char == '>' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.GREATER_EQUAL, '>=', start_line, start_column))
+                yield Token(TokenType.GREATER_EQUAL, '>=', start_line, start_column)
             
             # Single-character operators and delimiters
             elif char == '+':
                 self.advance()
-                self.tokens.append(Token(TokenType.PLUS, '+', start_line, start_column))
+                yield Token(TokenType.PLUS, '+', start_line, start_column)
             
             elif char == '-':
                 self.advance()
-                self.tokens.append(Token(TokenType.MINUS, '-', start_line, start_column))
+                yield Token(TokenType.MINUS, '-', start_line, start_column)
             
             elif char == '*':
                 self.advance()
-                self.tokens.append(Token(TokenType.MULTIPLY, '*', start_line, start_column))
+                yield Token(TokenType.MULTIPLY, '*', start_line, start_column)
             
             elif char == '/':
                 self.advance()
-                self.tokens.append(Token(TokenType.DIVIDE, '/', start_line, start_column))
+                yield Token(TokenType.DIVIDE, '/', start_line, start_column)
             
             elif char == '=':
                 self.advance()
-                self.tokens.append(Token(TokenType.ASSIGN, '=', start_line, start_column))
+                yield Token(TokenType.ASSIGN, '=', start_line, start_column)
             
             elif char == '<':
                 self.advance()
-                self.tokens.append(Token(TokenType.LESS, '<', start_line, start_column))
+                yield Token(TokenType.LESS, '<', start_line, start_column)
             
             elif char == '>':
                 self.advance()
-                self.tokens.append(Token(TokenType.GREATER, '>', start_line, start_column))
+                yield Token(TokenType.GREATER, '>', start_line, start_column)
             
             elif char == '(':
                 self.advance()
-                self.tokens.append(Token(TokenType.LPAREN, '(', start_line, start_column))
+                yield Token(TokenType.LPAREN, '(', start_line, start_column)
             
             elif char == ')':
                 self.advance()
-                self.tokens.append(Token(TokenType.RPAREN, ')', start_line, start_column))
+                yield Token(TokenType.RPAREN, ')', start_line, start_column)
             
             elif char == ':':
                 self.advance()
-                self.tokens.append(Token(TokenType.COLON, ':', start_line, start_column))
+                yield Token(TokenType.COLON, ':', start_line, start_column)
             
             elif char == ',':
                 self.advance()
-                self.tokens.append(Token(TokenType.COMMA, ',', start_line, start_column))
+                yield Token(TokenType.COMMA, ',', start_line, start_column)
             
             elif char == ';':
                 self.advance()
-                self.tokens.append(Token(TokenType.SEMICOLON, ';', start_line, start_column))
+                yield Token(TokenType.SEMICOLON, ';', start_line, start_column)
             
             else:
                 self.error(f"Unexpected character: '{char}'")
         
+        self.at_line_start = at_line_start
+        if not self.final:
+            return
+        
         # Add remaining DEDENT tokens
         while len(self.indent_stack) > 1:
             self.indent_stack.pop()
-            self.tokens.append(Token(TokenType.DEDENT, 0, self.line, self.column))
+            yield Token(TokenType.DEDENT, 0, self.line, self.column)
         
         # Add EOF token
-        self.tokens.append(Token(TokenType.EOF, None, self.line, self.column))
-        return self.tokens
+        yield Token(TokenType.EOF, None, self.line, self.column)
+    
+    def sync_position(self, position, line, line_start):
+        """Move the character cursor to an offset computed by the regex engine"""
+        self.position = position
+        self.line = line
+        self.column = position - line_start + 1
+    
+    def iter_tokens_regex(self):
+        """
+        Regex engine - matches whole lexemes with MASTER_PATTERN
+        
+        Produces the same token stream as the character engine. Line and column
+        are derived from the offset of the last newline instead of being
+        updated on every character. On malformed input the cursor is moved to
+        the offending lexeme and the character engine reports the error, so
+        messages and positions are identical too.
+        """
+        source = self.source
+        length = len(source)
+        master_match = MASTER_PATTERN.match
+        indent_match = INDENT_PATTERN.match
+        lookup = self.symbols.lookup
+        
+        position = self.position
+        line = self.line
+        line_start = position - self.column + 1  # Offset of the first character of the current line
+        at_line_start = self.at_line_start
+        
+        while position < length:
+            if at_line_start:
+                indent_end = indent_match(source, position).end()
+                indent = source[position:indent_end]
+                position = indent_end
+                if position >= length:
+                    break
+                
+                # Skip empty lines and comments
+                char = source[position]
+                if char == '\n':
+                    position += 1
+                    line += 1
+                    line_start = position
+                    continue
+                if char == '#' or source.startswith('//', position):
+                    newline = source.find('\n', position)
+                    position = length if newline < 0 else newline
+                    continue
+                
+                indent_level = len(indent) + 3 * indent.count('\t')  # Tab = 4 spaces
+                if indent_level != self.indent_stack[-1]:
+                    self.sync_position(position, line, line_start)
+                    yield from self.handle_indentation(indent_level)
+                at_line_start = False
+            
+            match = master_match(source, position)
+            if match is None:
+                self.sync_position(position, line, line_start)
+                if not self.final and source[position] in '"\'':
+                    self.at_line_start = at_line_start
+                    return  # The literal continues in the next chunk
+                if source[position] in '"\'':
+                    self.read_string()  # Unterminated string: raises the same error
+                self.error(f"Unexpected character: '{source[position]}'")
+            
+            kind = match.lastgroup
+            text = match.group()
+            column = position - line_start + 1
+            end = match.end()
+            
+            if kind == 'NAME':
+                if text[0] >= '\x80' and not text[0].isalpha():
+                    self.sync_position(position, line, line_start)
+                    if not text[0].isdigit():
+                        # Numeric characters that are not digits, such as '½'
+                        self.error(f"Unexpected character: '{text[0]}'")
+                    # Digits outside \d such as '²' start a number
+                    yield self.read_number()
+                    position = self.position
+                    continue
+                token_type, name = lookup(text)
+                yield Token(token_type, name, line, column)
+            elif kind == 'OP':
+                yield Token(OPERATORS[text], text, line, column)
+            elif kind == 'NUMBER':
+                try:
+                    if end < length and source[end] >= '\x80':
+                        raise ValueError  # e.g. '12²': let the character engine read it
+                    value = float(text) if '.' in text else int(text)
+                except ValueError:
+                    self.sync_position(position, line, line_start)
+                    yield self.read_number()  # Raises the same error as the char engine
+                    position = self.position
+                    continue
+                yield Token(TokenType.NUMBER, value, line, column)
+            elif kind == 'NEWLINE':
+                yield Token(TokenType.NEWLINE, '\\n', line, column)
+                line += 1
+                line_start = end
+                at_line_start = True
+            elif kind == 'STRING':
+                value = text[1:-1]
+                if '\\' in value:
+                    value = ESCAPE_PATTERN.sub(lambda m: ESCAPE_MAP.get(m.group(1), m.group(1)), value)
+                yield Token(TokenType.STRING, value, line, column)
+                newlines = text.count('\n')
+                if newlines:
+                    line += newlines
+                    line_start = position + text.rfind('\n') + 1
+            # SKIP and COMMENT produce no tokens
+            
+            position = end
+        
+        self.sync_position(position, line, line_start)
+        self.at_line_start = at_line_start
+        if not self.final:
+            return
+        
+        # Add remaining DEDENT tokens
+        while len(self.indent_stack) > 1:
+            self.indent_stack.pop()
+            yield Token(TokenType.DEDENT, 0, self.line, self.column)
+        
+        # Add EOF token
+        yield Token(TokenType.EOF, None, self.line, self.column)
+
+
+def read_file_chunks(path, chunk_size, use_mmap=True):
+    """Yield the raw bytes of a file in chunks, through mmap when possible"""
+    with open(path, 'rb') as file:
+        if use_mmap:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty files cannot be mapped
+                mapped = None
+            if mapped is not None:
+                with mapped:
+                    for offset in range(0, len(mapped), chunk_size):
+                        yield mapped[offset:offset + chunk_size]
+                return
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                return
+            yield data
+
+
+def iter_file_tokens(path, engine='char', chunk_size=1 << 20, use_mmap=True):
+    """
+    Tokenize a file chunk by chunk - yields the same tokens as Lexer(source).iter_tokens()
+    
+    The bytes are decoded incrementally (UTF-8, universal newlines like
+    open()), so neither the whole file nor its decoded text is held in memory.
+    Each chunk is cut after its last newline; a string literal still open at
+    the cut is carried over and lexed again with the next chunk.
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    lexer = Lexer('', engine)
+    lexer.final = False
+    pending = ''
+    
+    for data in read_file_chunks(path, chunk_size, use_mmap):
+        text = pending + decoder.decode(data)
+        cut = text.rfind('\n') + 1
+        if not cut:
+            pending = text
+            continue
+        lexer.source = text[:cut]
+        lexer.position = 0
+        yield from lexer.iter_tokens()
+        pending = lexer.source[lexer.position:] + text[cut:]
+    
+    lexer.source = pending + decoder.decode(b'', final=True)
+    lexer.position = 0
+    lexer.final = True
+    yield from lexer.iter_tokens()
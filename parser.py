@@ -3,7 +3,7 @@ Syntax Analyzer (Parser) Module
 Performs syntax analysis and builds Abstract Syntax Tree (AST)
 """
 
-from token_types import TokenType
+from token_types import TokenType, token_cursor
 from ast_nodes import *
 
 
@@ -16,46 +16,65 @@ class Parser:
     """Recursive descent parser for MiniLang"""
     
     def __init__(self, tokens):
+        """
+        Accepts a token list, an iterator such as Lexer.iter_tokens() or a
+        TokenBuffer. Over a buffer the parser reads types, values and lines
+        from its columns and only builds a Token for error messages
+        """
         self.tokens = tokens
+        self.stream = token_cursor(tokens)
         self.position = 0
-        self.current_token = self.tokens[0] if tokens else None
+        self.current_type = self.stream.type_at()
+    
+    @property
+    def current_token(self):
+        return self.stream.peek()
+    
+    @property
+    def current_value(self):
+        return self.stream.value_at()
+    
+    @property
+    def current_line(self):
+        return self.stream.line_at()
     
     def error(self, message):
         """Raise a parser error with current token information"""
-        if self.current_token:
+        token = self.current_token
+        if token:
             raise ParserError(
-                f"Parser Error at line {self.current_token.line}, "
-                f"column {self.current_token.column}: {message}\n"
-                f"Current token: {self.current_token}"
+                f"Parser Error at line {token.line}, "
+                f"column {token.column}: {message}\n"
+                f"Current token: {token}"
             )
         else:
             raise ParserError(f"Parser Error: {message}")
     
     def peek(self, offset=0):
         """Look ahead at token without consuming it"""
-        pos = self.position + offset
-        if pos < len(self.tokens):
-            return self.tokens[pos]
-        return None
+        return self.stream.peek(offset)
+    
+    def peek_type(self, offset=0):
+        """Type of the token offset positions ahead, or None past the end"""
+        return self.stream.type_at(offset)
     
     def advance(self):
         """Move to next token"""
-        if self.position < len(self.tokens) - 1:
+        if self.stream.advance():
             self.position += 1
-            self.current_token = self.tokens[self.position]
-        return self.current_token
+            self.current_type = self.stream.type_at()
     
     def expect(self, token_type):
-        """Consume token of expected type or raise error"""
-        if self.current_token.type != token_type:
-            self.error(f"Expected {token_type.name}, got {self.current_token.type.name}")
-        token = self.current_token
+        """Consume token of expected type and return its value, or raise error"""
+        if self.current_type != token_type:
+            self.error(f"Expected {token_type.name}, got {self.current_type.name}")
+        value = self.current_value
         self.advance()
-        return token
+        return value
     
     def skip_newlines(self):
         """Skip any newline tokens"""
-        while self.current_token and self.current_token.type == TokenType.NEWLINE:
+        while self.current_type == TokenType.NEWLINE:
             self.advance()
     
     def parse(self):
@@ -70,7 +89,7 @@ class Parser:
         statements = []
         self.skip_newlines()
         
-        while self.current_token.type != TokenType.EOF:
+        while self.current_type != TokenType.EOF:
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
@@ -85,12 +104,12 @@ class Parser:
         """
         self.skip_newlines()
         
-        token_type = self.current_token.type
+        token_type = self.current_type
         
         # Assignment or expression statement
         if token_type == TokenType.IDENTIFIER:
             # Look ahead to determine if it's an assignment
-            if self.peek(1) and self.peek(1).type == TokenType.ASSIGN:
+            if self.peek_type(1) == TokenType.ASSIGN:
                 return self.parse_assignment()
             else:
                 # Just an expression (shouldn't happen in well-formed programs)
@@ -127,8 +146,8 @@ class Parser:
         asignacion → ID = expresion
         Semantic Action: Create AssignmentNode with identifier and expression
         """
-        line = self.current_token.line
-        identifier = self.expect(TokenType.IDENTIFIER).value
+        line = self.current_line
+        identifier = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.ASSIGN)
         expression = self.parse_expression()
         
@@ -139,7 +158,7 @@ class Parser:
         print_statement → print(expresion)
         Semantic Action: Create PrintNode with expression to print
         """
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.PRINT)
         self.expect(TokenType.LPAREN)
         expression = self.parse_expression()
@@ -152,7 +171,7 @@ class Parser:
         condicional → if expresion : bloque (elif expresion : bloque)* (else : bloque)?
         Semantic Action: Create IfNode with condition, then block, elif parts, and else block
         """
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.IF)
         condition = self.parse_expression()
         self.expect(TokenType.COLON)
@@ -163,7 +182,7 @@ class Parser:
         
         # Parse elif parts
         elif_parts = []
-        while self.current_token.type == TokenType.ELIF:
+        while self.current_type == TokenType.ELIF:
             self.advance()
             elif_condition = self.parse_expression()
             self.expect(TokenType.COLON)
@@ -173,7 +192,7 @@ class Parser:
         
         # Parse else block
         else_block = None
-        if self.current_token.type == TokenType.ELSE:
+        if self.current_type == TokenType.ELSE:
             self.advance()
             self.expect(TokenType.COLON)
             self.skip_newlines()
@@ -186,7 +205,7 @@ class Parser:
         bucle_while → while expresion : bloque
         Semantic Action: Create WhileNode with condition and block
         """
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.WHILE)
         condition = self.parse_expression()
         self.expect(TokenType.COLON)
@@ -200,9 +219,9 @@ class Parser:
         bucle_for → for ID in range(expresion) : bloque
         Semantic Action: Create ForNode with iterator variable, range expression, and block
         """
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.FOR)
-        identifier = self.expect(TokenType.IDENTIFIER).value
+        identifier = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.IN)
         self.expect(TokenType.RANGE)
         self.expect(TokenType.LPAREN)
@@ -222,20 +241,20 @@ class Parser:
         statements = []
         
         # Expect INDENT
-        if self.current_token.type != TokenType.INDENT:
+        if self.current_type != TokenType.INDENT:
             self.error("Expected indented block")
         self.advance()
         self.skip_newlines()
         
         # Parse statements until DEDENT
-        while self.current_token.type not in (TokenType.DEDENT, TokenType.EOF):
+        while self.current_type not in (TokenType.DEDENT, TokenType.EOF):
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
             self.skip_newlines()
         
         # Consume DEDENT
-        if self.current_token.type == TokenType.DEDENT:
+        if self.current_type == TokenType.DEDENT:
             self.advance()
         
         return BlockNode(statements)
@@ -260,9 +279,9 @@ class Parser:
             TokenType.LESS_EQUAL, TokenType.GREATER_EQUAL
         }
         
-        if self.current_token.type in comparison_ops:
-            operator = self.current_token.value
-            line = self.current_token.line
+        if self.current_type in comparison_ops:
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_arithmetic()
             return BinaryOpNode(left, operator, right, line)
@@ -276,9 +295,9 @@ class Parser:
         """
         left = self.parse_term()
         
-        while self.current_token.type in (TokenType.PLUS, TokenType.MINUS):
-            operator = self.current_token.value
-            line = self.current_token.line
+        while self.current_type in (TokenType.PLUS, TokenType.MINUS):
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_term()
             left = BinaryOpNode(left, operator, right, line)
@@ -292,9 +311,9 @@ class Parser:
         """
         left = self.parse_factor()
         
-        while self.current_token.type in (TokenType.MULTIPLY, TokenType.DIVIDE):
-            operator = self.current_token.value
-            line = self.current_token.line
+        while self.current_type in (TokenType.MULTIPLY, TokenType.DIVIDE):
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_factor()
             left = BinaryOpNode(left, operator, right, line)
@@ -306,35 +325,39 @@ class Parser:
         factor → NUMBER | STRING | ID | (expresion) | -factor
         Semantic Action: Create appropriate leaf node or handle parenthesized expression
         """
-        token = self.current_token
+        token_type = self.current_type
+        line = self.current_line
         
         # Number literal
-        if token.type == TokenType.NUMBER:
+        if token_type == TokenType.NUMBER:
+            value = self.current_value
             self.advance()
-            return NumberNode(token.value, token.line)
+            return NumberNode(value, line)
         
         # String literal
-        elif token.type == TokenType.STRING:
+        elif token_type == TokenType.STRING:
+            value = self.current_value
             self.advance()
-            return StringNode(token.value, token.line)
+            return StringNode(value, line)
         
         # Identifier
-        elif token.type == TokenType.IDENTIFIER:
+        elif token_type == TokenType.IDENTIFIER:
+            value = self.current_value
             self.advance()
-            return IdentifierNode(token.value, token.line)
+            return IdentifierNode(value, line)
         
         # Parenthesized expression
-        elif token.type == TokenType.LPAREN:
+        elif token_type == TokenType.LPAREN:
             self.advance()
             expr = self.parse_expression()
             self.expect(TokenType.RPAREN)
             return expr
         
         # Unary minus
-        elif token.type == TokenType.MINUS:
+        elif token_type == TokenType.MINUS:
             self.advance()
             operand = self.parse_factor()
-            return UnaryOpNode('-', operand, token.line)
+            return UnaryOpNode('-', operand, line)
         
         else:
-            self.error(f"Unexpected token in expression: {token}")
+            self.error(f"Unexpected token in expression: {self.current_token}")
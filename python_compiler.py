@@ -9,6 +9,8 @@ from enum import Enum, auto
 from dataclasses import dataclass
 from typing import List, Optional, Any, Dict
 
+from token_types import TokenBuffer as ColumnarTokenBuffer, token_cursor
+
 
 # ============= ANÁLISIS LÉXICO =============
 
@@ -79,6 +81,8 @@ class TokenType(Enum):
 @dataclass
 class Token:
     """Representa un token con su tipo, valor y posición"""
+    __slots__ = ('type', 'value', 'line', 'column')  # Sin __dict__ por instancia
+    
     type: TokenType
     value: Any
     line: int
@@ -88,6 +92,13 @@ class Token:
         return f"Token({self.type.name}, {self.value}, {self.line}:{self.column})"
 
 
+class TokenBuffer(ColumnarTokenBuffer):
+    """TokenBuffer de token_types con los Token y TokenType de este compilador"""
+    
+    TOKEN_CLASS = Token
+    TYPES_BY_CODE = {token_type.value: token_type for token_type in TokenType}
+
+
 KEYWORDS = {
     'def': TokenType.DEF,
     'return': TokenType.RETURN,
@@ -206,6 +217,15 @@ class Lexer:
     
     def tokenize(self):
         self.tokens = []
+        self.tokens.extend(self.iter_tokens())
+        return self.tokens
+    
+    def tokenize_buffer(self):
+        """Tokeniza hacia un TokenBuffer columnar en lugar de una lista de objetos Token"""
+        return TokenBuffer.from_tokens(self.iter_tokens())
+    
+    def iter_tokens(self):
+        """Genera los tokens de forma perezosa (incluye INDENT/DEDENT) sin guardarlos en self.tokens"""
         at_line_start = True
         
         while self.position < len(self.source):
@@ -222,7 +242,7 @@ class Lexer:
                         self.skip_comment()
                     continue
                 
-                self.tokens.extend(self.handle_indentation(indent_level))
+                yield from self.handle_indentation(indent_level)
                 at_line_start = False
             
             self.skip_whitespace()
@@ -236,88 +256,87 @@ class Lexer:
                 self.skip_comment()
             elif char == '\n':
                 self.advance()
-                self.tokens.append(Token(TokenType.NEWLINE, '\\n', start_line, start_column))
+                yield Token(TokenType.NEWLINE, '\\n', start_line, start_column)
                 at_line_start = True
             elif char.isdigit():
-                self.tokens.append(self.read_number())
+                yield self.read_number()
             elif char in '"\'':
-                self.tokens.append(self.read_string())
+                yield self.read_string()
             elif char.isalpha() or char == '_':
-                self.tokens.append(self.read_identifier())
+                yield self.read_identifier()
             elif char == '*' and self.peek(1) == '*':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.POWER, '**', start_line, start_column))
+                yield Token(TokenType.POWER, '**', start_line, start_column)
             elif char == '=' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.EQUAL, '==', start_line, start_column))
+                yield Token(TokenType.EQUAL, '==', start_line, start_column)
             elif char == '!' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.NOT_EQUAL, '!=', start_line, start_column))
+                yield Token(TokenType.NOT_EQUAL, '!=', start_line, start_column)
             elif char == '<' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.LESS_EQUAL, '<=', start_line, start_column))
+                yield Token(TokenType.LESS_EQUAL, '<=', start_line, start_column)
             elif char == '>' and self.peek(1) == '=':
                 self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.GREATER_EQUAL, '>=', start_line, start_column))
+                yield Token(TokenType.GREATER_EQUAL, '>=', start_line, start_column)
             elif char == '+':
                 self.advance()
-                self.tokens.append(Token(TokenType.PLUS, '+', start_line, start_column))
+                yield Token(TokenType.PLUS, '+', start_line, start_column)
             elif char == '-':
                 self.advance()
-                self.tokens.append(Token(TokenType.MINUS, '-', start_line, start_column))
+                yield Token(TokenType.MINUS, '-', start_line, start_column)
             elif char == '*':
                 self.advance()
-                self.tokens.append(Token(TokenType.MULTIPLY, '*', start_line, start_column))
+                yield Token(TokenType.MULTIPLY, '*', start_line, start_column)
             elif char == '/':
                 self.advance()
-                self.tokens.append(Token(TokenType.DIVIDE, '/', start_line, start_column))
+                yield Token(TokenType.DIVIDE, '/', start_line, start_column)
             elif char == '%':
                 self.advance()
-                self.tokens.append(Token(TokenType.MODULO, '%', start_line, start_column))
+                yield Token(TokenType.MODULO, '%', start_line, start_column)
             elif char == '=':
                 self.advance()
-                self.tokens.append(Token(TokenType.ASSIGN, '=', start_line, start_column))
+                yield Token(TokenType.ASSIGN, '=', start_line, start_column)
             elif char == '<':
                 self.advance()
-                self.tokens.append(Token(TokenType.LESS, '<', start_line, start_column))
+                yield Token(TokenType.LESS, '<', start_line, start_column)
             elif char == '>':
                 self.advance()
-                self.tokens.append(Token(TokenType.GREATER, '>', start_line, start_column))
+                yield Token(TokenType.GREATER, '>', start_line, start_column)
             elif char == '(':
                 self.advance()
-                self.tokens.append(Token(TokenType.LPAREN, '(', start_line, start_column))
+                yield Token(TokenType.LPAREN, '(', start_line, start_column)
             elif char == ')':
                 self.advance()
-                self.tokens.append(Token(TokenType.RPAREN, ')', start_line, start_column))
+                yield Token(TokenType.RPAREN, ')', start_line, start_column)
             elif char == '[':
                 self.advance()
-                self.tokens.append(Token(TokenType.LBRACKET, '[', start_line, start_column))
+                yield Token(TokenType.LBRACKET, '[', start_line, start_column)
             elif char == ']':
                 self.advance()
-                self.tokens.append(Token(TokenType.RBRACKET, ']', start_line, start_column))
+                yield Token(TokenType.RBRACKET, ']', start_line, start_column)
             elif char == ':':
                 self.advance()
-                self.tokens.append(Token(TokenType.COLON, ':', start_line, start_column))
+                yield Token(TokenType.COLON, ':', start_line, start_column)
             elif char == ',':
                 self.advance()
-                self.tokens.append(Token(TokenType.COMMA, ',', start_line, start_column))
+                yield Token(TokenType.COMMA, ',', start_line, start_column)
             elif char == '.':
                 self.advance()
-                self.tokens.append(Token(TokenType.DOT, '.', start_line, start_column))
+                yield Token(TokenType.DOT, '.', start_line, start_column)
             else:
                 self.error(f"Carácter inesperado: '{char}'")
         
         while len(self.indent_stack) > 1:
             self.indent_stack.pop()
-            self.tokens.append(Token(TokenType.DEDENT, 0, self.line, self.column))
+            yield Token(TokenType.DEDENT, 0, self.line, self.column)
         
-        self.tokens.append(Token(TokenType.EOF, None, self.line, self.column))
-        return self.tokens
+        yield Token(TokenType.EOF, None, self.line, self.column)
 
 
 # ============= NODOS AST =============
@@ -422,30 +441,55 @@ class Parser:
     """Analizador Sintáctico"""
     
     def __init__(self, tokens):
+        """
+        Acepta una lista de tokens, un iterador como Lexer.iter_tokens() o un
+        TokenBuffer. Sobre un buffer lee tipos, valores y líneas de sus
+        columnas y solo arma un Token para los mensajes de error
+        """
         self.tokens = tokens
+        self.stream = token_cursor(tokens)
         self.position = 0
-        self.current_token = tokens[0] if tokens else None
+        self.current_type = self.stream.type_at()
+    
+    @property
+    def current_token(self):
+        return self.stream.peek()
+    
+    @property
+    def current_value(self):
+        return self.stream.value_at()
+    
+    @property
+    def current_line(self):
+        return self.stream.line_at()
     
     def error(self, message):
-        if self.current_token:
-            raise ParserError(f"Error Sintáctico en línea {self.current_token.line}: {message}")
+        if self.current_type is not None:
+            raise ParserError(f"Error Sintáctico en línea {self.current_line}: {message}")
         raise ParserError(f"Error Sintáctico: {message}")
     
+    def peek(self, offset=0):
+        return self.stream.peek(offset)
+    
+    def peek_type(self, offset=0):
+        """Tipo del token a 'offset' posiciones del actual, o None si no hay más"""
+        return self.stream.type_at(offset)
+    
     def advance(self):
-        if self.position < len(self.tokens) - 1:
+        if self.stream.advance():
             self.position += 1
-            self.current_token = self.tokens[self.position]
-        return self.current_token
+            self.current_type = self.stream.type_at()
     
     def expect(self, token_type):
-        if self.current_token.type != token_type:
-            self.error(f"Se esperaba {token_type.name}, se encontró {self.current_token.type.name}")
-        token = self.current_token
+        """Consume un token del tipo esperado y retorna su valor"""
+        if self.current_type != token_type:
+            self.error(f"Se esperaba {token_type.name}, se encontró {self.current_type.name}")
+        value = self.current_value
         self.advance()
-        return token
+        return value
     
     def skip_newlines(self):
-        while self.current_token and self.current_token.type == TokenType.NEWLINE:
+        while self.current_type == TokenType.NEWLINE:
             self.advance()
     
     def parse(self):
@@ -454,7 +498,7 @@ class Parser:
     def parse_program(self):
         statements = []
         self.skip_newlines()
-        while self.current_token.type != TokenType.EOF:
+        while self.current_type != TokenType.EOF:
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
@@ -463,13 +507,13 @@ class Parser:
     
     def parse_statement(self):
         self.skip_newlines()
-        token_type = self.current_token.type
+        token_type = self.current_type
         
         if token_type == TokenType.IDENTIFIER:
-            next_token = self.tokens[self.position + 1] if self.position + 1 < len(self.tokens) else None
-            if next_token and next_token.type == TokenType.ASSIGN:
+            next_type = self.peek_type(1)
+            if next_type == TokenType.ASSIGN:
                 return self.parse_assignment()
-            elif next_token and next_token.type == TokenType.LBRACKET:
+            elif next_type == TokenType.LBRACKET:
                 return self.parse_list_assignment()
             else:
                 expr = self.parse_expression()
@@ -487,15 +531,15 @@ class Parser:
             self.error(f"Token inesperado: {self.current_token}")
     
     def parse_assignment(self):
-        line = self.current_token.line
-        identifier = self.expect(TokenType.IDENTIFIER).value
+        line = self.current_line
+        identifier = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.ASSIGN)
         expression = self.parse_expression()
         return AssignmentNode(identifier, expression, line)
     
     def parse_list_assignment(self):
-        line = self.current_token.line
-        identifier = self.expect(TokenType.IDENTIFIER).value
+        line = self.current_line
+        identifier = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.LBRACKET)
         index_expr = self.parse_expression()
         self.expect(TokenType.RBRACKET)
@@ -504,7 +548,7 @@ class Parser:
         return AssignmentNode(f"{identifier}[INDEX]", value_expr, line)
     
     def parse_print(self):
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.PRINT)
         self.expect(TokenType.LPAREN)
         expression = self.parse_expression()
@@ -512,7 +556,7 @@ class Parser:
         return PrintNode(expression, line)
     
     def parse_if(self):
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.IF)
         condition = self.parse_expression()
         self.expect(TokenType.COLON)
@@ -520,7 +564,7 @@ class Parser:
         then_block = self.parse_block()
         
         elif_parts = []
-        while self.current_token.type == TokenType.ELIF:
+        while self.current_type == TokenType.ELIF:
             self.advance()
             elif_condition = self.parse_expression()
             self.expect(TokenType.COLON)
@@ -529,7 +573,7 @@ class Parser:
             elif_parts.append((elif_condition, elif_block))
         
         else_block = None
-        if self.current_token.type == TokenType.ELSE:
+        if self.current_type == TokenType.ELSE:
             self.advance()
             self.expect(TokenType.COLON)
             self.skip_newlines()
@@ -538,7 +582,7 @@ class Parser:
         return IfNode(condition, then_block, elif_parts, else_block, line)
     
     def parse_while(self):
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.WHILE)
         condition = self.parse_expression()
         self.expect(TokenType.COLON)
@@ -547,9 +591,9 @@ class Parser:
         return WhileNode(condition, block, line)
     
     def parse_for(self):
-        line = self.current_token.line
+        line = self.current_line
         self.expect(TokenType.FOR)
-        identifier = self.expect(TokenType.IDENTIFIER).value
+        identifier = self.expect(TokenType.IDENTIFIER)
         self.expect(TokenType.IN)
         iterable = self.parse_expression()
         self.expect(TokenType.COLON)
@@ -559,18 +603,18 @@ class Parser:
     
     def parse_block(self):
         statements = []
-        if self.current_token.type != TokenType.INDENT:
+        if self.current_type != TokenType.INDENT:
             self.error("Se esperaba bloque indentado")
         self.advance()
         self.skip_newlines()
         
-        while self.current_token.type not in (TokenType.DEDENT, TokenType.EOF):
+        while self.current_type not in (TokenType.DEDENT, TokenType.EOF):
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
             self.skip_newlines()
         
-        if self.current_token.type == TokenType.DEDENT:
+        if self.current_type == TokenType.DEDENT:
             self.advance()
         
         return BlockNode(statements)
@@ -583,9 +627,9 @@ class Parser:
         comparison_ops = {TokenType.EQUAL, TokenType.NOT_EQUAL, TokenType.LESS, 
                          TokenType.GREATER, TokenType.LESS_EQUAL, TokenType.GREATER_EQUAL}
         
-        if self.current_token.type in comparison_ops:
-            operator = self.current_token.value
-            line = self.current_token.line
+        if self.current_type in comparison_ops:
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_arithmetic()
             return BinaryOpNode(left, operator, right, line)
@@ -593,9 +637,9 @@ class Parser:
     
     def parse_arithmetic(self):
         left = self.parse_term()
-        while self.current_token.type in (TokenType.PLUS, TokenType.MINUS):
-            operator = self.current_token.value
-            line = self.current_token.line
+        while self.current_type in (TokenType.PLUS, TokenType.MINUS):
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_term()
             left = BinaryOpNode(left, operator, right, line)
@@ -603,73 +647,75 @@ class Parser:
     
     def parse_term(self):
         left = self.parse_factor()
-        while self.current_token.type in (TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO):
-            operator = self.current_token.value
-            line = self.current_token.line
+        while self.current_type in (TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO):
+            operator = self.current_value
+            line = self.current_line
             self.advance()
             right = self.parse_factor()
             left = BinaryOpNode(left, operator, right, line)
         return left
     
     def parse_factor(self):
-        token = self.current_token
+        token_type = self.current_type
+        value = self.current_value
+        line = self.current_line
         
-        if token.type == TokenType.NUMBER:
+        if token_type == TokenType.NUMBER:
             self.advance()
-            return NumberNode(token.value, token.line)
-        elif token.type == TokenType.STRING:
+            return NumberNode(value, line)
+        elif token_type == TokenType.STRING:
             self.advance()
-            return StringNode(token.value, token.line)
-        elif token.type == TokenType.IDENTIFIER:
+            return StringNode(value, line)
+        elif token_type == TokenType.IDENTIFIER:
             self.advance()
-            if self.current_token.type == TokenType.LBRACKET:
+            if self.current_type == TokenType.LBRACKET:
                 self.advance()
                 index_expr = self.parse_expression()
                 self.expect(TokenType.RBRACKET)
-                return IndexNode(IdentifierNode(token.value, token.line), index_expr, token.line)
-            elif self.current_token.type == TokenType.DOT:
+                return IndexNode(IdentifierNode(value, line), index_expr, line)
+            elif self.current_type == TokenType.DOT:
                 self.advance()
-                method = self.expect(TokenType.IDENTIFIER).value
+                method = self.expect(TokenType.IDENTIFIER)
                 self.expect(TokenType.LPAREN)
                 args = []
-                if self.current_token.type != TokenType.RPAREN:
+                if self.current_type != TokenType.RPAREN:
                     args.append(self.parse_expression())
-                    while self.current_token.type == TokenType.COMMA:
+                    while self.current_type == TokenType.COMMA:
                         self.advance()
                         args.append(self.parse_expression())
                 self.expect(TokenType.RPAREN)
-                return CallNode(f"{token.value}.{method}", args, token.line)
-            return IdentifierNode(token.value, token.line)
-        elif token.type == TokenType.LBRACKET:
+                return CallNode(f"{value}.{method}", args, line)
+            return IdentifierNode(value, line)
+        elif token_type == TokenType.LBRACKET:
             self.advance()
             elements = []
-            if self.current_token.type != TokenType.RBRACKET:
+            if self.current_type != TokenType.RBRACKET:
                 elements.append(self.parse_expression())
-                while self.current_token.type == TokenType.COMMA:
+                while self.current_type == TokenType.COMMA:
                     self.advance()
                     elements.append(self.parse_expression())
             self.expect(TokenType.RBRACKET)
-            return ListNode(elements, token.line)
-        elif token.type == TokenType.LPAREN:
+            return ListNode(elements, line)
+        elif token_type == TokenType.LPAREN:
             self.advance()
             expr = self.parse_expression()
             self.expect(TokenType.RPAREN)
             return expr
-        elif token.type in (TokenType.RANGE, TokenType.LEN):
-            func_name = token.value
+        elif token_type in (TokenType.RANGE, TokenType.LEN):
+            func_name = value
             self.advance()
             self.expect(TokenType.LPAREN)
             args = []
-            if self.current_token.type != TokenType.RPAREN:
+            if self.current_type != TokenType.RPAREN:
                 args.append(self.parse_expression())
-                while self.current_token.type == TokenType.COMMA:
+                while self.current_type == TokenType.COMMA:
                     self.advance()
                     args.append(self.parse_expression())
             self.expect(TokenType.RPAREN)
-            return CallNode(func_name, args, token.line)
-        elif token.type == TokenType.MINUS:
+            return CallNode(func_name, args, line)
+        elif token_type == TokenType.MINUS:
             self.advance()
             operand = self.parse_factor()
-            return UnaryOpNode('-', operand, token.line)
+            return UnaryOpNode('-', operand, line)
         else:
-            self.error(f"Token inesperado en expresión: {token}")
+            self.error(f"Token inesperado en expresión: {self.current_token}")
@@ -0,0 +1,47 @@
+"""
+Engine Equivalence Check
+The 'char' and 'regex' lexer engines must produce the same tokens and the
+same errors (message, line and column)
+"""
+
+import glob
+import os
+
+from lexer import Lexer, LexerError
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Inputs that exercise the paths where the regex engine hands off to the character readers
+EDGE_CASES = [
+    '½',
+    'x = ½',
+    '12½',
+    '²',
+    '3²',
+    'a½ = 1',
+    '1.2.3',
+    'x = "open',
+    "s = 'a\\'b\\n'\nprint s",
+    'x = 1 @ 2',
+    'if x:\n    y = 1\n  z = 2\n',
+    'x = 1 // comment\n# other\n\n\ty = 2\n',
+]
+
+
+def run(source, engine):
+    """Tokens as tuples, or the error message"""
+    try:
+        return [(token.type, token.value, token.line, token.column)
+                for token in Lexer(source, engine).tokenize()]
+    except LexerError as e:
+        return str(e)
+
+
+def test_engines_agree():
+    sources = list(EDGE_CASES)
+    for path in sorted(glob.glob(os.path.join(HERE, 'e*', '*.ml'))):
+        with open(path, encoding='utf-8') as f:
+            sources.append(f.read())
+    for source in sources:
+        assert run(source, 'char') == run(source, 'regex'), repr(source)